@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for partitura.
+
+The benchmarks follow the conventions of airspeed velocity (asv):
+methods prefixed with `time_` are timed and methods prefixed with
+`peakmem_` report the peak memory of the process. Every benchmark is
+parametrized by the number of notes of a synthetic score (see
+`benchmarks.generators`), so that the results show how each stage
+scales from 10^3 to 10^6 notes.
+
+With asv installed, run the benchmarks with
+
+    asv run
+
+and compare two commits (failing if any benchmark is more than 20%
+slower) with
+
+    asv continuous --factor 1.2 main HEAD
+
+Without asv, the benchmarks can be run once per size with
+
+    python -m benchmarks [--max-notes N] [pattern]
+
+which reports the time and the peak memory allocated by each stage.
+"""
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Run the benchmarks once per size without asv.
+
+For every `time_` benchmark, the wall time and the peak memory allocated
+during the call (measured with `tracemalloc`) are reported.
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import pkgutil
+import re
+import tempfile
+import time
+import tracemalloc
+
+import benchmarks
+
+
+def iter_benchmark_classes():
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(
+            "{0}.{1}".format(benchmarks.__name__, module_info.name)
+        )
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield "{0}.{1}".format(module_info.name, name), cls
+
+
+def run_benchmark(method, args):
+    """
+    Run a benchmark twice: once to measure its time and once (with
+    `tracemalloc`, which slows down the call) to measure its peak memory.
+    """
+    start = time.perf_counter()
+    method(*args)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    method(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the partitura benchmarks")
+    parser.add_argument(
+        "pattern",
+        nargs="?",
+        default="",
+        help="Regular expression to select benchmarks by name",
+    )
+    parser.add_argument(
+        "--max-notes",
+        type=int,
+        default=10**4,
+        help="Largest size (number of notes) to run",
+    )
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            print(
+                "{0:<70} {1:>10} {2:>12}".format("benchmark", "time (s)", "peak (MB)")
+            )
+            for class_name, cls in iter_benchmark_classes():
+                methods = [
+                    name
+                    for name, _ in inspect.getmembers(cls, inspect.isfunction)
+                    if name.startswith("time_")
+                    and re.search(args.pattern, "{0}.{1}".format(class_name, name))
+                ]
+                sizes = [n for n in cls.params if n <= args.max_notes]
+                if not methods or not sizes:
+                    continue
+                bench = cls()
+                cache = []
+                if hasattr(bench, "setup_cache"):
+                    cache = [bench.setup_cache()]
+                for n_notes in sizes:
+                    if hasattr(bench, "setup"):
+                        bench.setup(*cache, n_notes)
+                    for name in methods:
+                        duration, peak = run_benchmark(
+                            getattr(bench, name), cache + [n_notes]
+                        )
+                        print(
+                            "{0:<70} {1:>10.4f} {2:>12.2f}".format(
+                                "{0}.{1}({2})".format(class_name, name, n_notes),
+                                duration,
+                                peak / 2**20,
+                            )
+                        )
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
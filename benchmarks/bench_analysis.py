@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for pianorolls, note features and voice estimation.
+"""
+
+import warnings
+
+from partitura.musicanalysis import estimate_voices, make_note_features
+from partitura.utils.music import compute_pianoroll
+
+from benchmarks.generators import SIZES, make_part
+
+
+class ComputePianoroll:
+    params = SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+        self.note_array = make_part(n_notes).note_array()
+
+    def time_compute_pianoroll(self, n_notes):
+        compute_pianoroll(self.note_array, time_unit="div", time_div=1)
+
+    def time_compute_pianoroll_onsets(self, n_notes):
+        compute_pianoroll(self.note_array, time_unit="div", time_div=1, onset_only=True)
+
+    def peakmem_compute_pianoroll(self, n_notes):
+        compute_pianoroll(self.note_array, time_unit="div", time_div=1)
+
+
+class MakeNoteFeatures:
+    params = SIZES[:-1]
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+        self.part = make_part(n_notes)
+
+    def time_make_note_features(self, n_notes):
+        make_note_features(self.part, "all")
+
+    def peakmem_make_note_features(self, n_notes):
+        make_note_features(self.part, "all")
+
+
+class EstimateVoices:
+    # voice estimation is much slower than the other stages
+    params = [10**2, 10**3, 3 * 10**3]
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+        self.note_array = make_part(n_notes).note_array()
+
+    def time_estimate_voices(self, n_notes):
+        estimate_voices(self.note_array)
+
+    def peakmem_estimate_voices(self, n_notes):
+        estimate_voices(self.note_array)
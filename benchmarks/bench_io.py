@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for loading scores, performances and alignments.
+"""
+
+import os
+import warnings
+
+import partitura as pt
+
+from benchmarks.generators import write_files
+
+IO_SIZES = [10**3, 10**4, 10**5]
+
+
+def setup_files():
+    """
+    Create the directory for the synthetic MusicXML, MIDI and match
+    files (once for all benchmarks in this module).
+    """
+    out_dir = os.path.abspath("partitura_benchmark_files")
+    os.makedirs(out_dir, exist_ok=True)
+    return out_dir
+
+
+class LoadMusicXML:
+    params = IO_SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup_cache(self):
+        return setup_files()
+
+    def setup(self, out_dir, n_notes):
+        warnings.simplefilter("ignore")
+        self.files = write_files(n_notes, out_dir, overwrite=False)
+
+    def time_load_musicxml(self, out_dir, n_notes):
+        pt.load_musicxml(self.files["musicxml"])
+
+    def peakmem_load_musicxml(self, out_dir, n_notes):
+        pt.load_musicxml(self.files["musicxml"])
+
+
+class LoadPerformanceMIDI:
+    params = IO_SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup_cache(self):
+        return setup_files()
+
+    def setup(self, out_dir, n_notes):
+        warnings.simplefilter("ignore")
+        self.files = write_files(n_notes, out_dir, overwrite=False)
+
+    def time_load_performance_midi(self, out_dir, n_notes):
+        pt.load_performance_midi(self.files["midi"])
+
+    def peakmem_load_performance_midi(self, out_dir, n_notes):
+        pt.load_performance_midi(self.files["midi"])
+
+
+class LoadMatch:
+    params = IO_SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup_cache(self):
+        return setup_files()
+
+    def setup(self, out_dir, n_notes):
+        warnings.simplefilter("ignore")
+        self.files = write_files(n_notes, out_dir, overwrite=False)
+
+    def time_load_match(self, out_dir, n_notes):
+        pt.load_match(self.files["match"], create_score=True)
+
+    def peakmem_load_match(self, out_dir, n_notes):
+        pt.load_match(self.files["match"], create_score=True)
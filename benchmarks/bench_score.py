@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the construction of parts, note arrays and unfolding.
+"""
+
+import warnings
+
+import partitura.score as score
+from partitura.utils.music import note_array_from_part
+
+from benchmarks.generators import SIZES, make_part
+
+
+class MakePart:
+    params = SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+
+    def time_make_part(self, n_notes):
+        make_part(n_notes)
+
+    def peakmem_make_part(self, n_notes):
+        make_part(n_notes)
+
+
+class NoteArray:
+    params = SIZES
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+        self.part = make_part(n_notes)
+
+    def time_note_array(self, n_notes):
+        note_array_from_part(self.part)
+
+    def time_note_array_all_fields(self, n_notes):
+        note_array_from_part(
+            self.part,
+            include_pitch_spelling=True,
+            include_key_signature=True,
+            include_time_signature=True,
+            include_metrical_position=True,
+            include_grace_notes=True,
+            include_staff=True,
+            include_divs_per_quarter=True,
+        )
+
+    def time_note_array_cached(self, n_notes):
+        # the first call fills the cache of the part
+        self.part.note_array()
+
+    def peakmem_note_array(self, n_notes):
+        note_array_from_part(self.part)
+
+
+class UnfoldPartMaximal:
+    params = SIZES[:-1]
+    param_names = ["n_notes"]
+    timeout = 600
+
+    def setup(self, n_notes):
+        warnings.simplefilter("ignore")
+        self.part = make_part(n_notes, n_repeats=n_notes // 100)
+
+    def time_unfold_part_maximal(self, n_notes):
+        score.unfold_part_maximal(self.part)
+
+    def peakmem_unfold_part_maximal(self, n_notes):
+        score.unfold_part_maximal(self.part)
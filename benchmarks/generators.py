@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains generators of synthetic scores and performances
+of arbitrary size for the benchmarks.
+"""
+
+import os
+
+import numpy as np
+
+import partitura as pt
+import partitura.score as score
+from partitura.performance import PerformedPart, Performance
+from partitura.utils.music import performance_notearray_from_score_notearray
+
+# number of notes used by the benchmarks (scaling from 10^3 to 10^6)
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+# divs per quarter note of the synthetic scores
+DIVS = 2
+
+# length of a 4/4 measure in divs
+MEASURE_DIVS = 4 * DIVS
+
+
+def make_part(n_notes, seed=1984, n_repeats=0, part_id="P1"):
+    """
+    Generate a synthetic piano-like part.
+
+    The part is in 4/4 and C major. Notes start on an eighth note grid,
+    with chords of up to three notes. Notes never cross a barline.
+
+    Parameters
+    ----------
+    n_notes : int
+        Number of notes in the part.
+    seed : int
+        Seed of the random number generator.
+    n_repeats : int
+        Number of (non-overlapping) repeated sections of 4 measures
+        added to the part.
+    part_id : str
+        The id of the part.
+
+    Returns
+    -------
+    part : :class:`partitura.score.Part`
+        The generated part.
+    """
+    rng = np.random.RandomState(seed)
+
+    # number of notes starting at each eighth note position
+    chord_sizes = rng.randint(0, 4, n_notes)
+    chord_sizes = chord_sizes[np.cumsum(chord_sizes) <= n_notes]
+    n_missing = n_notes - chord_sizes.sum()
+    if n_missing > 0:
+        chord_sizes = np.r_[chord_sizes, n_missing]
+
+    starts = np.repeat(np.arange(len(chord_sizes)), chord_sizes)
+    durations = rng.choice([1, 2, 4], len(starts))
+    # clip durations at the end of the measure
+    measure_ends = (starts // MEASURE_DIVS + 1) * MEASURE_DIVS
+    ends = np.minimum(starts + durations, measure_ends)
+
+    pitches = rng.randint(36, 96, len(starts))
+    steps = np.array(["C", "C", "D", "D", "E", "F", "F", "G", "G", "A", "A", "B"])
+    alters = np.array([0, 1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0])
+
+    part = score.Part(part_id, "Synthetic part", quarter_duration=DIVS)
+    part.add(score.TimeSignature(4, 4), 0)
+    part.add(score.KeySignature(0, "major"), 0)
+    notes = [
+        score.Note(
+            id="n{0}".format(i),
+            step=steps[pitch % 12],
+            octave=pitch // 12 - 1,
+            alter=alters[pitch % 12] or None,
+            voice=1,
+            staff=1 if pitch >= 60 else 2,
+        )
+        for i, pitch in enumerate(pitches)
+    ]
+    part.add_many(notes, starts.tolist(), ends.tolist())
+
+    n_measures = int(np.ceil(ends.max() / MEASURE_DIVS)) if len(ends) else 1
+    for i in range(min(n_repeats, n_measures // 8)):
+        start = i * 8 * MEASURE_DIVS
+        part.add(score.Repeat(), start, start + 4 * MEASURE_DIVS)
+
+    score.add_measures(part)
+    return part
+
+
+def make_score(n_notes, seed=1984, n_parts=1, n_repeats=0):
+    """
+    Generate a synthetic score with `n_notes` notes in total.
+
+    Parameters
+    ----------
+    n_notes : int
+        Number of notes in the score.
+    seed : int
+        Seed of the random number generator.
+    n_parts : int
+        Number of parts of the score.
+    n_repeats : int
+        Number of repeated sections in each part (see `make_part`).
+
+    Returns
+    -------
+    scr : :class:`partitura.score.Score`
+        The generated score.
+    """
+    notes_per_part = np.full(n_parts, n_notes // n_parts)
+    notes_per_part[: n_notes % n_parts] += 1
+    parts = [
+        make_part(n, seed=seed + i, n_repeats=n_repeats, part_id="P{0}".format(i + 1))
+        for i, n in enumerate(notes_per_part)
+    ]
+    return score.Score(parts)
+
+
+def make_performance(scr, bpm=100.0):
+    """
+    Generate a deadpan performance of a score, together with the
+    alignment between the score and the performance.
+
+    Parameters
+    ----------
+    scr : :class:`partitura.score.Score`
+        A score (e.g., generated with `make_score`).
+    bpm : float
+        Tempo of the performance in beats per minute.
+
+    Returns
+    -------
+    performance : :class:`partitura.performance.Performance`
+        The performance.
+    alignment : list
+        The alignment as a list of dictionaries.
+    """
+    snote_array = scr.note_array()
+    pnote_array = performance_notearray_from_score_notearray(snote_array, bpm=bpm)
+    ppart = PerformedPart.from_note_array(pnote_array)
+    alignment = [
+        dict(label="match", score_id=nid, performance_id=nid)
+        for nid in snote_array["id"]
+    ]
+    return Performance(ppart), alignment
+
+
+def write_files(n_notes, out_dir, seed=1984, overwrite=True):
+    """
+    Write a synthetic score as MusicXML, its performance as MIDI and
+    the alignment as a match file.
+
+    Parameters
+    ----------
+    n_notes : int
+        Number of notes in the score.
+    out_dir : str
+        Directory where the files are written.
+    seed : int
+        Seed of the random number generator.
+    overwrite : bool
+        If False, existing files are not written again.
+
+    Returns
+    -------
+    paths : dict
+        The paths of the files, with keys "musicxml", "midi" and "match".
+    """
+    paths = dict(
+        musicxml=os.path.join(out_dir, "score_{0}.musicxml".format(n_notes)),
+        midi=os.path.join(out_dir, "performance_{0}.mid".format(n_notes)),
+        match=os.path.join(out_dir, "alignment_{0}.match".format(n_notes)),
+    )
+    if not overwrite and all(os.path.exists(path) for path in paths.values()):
+        return paths
+
+    scr = make_score(n_notes, seed=seed)
+    performance, alignment = make_performance(scr)
+    pt.save_musicxml(scr, paths["musicxml"])
+    pt.save_performance_midi(performance, paths["midi"])
+    pt.save_match(alignment, performance, scr, paths["match"])
+    return paths
@@ -25,6 +25,9 @@ from .io.importparangonada import load_parangonada_csv
 from .io.exportparangonada import save_parangonada_csv, save_csv_for_parangonada
 from .io.exportaudio import save_wav, save_wav_fluidsynth
 from .io.exportmei import save_mei
+from .io.corpus import iter_corpus, load_corpus
+from .io.cache import load_cached
+from .io.partiturafile import save_partitura, load_partitura
 from .display import render
 from . import musicanalysis
 from .musicanalysis import make_note_features, compute_note_array, full_note_array
@@ -66,4 +69,9 @@ __all__ = [
     "save_wav",
     "save_wav_fluidsynth",
     "render",
+    "iter_corpus",
+    "load_corpus",
+    "load_cached",
+    "save_partitura",
+    "load_partitura",
 ]
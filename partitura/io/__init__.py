@@ -18,6 +18,9 @@ from .exportparangonada import save_parangonada_csv
 from .importmusic21 import load_music21
 from .exportmei import save_mei
 from .importdcml import load_dcml
+from .corpus import iter_corpus, load_corpus
+from .cache import LoadCache, load_cached
+from .partiturafile import save_partitura, load_partitura
 from partitura.utils.misc import (
     deprecated_alias,
     deprecated_parameter,
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains an on-disk cache of loaded scores and performances.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Optional, Union
+
+from partitura.utils.misc import PathLike
+
+__all__ = ["LoadCache", "load_cached"]
+
+#: Environment variable with the default directory of the cache
+CACHE_DIR_ENV = "PARTITURA_CACHE_DIR"
+
+#: Default maximal size of the cache in bytes (1 GB)
+DEFAULT_MAX_SIZE = 2**30
+
+CACHE_EXTENSION = ".pkl"
+
+
+def default_cache_dir() -> str:
+    """
+    Default directory of the cache, which is the value of the
+    `PARTITURA_CACHE_DIR` environment variable if it is set, and
+    `~/.cache/partitura` otherwise.
+    """
+    return os.environ.get(
+        CACHE_DIR_ENV, os.path.join(os.path.expanduser("~"), ".cache", "partitura")
+    )
+
+
+def file_hash(filename: PathLike, chunk_size: int = 2**20) -> str:
+    """
+    SHA-256 hash of the contents of a file.
+
+    Parameters
+    ----------
+    filename : PathLike
+        The path of the file.
+    chunk_size : int, optional
+        Number of bytes read at once.
+
+    Returns
+    -------
+    digest : str
+        The hexadecimal digest of the contents of the file.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LoadCache(object):
+    """
+    An on-disk cache of the outputs of the loading functions.
+
+    The outputs are stored with pickle, under a key computed from the
+    contents of the file, the extension of the file, the partitura
+    version, the loading function and its arguments. Modifying a file
+    or updating partitura therefore never returns stale outputs. When
+    the total size of the cache exceeds `max_size`, the least recently
+    used entries are removed.
+
+    .. warning::
+        The entries are read back with :mod:`pickle`, which can execute
+        arbitrary code. The cache directory must therefore be trusted:
+        only use a directory that no other user can write to.
+
+    Parameters
+    ----------
+    cache_dir : PathLike or None, optional
+        Directory where the outputs are stored. It is created if it
+        does not exist. If None, `default_cache_dir()` is used.
+    max_size : int or None, optional
+        Maximal size of the cache in bytes. If None, the size of the
+        cache is not bounded. Defaults to 1 GB.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> import partitura as pt
+    >>> cache = LoadCache(tempfile.mkdtemp())
+    >>> score = cache.load(pt.EXAMPLE_MUSICXML)  # parsed and stored
+    >>> score = cache.load(pt.EXAMPLE_MUSICXML)  # read from the cache
+    >>> len(score.note_array())
+    3
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[PathLike] = None,
+        max_size: Optional[int] = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.cache_dir = os.fsdecode(
+            default_cache_dir() if cache_dir is None else cache_dir
+        )
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, loader: Callable, filename: PathLike, **kwargs: Any) -> str:
+        """
+        Key of the output of `loader(filename, **kwargs)`.
+        """
+        # imported here to avoid a circular import
+        from partitura import __version__
+
+        loader_name = "{0}.{1}".format(
+            getattr(loader, "__module__", ""),
+            getattr(loader, "__qualname__", repr(loader)),
+        )
+        description = repr(
+            (
+                __version__,
+                loader_name,
+                sorted((k, repr(v)) for k, v in kwargs.items()),
+                os.path.splitext(os.fsdecode(filename))[-1].lower(),
+                file_hash(filename),
+            )
+        )
+        return hashlib.sha256(description.encode("utf8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_EXTENSION)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get an entry of the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+        default : object, optional
+            The value returned if the entry is not in the cache.
+
+        Returns
+        -------
+        value : object
+            The cached value, or `default`.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            # truncated or incompatible entries are treated as missing
+            self._remove(path)
+            return default
+        # the modification time is used as the time of the last access
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store an entry in the cache, and remove the least recently used
+        entries if the cache exceeds its maximal size.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry.
+        value : object
+            The value to store. It must be picklable.
+        """
+        # write to a temporary file first, so that concurrent processes
+        # never read a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def load(
+        self, filename: PathLike, loader: Union[str, Callable] = "score", **kwargs: Any
+    ) -> Any:
+        """
+        Load a file, using the cached output if it exists.
+
+        Parameters
+        ----------
+        filename : PathLike
+            The path of the file.
+        loader : {"score", "performance", "match"} or callable, optional
+            The function used to load the file (see
+            `partitura.io.corpus.iter_corpus`). Defaults to "score".
+        **kwargs
+            Additional keyword arguments passed to the loader.
+
+        Returns
+        -------
+        output : object
+            The output of `loader(filename, **kwargs)`.
+        """
+        # imported here to avoid a circular import
+        from partitura.io.corpus import _get_loader
+
+        loader = _get_loader(loader)
+        key = self.key(loader, filename, **kwargs)
+        missing = object()
+        output = self.get(key, missing)
+        if output is missing:
+            output = loader(filename, **kwargs)
+            self.set(key, output)
+        return output
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """
+        Total size of the entries of the cache in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the size of the
+        cache is not larger than `max_size`.
+        """
+        if self.max_size is None:
+            return
+        entries = self._entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all entries of the cache.
+        """
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def load_cached(
+    filename: PathLike,
+    loader: Union[str, Callable] = "score",
+    cache_dir: Optional[PathLike] = None,
+    max_size: Optional[int] = DEFAULT_MAX_SIZE,
+    **kwargs: Any,
+) -> Any:
+    """
+    Load a file, using an on-disk cache of the outputs of the loaders
+    (see `LoadCache`).
+
+    .. warning::
+        Cached outputs are unpickled, so `cache_dir` (or the default
+        cache directory) must be trusted.
+
+    Parameters
+    ----------
+    filename : PathLike
+        The path of the file.
+    loader : {"score", "performance", "match"} or callable, optional
+        The function used to load the file: "score" for `load_score`,
+        "performance" for `load_performance` and "match" for
+        `load_match`, or a callable taking a filename as its first
+        argument. Defaults to "score".
+    cache_dir : PathLike or None, optional
+        Directory of the cache. If None, the directory given by the
+        `PARTITURA_CACHE_DIR` environment variable, or
+        `~/.cache/partitura`, is used.
+    max_size : int or None, optional
+        Maximal size of the cache in bytes. If None, the size of the
+        cache is not bounded. Defaults to 1 GB.
+    **kwargs
+        Additional keyword arguments passed to the loader.
+
+    Returns
+    -------
+    output : object
+        The output of the loader.
+    """
+    cache = LoadCache(cache_dir, max_size=max_size)
+    return cache.load(filename, loader=loader, **kwargs)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for loading collections of files (corpora)
+in parallel.
+"""
+import glob
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from partitura.utils.misc import PathLike
+
+__all__ = ["CorpusItem", "iter_corpus", "load_corpus"]
+
+CorpusItem = namedtuple("CorpusItem", ["filename", "result", "error"])
+CorpusItem.__doc__ = """
+The result of loading a file of a corpus.
+
+Attributes
+----------
+filename : str
+    The path of the file.
+result : object
+    The output of the loader, or None if loading the file failed.
+error : Exception or None
+    The exception raised while loading the file, or None if loading
+    the file succeeded.
+"""
+
+GLOB_CHARS = ("*", "?", "[")
+
+
+def _get_loader(loader: Union[str, Callable]) -> Callable:
+    if callable(loader):
+        return loader
+
+    # imported here to avoid a circular import with partitura.io
+    from partitura.io import load_score, load_performance, load_match
+
+    loaders = dict(
+        score=load_score,
+        performance=load_performance,
+        match=load_match,
+    )
+
+    if loader not in loaders:
+        raise ValueError(
+            "`loader` should be a callable or one of {0}, but is {1}".format(
+                ", ".join(sorted(loaders)), loader
+            )
+        )
+    return loaders[loader]
+
+
+def expand_filenames(filenames: Union[PathLike, Iterable[PathLike]]) -> List[str]:
+    """
+    Expand a list of paths and glob patterns into a list of paths.
+
+    Parameters
+    ----------
+    filenames : PathLike or list of PathLike
+        Paths of files or glob patterns (e.g., "scores/**/*.musicxml").
+        Patterns are expanded recursively and their matches are sorted.
+        Paths without wildcards are kept as they are, even if the file
+        does not exist.
+
+    Returns
+    -------
+    expanded : list of str
+        The paths of the files.
+    """
+    if isinstance(filenames, (str, bytes, os.PathLike)):
+        filenames = [filenames]
+
+    expanded = []
+    for filename in filenames:
+        filename = os.fsdecode(filename)
+        if any(char in filename for char in GLOB_CHARS):
+            expanded.extend(sorted(glob.glob(filename, recursive=True)))
+        else:
+            expanded.append(filename)
+    return expanded
+
+
+def _load_item(
+    loader: Callable, filename: str, kwargs: dict, cache_dir: Optional[str] = None
+) -> CorpusItem:
+    try:
+        if cache_dir is not None:
+            # imported here to avoid a circular import
+            from partitura.io.cache import LoadCache
+
+            result = LoadCache(cache_dir).load(filename, loader, **kwargs)
+        else:
+            result = loader(filename, **kwargs)
+        return CorpusItem(filename, result, None)
+    except Exception as e:
+        return CorpusItem(filename, None, e)
+
+
+def iter_corpus(
+    filenames: Union[PathLike, Iterable[PathLike]],
+    loader: Union[str, Callable] = "score",
+    n_jobs: Optional[int] = None,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+    cache_dir: Optional[PathLike] = None,
+    **kwargs: Any,
+) -> Iterator[CorpusItem]:
+    """
+    Load the files of a corpus in a pool of processes.
+
+    Errors are captured per file, so that a file that cannot be loaded
+    does not abort the loading of the rest of the corpus.
+
+    Parameters
+    ----------
+    filenames : PathLike or list of PathLike
+        Paths of files or glob patterns (see `expand_filenames`).
+    loader : {"score", "performance", "match"} or callable, optional
+        The function used to load each file: "score" for
+        `load_score`, "performance" for `load_performance` and "match"
+        for `load_match`. A callable taking a filename as its first
+        argument can be given instead, which should be defined at the
+        top level of a module, so that it can be sent to the worker
+        processes. Defaults to "score".
+    n_jobs : int or None, optional
+        Number of worker processes. If None, the number of CPUs is
+        used. If 1, the files are loaded sequentially in the current
+        process.
+    ordered : bool, optional
+        If True, the items are yielded in the order of `filenames`.
+        Otherwise, they are yielded as soon as they are loaded.
+        Defaults to True.
+    max_pending : int or None, optional
+        Maximum number of files that are being loaded, or that are
+        loaded but not yet yielded, at any time. This bounds the
+        memory used when the items are consumed more slowly than they
+        are loaded. If None, twice the number of worker processes is
+        used.
+    cache_dir : PathLike or None, optional
+        If given, the outputs of the loader are stored in an on-disk
+        cache in this directory, and read from it when loading the
+        same files again (see `partitura.io.cache.LoadCache`).
+    **kwargs
+        Additional keyword arguments passed to the loader (e.g.,
+        `force_note_ids` for `load_score`).
+
+    Yields
+    ------
+    item : CorpusItem
+        Named tuple with the filename, the result of the loader (or
+        None) and the exception raised by the loader (or None).
+    """
+    loader = _get_loader(loader)
+    filenames = expand_filenames(filenames)
+    if cache_dir is not None:
+        cache_dir = os.fsdecode(cache_dir)
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs < 1:
+        raise ValueError("`n_jobs` should be a positive integer")
+
+    if n_jobs == 1 or len(filenames) < 2:
+        for filename in filenames:
+            yield _load_item(loader, filename, kwargs, cache_dir)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * n_jobs
+
+    max_pending = max(max_pending, 1)
+    n_workers = min(n_jobs, len(filenames), max_pending)
+
+    executor = ProcessPoolExecutor(max_workers=n_workers)
+    # futures that are not yet yielded, by position in `filenames`
+    pending = dict()
+    next_submit = 0
+    next_yield = 0
+    try:
+        while next_yield < len(filenames):
+            while next_submit < len(filenames) and len(pending) < max_pending:
+                pending[next_submit] = executor.submit(
+                    _load_item, loader, filenames[next_submit], kwargs, cache_dir
+                )
+                next_submit += 1
+
+            if ordered:
+                future = pending.pop(next_yield)
+                # the item is built here if the process pool breaks
+                # (e.g., if a worker is killed by running out of memory)
+                try:
+                    item = future.result()
+                except Exception as e:
+                    item = CorpusItem(filenames[next_yield], None, e)
+                next_yield += 1
+                yield item
+                continue
+
+            done, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+            for idx in [idx for idx, future in pending.items() if future in done]:
+                future = pending.pop(idx)
+                try:
+                    item = future.result()
+                except Exception as e:
+                    item = CorpusItem(filenames[idx], None, e)
+                next_yield += 1
+                yield item
+    finally:
+        for future in pending.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def load_corpus(
+    filenames: Union[PathLike, Iterable[PathLike]],
+    loader: Union[str, Callable] = "score",
+    n_jobs: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    cache_dir: Optional[PathLike] = None,
+    **kwargs: Any,
+) -> List[CorpusItem]:
+    """
+    Load the files of a corpus in a pool of processes.
+
+    This is a convenience function around `iter_corpus`, that returns
+    the items in the order of `filenames`.
+
+    Parameters
+    ----------
+    filenames : PathLike or list of PathLike
+        Paths of files or glob patterns (see `expand_filenames`).
+    loader : {"score", "performance", "match"} or callable, optional
+        The function used to load each file (see `iter_corpus`).
+        Defaults to "score".
+    n_jobs : int or None, optional
+        Number of worker processes. If None, the number of CPUs is
+        used. If 1, the files are loaded sequentially in the current
+        process.
+    max_pending : int or None, optional
+        Maximum number of files that are being loaded at any time
+        (see `iter_corpus`).
+    cache_dir : PathLike or None, optional
+        Directory of an on-disk cache of the outputs of the loader
+        (see `iter_corpus`).
+    **kwargs
+        Additional keyword arguments passed to the loader.
+
+    Returns
+    -------
+    items : list of CorpusItem
+        Named tuples with the filename, the result of the loader (or
+        None) and the exception raised by the loader (or None).
+
+    Examples
+    --------
+    >>> import partitura as pt
+    >>> items = pt.load_corpus([pt.EXAMPLE_MUSICXML], n_jobs=1)
+    >>> items[0].error is None
+    True
+    >>> len(items[0].result.note_array())
+    3
+    """
+    return list(
+        iter_corpus(
+            filenames,
+            loader=loader,
+            n_jobs=n_jobs,
+            ordered=True,
+            max_pending=max_pending,
+            cache_dir=cache_dir,
+            **kwargs,
+        )
+    )
@@ -9,7 +9,7 @@ Notes
 """
 import numpy as np
 
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Union
 
 from collections import defaultdict
 
@@ -48,6 +48,8 @@ from partitura.utils.music import (
     seconds_to_midi_ticks,
 )
 
+from partitura.utils.alignment import Alignment
+
 from partitura.utils.misc import (
     PathLike,
     deprecated_alias,
@@ -61,7 +63,7 @@ __all__ = ["save_match"]
 
 @deprecated_parameter("magaloff_zeilinger_quirk")
 def matchfile_from_alignment(
-    alignment: List[dict],
+    alignment: Union[List[dict], Alignment],
     ppart: PerformedPart,
     spart: Part,
     mpq: int = 500000,
@@ -83,9 +85,9 @@ def matchfile_from_alignment(
 
     Parameters
     ----------
-    alignment : list
-        A list of dictionaries containing alignment information.
-        See `partitura.io.importmatch.alignment_from_matchfile`.
+    alignment : list or Alignment
+        A list of dictionaries containing alignment information, or an
+        `Alignment`. See `partitura.io.importmatch.alignment_from_matchfile`.
     ppart : partitura.performance.PerformedPart
         An instance of `PerformedPart` containing performance information.
     spart : partitura.score.Part
@@ -511,7 +513,7 @@ def matchfile_from_alignment(
 
 @deprecated_alias(spart="score_data", ppart="performance_data")
 def save_match(
-    alignment: List[dict],
+    alignment: Union[List[dict], Alignment],
     performance_data: PerformanceLike,
     score_data: ScoreLike,
     out: PathLike = None,
@@ -529,9 +531,9 @@ def save_match(
 
     Parameters
     ----------
-    alignment : list
-        A list of dictionaries containing alignment information.
-        See `partitura.io.importmatch.alignment_from_matchfile`.
+    alignment : list or Alignment
+        A list of dictionaries containing alignment information, or an
+        `Alignment`. See `partitura.io.importmatch.alignment_from_matchfile`.
     performance_data : `PerformanceLike
         The performance information as a `Performance`
     score_data : `ScoreLike`
@@ -14,6 +14,7 @@ from partitura.score import ScoreLike
 from partitura.performance import PerformanceLike, Performance, PerformedPart
 
 from partitura.utils import ensure_notearray
+from partitura.utils.alignment import Alignment, ensure_alignment, LABEL_CODES
 
 from partitura.utils.misc import PathLike, deprecated_alias
 
@@ -23,14 +24,14 @@ __all__ = [
 ]
 
 
-def alignment_dicts_to_array(alignment: List[dict]) -> np.ndarray:
+def alignment_dicts_to_array(alignment: Union[List[dict], Alignment]) -> np.ndarray:
     """
     create structured array from list of dicts type alignment.
 
     Parameters
     ----------
-    alignment : list
-        A list of note alignment dictionaries.
+    alignment : list or Alignment
+        A list of note alignment dictionaries or an `Alignment`.
 
     Returns
     -------
@@ -44,18 +45,23 @@ def alignment_dicts_to_array(alignment: List[dict]) -> np.ndarray:
         ("ppartid", "U256"),
     ]
 
-    array = []
-    # for all dicts create an appropriate entry in an array:
-    # match = 0, deletion  = 1, insertion = 2
-    for no, i in enumerate(alignment):
-        if i["label"] == "match":
-            array.append((no, "0", i["score_id"], str(i["performance_id"])))
-        elif i["label"] == "insertion":
-            array.append((no, "2", "undefined", str(i["performance_id"])))
-        elif i["label"] == "deletion":
-            array.append((no, "1", i["score_id"], "undefined"))
-
-    alignarray = np.array(array, dtype=fields)
+    alignment = ensure_alignment(alignment)
+    # match = 0, deletion  = 1, insertion = 2 (the codes of the labels
+    # in `Alignment`). Other entries (e.g., ornaments) are not exported
+    idx = np.flatnonzero(alignment.mask("match", "deletion", "insertion"))
+    entries = alignment.array[idx]
+
+    alignarray = np.empty(len(entries), dtype=fields)
+    alignarray["idx"] = idx
+    alignarray["matchtype"] = entries["label"].astype(str)
+    alignarray["partid"] = np.where(
+        entries["label"] == LABEL_CODES["insertion"], "undefined", entries["score_id"]
+    )
+    alignarray["ppartid"] = np.where(
+        entries["label"] == LABEL_CODES["deletion"],
+        "undefined",
+        entries["performance_id"],
+    )
 
     return alignarray
 
@@ -66,11 +72,11 @@ def alignment_dicts_to_array(alignment: List[dict]) -> np.ndarray:
     align="alignment",
 )
 def save_parangonada_csv(
-    alignment: List[dict],
+    alignment: Union[List[dict], Alignment],
     performance_data: Union[PerformanceLike, np.ndarray],
     score_data: Union[ScoreLike, np.ndarray],
     outdir: Optional[PathLike] = None,
-    zalign: Optional[List[dict]] = None,
+    zalign: Optional[Union[List[dict], Alignment]] = None,
     feature: Optional[List[dict]] = None,
 ) -> Optional[Tuple[np.ndarray]]:
     """
@@ -78,8 +84,8 @@ def save_parangonada_csv(
 
     Parameters
     ----------
-    alignment : list
-        A list of note alignment dictionaries.
+    alignment : list or Alignment
+        A list of note alignment dictionaries or an `Alignment`.
     performance_data : Performance, PerformedPart, structured ndarray
         The performance information
     score_data : ScoreLike
@@ -90,8 +96,8 @@ def save_parangonada_csv(
         A directory to save the files into.
     ppart : PerformedPart, structured ndarray
         A PerformedPart or its note_array.
-    zalign : list, optional
-        A second list of note alignment dictionaries.
+    zalign : list or Alignment, optional
+        A second list of note alignment dictionaries or `Alignment`.
     feature : list, optional
         A list of expressive feature dictionaries.
 
@@ -226,7 +232,7 @@ save_csv_for_parangonada = save_parangonada_csv
 
 @deprecated_alias(align="alignment", outfile="out")
 def save_parangonada_alignment(
-    alignment: List[dict],
+    alignment: Union[List[dict], Alignment],
     out: Optional[PathLike] = None,
 ):
     """
@@ -270,7 +276,7 @@ save_alignment_for_parangonada = save_parangonada_alignment
 
 @deprecated_alias(outfile="out", ppart="performance_data")
 def save_alignment_for_ASAP(
-    alignment: List[dict],
+    alignment: Union[List[dict], Alignment],
     performance_data: PerformanceLike,
     out: PathLike,
 ) -> None:
@@ -279,8 +285,8 @@ def save_alignment_for_ASAP(
 
     Parameters
     ----------
-    alignment : list
-        A list of note alignment dictionaries.
+    alignment : list or Alignment
+        A list of note alignment dictionaries or an `Alignment`.
     performance_data : PerformanceLike
         A performance.
     out : str
@@ -172,41 +172,42 @@ def element_parsing(
     divs_pq = part._quarter_durations[0]
     current_tl_pos = 0
     measure_mapping = {m.number: m.start.t for m in part.iter_all(spt.Measure)}
-    for i in range(elements.shape[0]):
-        element = elements[i]
-        if element is None:
-            continue
-        if isinstance(element, spt.GenericNote):
-            if total_duration_values[i] == 0:
-                duration_divs = symbolic_to_numeric_duration(
-                    element.symbolic_duration, divs_pq
-                )
-            else:
+    with part.bulk_add():
+        for i in range(elements.shape[0]):
+            element = elements[i]
+            if element is None:
+                continue
+            if isinstance(element, spt.GenericNote):
+                if total_duration_values[i] == 0:
+                    duration_divs = symbolic_to_numeric_duration(
+                        element.symbolic_duration, divs_pq
+                    )
+                else:
+                    quarter_duration = 4 / total_duration_values[i]
+                    duration_divs = ceil(quarter_duration * divs_pq)
+                el_end = current_tl_pos + duration_divs
+                part.add(element, start=current_tl_pos, end=el_end)
+                current_tl_pos = el_end
+            elif isinstance(element, tuple):
+                # Chord
                 quarter_duration = 4 / total_duration_values[i]
                 duration_divs = ceil(quarter_duration * divs_pq)
-            el_end = current_tl_pos + duration_divs
-            part.add(element, start=current_tl_pos, end=el_end)
-            current_tl_pos = el_end
-        elif isinstance(element, tuple):
-            # Chord
-            quarter_duration = 4 / total_duration_values[i]
-            duration_divs = ceil(quarter_duration * divs_pq)
-            el_end = current_tl_pos + duration_divs
-            for note in element[1]:
-                part.add(note, start=current_tl_pos, end=el_end)
-            current_tl_pos = el_end
-        elif isinstance(element, spt.Slur):
-            start_sl = element.start_note.start.t
-            end_sl = element.end_note.start.t
-            part.add(element, start=start_sl, end=end_sl)
+                el_end = current_tl_pos + duration_divs
+                for note in element[1]:
+                    part.add(note, start=current_tl_pos, end=el_end)
+                current_tl_pos = el_end
+            elif isinstance(element, spt.Slur):
+                start_sl = element.start_note.start.t
+                end_sl = element.end_note.start.t
+                part.add(element, start=start_sl, end=end_sl)
 
-        else:
-            # Do not repeat structural elements if they are being added to the same part.
-            if not same_part:
-                part.add(element, start=current_tl_pos)
             else:
-                if isinstance(element, spt.Measure):
-                    current_tl_pos = measure_mapping[element.number]
+                # Do not repeat structural elements if they are being added to the same part.
+                if not same_part:
+                    part.add(element, start=current_tl_pos)
+                else:
+                    if isinstance(element, spt.Measure):
+                        current_tl_pos = measure_mapping[element.number]
 
 
 # functions to initialize the kern parser
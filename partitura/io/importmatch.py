@@ -4,9 +4,8 @@
 This module contains methods for parsing matchfiles
 """
 import os
-from typing import Union, Tuple, Optional, Callable, List
+from typing import Union, Tuple, Optional, Callable, List, Dict
 import warnings
-from functools import partial
 import numpy as np
 
 from partitura import score
@@ -16,6 +15,7 @@ from partitura.musicanalysis import estimate_voices, estimate_key
 
 from partitura.io.matchlines_v0 import (
     FROM_MATCHLINE_METHODS as FROM_MATCHLINE_METHODSV0,
+    FROM_MATCHLINE_FUNCTORS as FROM_MATCHLINE_FUNCTORSV0,
     parse_matchline as parse_matchlinev0,
     MatchInfo as MatchInfoV0,
     MatchMeta as MatchMetaV0,
@@ -34,6 +34,7 @@ from partitura.io.matchlines_v0 import (
 
 from partitura.io.matchlines_v1 import (
     FROM_MATCHLINE_METHODS as FROM_MATCHLINE_METHODSV1,
+    FROM_MATCHLINE_FUNCTORS as FROM_MATCHLINE_FUNCTORSV1,
     MatchInfo as MatchInfoV1,
     MatchScoreProp as MatchScorePropV1,
     MatchSection as MatchSectionV1,
@@ -54,8 +55,8 @@ from partitura.io.matchfile_base import (
     MatchError,
     MatchFile,
     MatchLine,
+    get_matchline_functors,
     BaseSnoteLine,
-    BaseSnoteNoteLine,
     BaseStimePtimeLine,
     BaseDeletionLine,
     BaseInsertionLine,
@@ -132,6 +133,7 @@ def parse_matchline(
     from_matchline_methods: List[Callable[[str], MatchLine]],
     version: Version,
     debug: bool = False,
+    from_matchline_functors: Optional[Dict[str, Callable[[str], MatchLine]]] = None,
 ) -> Optional[MatchLine]:
     """
     Return objects representing the line as one of:
@@ -156,6 +158,13 @@ def parse_matchline(
     line : str
         Line of the match file
     from_matchline_methods : List[Callable[[str], MatchLine]]
+    version : Version
+        Version of the match file
+    from_matchline_functors : Dict[str, Callable[[str], MatchLine]], optional
+        The `from_matchline` methods indexed by the functors of the line
+        (see `get_matchline_functors`). If given, the line is parsed with
+        the method corresponding to its functors, and the methods in
+        `from_matchline_methods` are only tried in order if this fails.
 
     Returns
     -------
@@ -163,6 +172,17 @@ def parse_matchline(
        Object representing the line.
     """
 
+    if from_matchline_functors is not None:
+        head, tail = get_matchline_functors(line)
+        from_matchline = from_matchline_functors.get(
+            f"{head}-{tail}", from_matchline_functors.get(head)
+        )
+        if from_matchline is not None:
+            try:
+                return from_matchline(line, version=version)
+            except Exception:
+                pass
+
     matchline = None
     for from_matchline in from_matchline_methods:
         try:
@@ -193,26 +213,25 @@ def load_matchfile(
     version = get_version(raw_lines[0])
 
     from_matchline_methods = FROM_MATCHLINE_METHODSV1
+    from_matchline_functors = FROM_MATCHLINE_FUNCTORSV1
     if version < Version(1, 0, 0):
         from_matchline_methods = FROM_MATCHLINE_METHODSV0
+        from_matchline_functors = FROM_MATCHLINE_FUNCTORSV0
 
-    parsed_lines = list()
-    # Functionality to remove duplicate lines
-    len_raw_lines = len(raw_lines)
-    np_lines = np.array(raw_lines, dtype=str)
-    # Remove empty lines
-    np_lines = np_lines[np_lines != ""]
-    # Remove duplicate lines
-    _, idx = np.unique(np_lines, return_index=True)
-    np_lines = np_lines[np.sort(idx)]
+    # Remove empty and duplicate lines (keeping the first occurrence)
+    unique_lines = dict.fromkeys(line for line in raw_lines if line != "")
     # Parse lines
-    f = partial(
-        parse_matchline, version=version, from_matchline_methods=from_matchline_methods
-    )
-    f_vec = np.vectorize(f)
-    parsed_lines_raw = f_vec(np_lines)
+    parsed_lines = [
+        parse_matchline(
+            line,
+            from_matchline_methods=from_matchline_methods,
+            version=version,
+            from_matchline_functors=from_matchline_functors,
+        )
+        for line in unique_lines
+    ]
     # do not return unparseable lines
-    parsed_lines = parsed_lines_raw[parsed_lines_raw != None].tolist()
+    parsed_lines = [line for line in parsed_lines if line is not None]
     # Create MatchFile instance
     mf = MatchFile(lines=parsed_lines)
     # Validate match for duplicate snote_ids or pnote_ids
@@ -294,19 +313,29 @@ def note_alignment_from_matchfile(mf: MatchFile) -> List[dict]:
     results : List[dict]
         An alignmnet as a list of dictionaries for each note.
     """
-    result = []
+    snote_array = mf.snote_array
+    pnote_array = mf.pnote_array
+    note_pair_array = mf.note_pair_array
+
+    # matched notes (the bulk of the alignment) are taken from the
+    # columnar view of the match file
+    result = [
+        dict(label="match", score_id=score_id, performance_id=performance_id)
+        for score_id, performance_id in zip(
+            snote_array["id"][note_pair_array["snote_idx"]].tolist(),
+            pnote_array["id"][note_pair_array["pnote_idx"]].tolist(),
+        )
+    ]
+    result_lines = note_pair_array["line"].tolist()
 
-    for line in mf.lines:
-        if isinstance(line, BaseSnoteNoteLine):
-            result.append(
-                dict(
-                    label="match",
-                    score_id=str(line.snote.Anchor),
-                    performance_id=format_pnote_id(line.note.Id),
-                )
-            )
+    # the remaining lines are checked one by one
+    other_lines = np.ones(len(mf.lines), dtype=bool)
+    other_lines[note_pair_array["line"]] = False
+    other_lines[mf.pedal_array["line"]] = False
 
-        elif isinstance(
+    for i in np.flatnonzero(other_lines).tolist():
+        line = mf.lines[i]
+        if isinstance(
             line,
             BaseDeletionLine,
         ):
@@ -336,6 +365,12 @@ def note_alignment_from_matchfile(mf: MatchFile) -> List[dict]:
                     type=ornament_type,
                 )
             )
+        else:
+            continue
+        result_lines.append(i)
+
+    # sort the alignment in the order of the lines
+    result = [result[i] for i in np.argsort(result_lines, kind="stable")]
 
     return result
 
@@ -373,60 +408,69 @@ def performed_part_from_match(
     mpq = mf.info("midiClockRate")  # 500000 -> microseconds per quarter
     ppq = mf.info("midiClockUnits")  # 500 -> parts per quarter
 
-    # PerformedNote instances for all MatchNotes
-    notes = []
-
-    notes = list()
-    note_onsets_in_secs = np.array(np.zeros(len(mf.notes)), dtype=float)
-    note_onsets_in_tick = np.array(np.zeros(len(mf.notes)), dtype=int)
-    for i, note in enumerate(mf.notes):
-        n_onset_sec = midi_ticks_to_seconds(note.Onset, mpq, ppq)
-        note_onsets_in_secs[i] = n_onset_sec
-        note_onsets_in_tick[i] = note.Onset
-        notes.append(
-            dict(
-                id=format_pnote_id(note.Id),
-                midi_pitch=note.MidiPitch,
-                note_on=n_onset_sec,
-                note_off=midi_ticks_to_seconds(note.Offset, mpq, ppq),
-                note_on_tick=note.Onset,
-                note_off_tick=note.Offset,
-                sound_off=midi_ticks_to_seconds(note.Offset, mpq, ppq),
-                velocity=note.Velocity,
-                track=getattr(note, "Track", 0),
-                channel=getattr(note, "Channel", 0),
-            )
-        )
+    pnote_array = mf.pnote_array
+    note_on_tick = pnote_array["onset_tick"]
+    note_off_tick = pnote_array["offset_tick"]
+    note_on = midi_ticks_to_seconds(note_on_tick, mpq, ppq)
+    note_off = midi_ticks_to_seconds(note_off_tick, mpq, ppq)
+
     # Set first note_on to zero in ticks and seconds if first_note_at_zero
-    if first_note_at_zero and len(note_onsets_in_secs) > 0:
-        offset = note_onsets_in_secs.min()
-        offset_tick = note_onsets_in_tick.min()
+    if first_note_at_zero and len(pnote_array) > 0:
+        offset = note_on.min()
+        offset_tick = note_on_tick.astype(int).min()
         if offset > 0 and offset_tick > 0:
-            for note in notes:
-                note["note_on"] -= offset
-                note["note_off"] -= offset
-                note["sound_off"] -= offset
-                note["note_on_tick"] -= offset_tick
-                note["note_off_tick"] -= offset_tick
-
-    # SustainPedal instances for sustain pedal lines
-    sustain_pedal = [
+            note_on = note_on - offset
+            note_off = note_off - offset
+            note_on_tick = note_on_tick - offset_tick
+            note_off_tick = note_off_tick - offset_tick
+
+    # PerformedNote instances for all MatchNotes
+    notes = [
         dict(
-            number=64,
-            time=midi_ticks_to_seconds(ped.Time, mpq, ppq),
-            value=ped.Value,
+            id=nid,
+            midi_pitch=pitch,
+            note_on=n_on,
+            note_off=n_off,
+            note_on_tick=n_on_tick,
+            note_off_tick=n_off_tick,
+            sound_off=n_off,
+            velocity=velocity,
+            track=track,
+            channel=channel,
+        )
+        for (
+            nid,
+            pitch,
+            n_on,
+            n_off,
+            n_on_tick,
+            n_off_tick,
+            velocity,
+            track,
+            channel,
+        ) in zip(
+            pnote_array["id"].tolist(),
+            pnote_array["pitch"].tolist(),
+            note_on.tolist(),
+            note_off.tolist(),
+            note_on_tick.tolist(),
+            note_off_tick.tolist(),
+            pnote_array["velocity"].tolist(),
+            pnote_array["track"].tolist(),
+            pnote_array["channel"].tolist(),
         )
-        for ped in mf.sustain_pedal
     ]
 
-    # SoftPedal instances for soft pedal lines
-    soft_pedal = [
-        dict(
-            number=67,
-            time=midi_ticks_to_seconds(ped.Time, mpq, ppq),
-            value=ped.Value,
+    # SustainPedal (number 64) and SoftPedal (number 67) instances
+    # for the pedal lines
+    pedal_array = mf.pedal_array[np.argsort(mf.pedal_array["number"], kind="stable")]
+    controls = [
+        dict(number=number, time=time, value=value)
+        for number, time, value in zip(
+            pedal_array["number"].tolist(),
+            midi_ticks_to_seconds(pedal_array["time"], mpq, ppq).tolist(),
+            pedal_array["value"].tolist(),
         )
-        for ped in mf.soft_pedal
     ]
 
     # Make performed part
@@ -434,7 +478,7 @@ def performed_part_from_match(
         id="P1",
         part_name=mf.info("piece"),
         notes=notes,
-        controls=sustain_pedal + soft_pedal,
+        controls=controls,
         sustain_pedal_threshold=pedal_threshold,
     )
     return ppart
@@ -773,6 +817,7 @@ def part_from_matchfile(
         for note in part.notes_tied:
             if note.voice is None:
                 note.voice = max(n_voices) + 1
+    part.touch()
 
     return part
 
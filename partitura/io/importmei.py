@@ -4,6 +4,7 @@
 This module contains methods for importing MEI files.
 """
 from collections import OrderedDict
+from contextlib import ExitStack
 from lxml import etree
 from fractions import Fraction
 from xmlschema.names import XML_NAMESPACE
@@ -96,11 +97,17 @@ class MeiParser(object):
         sections_el = scores_el[0].findall(self._ns_name("section"))
         position = 0
         measure_number = 1
-        for section_el in sections_el:
-            # insert in parts all elements except ties
-            position, measure_number = self._handle_section(
-                section_el, list(score.iter_parts(self.parts)), position, measure_number
-            )
+        parts = list(score.iter_parts(self.parts))
+        with ExitStack() as stack:
+            # timepoints are merged into the timelines once all sections are parsed
+            for part in parts:
+                stack.enter_context(part.bulk_add())
+
+            for section_el in sections_el:
+                # insert in parts all elements except ties
+                position, measure_number = self._handle_section(
+                    section_el, parts, position, measure_number
+                )
 
         # handles ties
         self._tie_notes(scores_el[0], self.parts)
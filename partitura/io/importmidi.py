@@ -772,6 +772,9 @@ def create_part(
 
     warnings.warn("add notes", stacklevel=2)
 
+    part_notes = []
+    onsets = []
+    offsets = []
     for (onset, pitch, duration), (step, alter, octave), voice, note_id in zip(
         notes, spellings, voices, note_ids
     ):
@@ -795,7 +798,11 @@ def create_part(
                 symbolic_duration=dict(type="quarter"),
             )
 
-        part.add(note, onset, onset + duration)
+        part_notes.append(note)
+        onsets.append(onset)
+        offsets.append(onset + duration)
+
+    part.add_many(part_notes, onsets, offsets)
 
     if not time_sigs:
         warnings.warn("No time signatures found, assuming 4/4")
@@ -27,6 +27,12 @@ __all__ = ["load_musicxml", "musicxml_to_notearray"]
 
 _MUSICXML_SCHEMA = pkg_resources.resource_filename("partitura", "assets/musicxml.xsd")
 _XML_VALIDATOR = None
+XML_PARSER_OPTIONS = dict(
+    resolve_entities=False,
+    huge_tree=False,
+    remove_comments=True,
+    remove_blank_text=True,
+)
 DYN_DIRECTIONS = {
     "f": score.ConstantLoudnessDirection,
     "ff": score.ConstantLoudnessDirection,
@@ -87,7 +93,54 @@ ACCIDENTAL_MAP = {
 }
 
 
-def validate_musicxml(xml, debug=False):
+def _build_validator(filename, xmlschema_version=None):
+    # `xmlschema_version` is not used to build the validator, but it is part
+    # of the key of the validator in the on-disk cache
+    return xmlschema.XMLSchema(filename)
+
+
+def get_musicxml_validator(cache_dir: Optional[PathLike] = None):
+    """
+    Get the validator of the MusicXML 3.1 schema.
+
+    Compiling the schema takes about a second, so the validator is
+    compiled once per process. If `cache_dir` is given, or the
+    `PARTITURA_CACHE_DIR` environment variable is set, the compiled
+    validator is also stored on disk (see
+    :class:`partitura.io.cache.LoadCache`), so that other processes
+    (e.g., the workers of :func:`partitura.io.corpus.iter_corpus`) load
+    it instead of compiling the schema again.
+
+    .. warning::
+        The validator is unpickled from the cache directory, so the
+        cache directory must be trusted.
+
+    Parameters
+    ----------
+    cache_dir : PathLike or None, optional
+        Directory of the on-disk cache.
+
+    Returns
+    -------
+    validator : xmlschema.XMLSchema
+        The validator.
+    """
+    global _XML_VALIDATOR
+    if _XML_VALIDATOR is None:
+        from partitura.io.cache import CACHE_DIR_ENV, LoadCache
+
+        if cache_dir is None and CACHE_DIR_ENV not in os.environ:
+            _XML_VALIDATOR = _build_validator(_MUSICXML_SCHEMA)
+        else:
+            _XML_VALIDATOR = LoadCache(cache_dir).load(
+                _MUSICXML_SCHEMA,
+                _build_validator,
+                xmlschema_version=xmlschema.__version__,
+            )
+    return _XML_VALIDATOR
+
+
+def validate_musicxml(xml, debug=False, lazy=False):
     """
     Validate an XML file against an XSD.
 
@@ -98,6 +151,9 @@ def validate_musicxml(xml, debug=False):
     debug: bool, optional
         If True, raise an exception when the xml is invalid, and print out the
         cause. Otherwise just return True when the XML is valid and False otherwise
+    lazy: bool, optional
+        If True, the XML file is validated incrementally, without loading
+        the whole document in memory.
 
     Returns
     -------
@@ -105,13 +161,13 @@ def validate_musicxml(xml, debug=False):
         None if debug=True, True or False otherwise, signalling validity
 
     """
-    global _XML_VALIDATOR
-    if not _XML_VALIDATOR:
-        _XML_VALIDATOR = xmlschema.XMLSchema(_MUSICXML_SCHEMA)
+    validator = get_musicxml_validator()
+    if lazy:
+        xml = xmlschema.XMLResource(xml, lazy=True)
     if debug:
-        return _XML_VALIDATOR.validate(xml)
+        return validator.validate(xml)
     else:
-        return _XML_VALIDATOR.is_valid(xml)
+        return validator.is_valid(xml)
 
 
 def _parse_partlist(partlist):
@@ -190,6 +246,7 @@ def load_musicxml(
     filename: PathLike,
     validate: bool = False,
     force_note_ids: Optional[Union[bool, str]] = None,
+    stream: bool = False,
 ) -> score.Score:
     """Parse a MusicXML file and build a composite score ontology
     structure from it (see also scoreontology.py).
@@ -208,6 +265,14 @@ def load_musicxml(
         assigned unique id attribute. Existing note id attributes in
         the MusicXML will be discarded. If 'keep', only notes without
         a note id will be assigned one.
+    stream : bool, optional
+        When True the MusicXML is parsed incrementally, measure by
+        measure, and the elements of each measure are discarded once
+        they are added to the part. This keeps the memory used for
+        parsing bounded by the size of a measure rather than the size of
+        the document, which is useful for large scores. The validation
+        (if `validate` is True) is also done incrementally. Defaults to
+        False.
 
     Returns
     -------
@@ -227,34 +292,32 @@ def load_musicxml(
         xml = filename
 
     if validate:
-        validate_musicxml(xml, debug=True)
+        validate_musicxml(xml, debug=True, lazy=stream)
         # if xml is a file-like object we need to set the read pointer to the
         # start of the file for parsing
         if hasattr(xml, "seek"):
             xml.seek(0)
 
-    parser = etree.XMLParser(
-        resolve_entities=False,
-        huge_tree=False,
-        remove_comments=True,
-        remove_blank_text=True,
-    )
-    document = etree.parse(xml, parser)
+    if stream:
+        document, partlist = _iterparse_musicxml(xml)
+    else:
+        parser = etree.XMLParser(**XML_PARSER_OPTIONS)
+        document = etree.parse(xml, parser)
 
-    if document.getroot().tag != "score-partwise":
-        raise Exception("Currently only score-partwise structure is supported")
+        if document.getroot().tag != "score-partwise":
+            raise Exception("Currently only score-partwise structure is supported")
 
-    partlist_el = document.find("part-list")
+        partlist_el = document.find("part-list")
 
-    if partlist_el is not None:
-        # parse the (hierarchical) structure of score parts
-        # (instruments) that are listed in the part-list element
-        partlist, part_dict = _parse_partlist(partlist_el)
-        # Go through each <part> to obtain the content of the parts.
-        # The Part instances will be modified in place
-        _parse_parts(document, part_dict)
-    else:
-        partlist = []
+        if partlist_el is not None:
+            # parse the (hierarchical) structure of score parts
+            # (instruments) that are listed in the part-list element
+            partlist, part_dict = _parse_partlist(partlist_el)
+            # Go through each <part> to obtain the content of the parts.
+            # The Part instances will be modified in place
+            _parse_parts(document, part_dict)
+        else:
+            partlist = []
 
     if force_note_ids is True or force_note_ids == "keep":
         assign_note_ids(partlist, force_note_ids == "keep")
@@ -358,82 +421,177 @@ def _parse_parts(document, part_dict):
     for part_el in document.findall("part"):
         part_id = part_el.get("id", "P1")
         part = part_dict.get(part_id, score.Part(part_id))
+        _parse_part(part, part_el.xpath("measure"))
 
-        position = 0
-        ongoing = {}
-        doc_order = 0
-        # add new page and system at start of part
-        _handle_new_page(position, part, ongoing)
-        _handle_new_system(position, part, ongoing)
 
-        for mc, measure_el in enumerate(part_el.xpath("measure")):
+def _iterparse_musicxml(xml):
+    """
+    Parse a MusicXML document incrementally, populating the parts with
+    the contents of each <measure> element as soon as it is parsed, and
+    discarding the element afterwards.
+
+    Parameters
+    ----------
+    xml : str or file-like object
+        Path to the MusicXML file to be parsed, or a file-like object
+
+    Returns
+    -------
+    document : lxml.etree.ElementTree
+        The ElementTree representation of the MusicXML document, in which
+        the <part> elements are empty
+    partlist : list
+        List of Part and PartGroup objects (see `_parse_partlist`)
+    """
+    parsed = {}
+    events = _iter_xml_events(xml, parsed)
+    partlist = []
+    part_dict = None
+    for event, el in events:
+        if el.getparent() is None or el.getparent().getparent() is not None:
+            # only direct children of the root are handled here
+            continue
+        if el.getparent().tag != "score-partwise":
+            raise Exception("Currently only score-partwise structure is supported")
+
+        if event == "end" and el.tag == "part-list":
+            partlist, part_dict = _parse_partlist(el)
+        elif event == "start" and el.tag == "part":
+            measures = _iter_measures(events, el)
+            if part_dict is not None:
+                part_id = el.get("id", "P1")
+                part = part_dict.get(part_id, score.Part(part_id))
+                _parse_part(part, measures)
+            # skip the remaining measures, if any
+            for _ in measures:
+                pass
+            el.clear()
+
+    document = parsed["root"].getroottree()
+    if document.getroot().tag != "score-partwise":
+        raise Exception("Currently only score-partwise structure is supported")
+
+    return document, partlist
+
+
+def _iter_xml_events(xml, parsed, chunk_size=2**16):
+    # Parse `xml` in chunks, yielding the start and end events of the
+    # <part-list>, <part> and <measure> elements. The root element is stored
+    # in `parsed` once the whole document is parsed. A pull parser is used
+    # (rather than `etree.iterparse`) because it also accepts file objects
+    # opened in text mode
+    parser = etree.XMLPullParser(
+        events=("start", "end"),
+        tag=("part-list", "part", "measure"),
+        **XML_PARSER_OPTIONS,
+    )
+    f = xml if hasattr(xml, "read") else open(xml, "rb")
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.read_events()
+    finally:
+        if f is not xml:
+            f.close()
+    parsed["root"] = parser.close()
+    yield from parser.read_events()
+
+
+def _iter_measures(events, part_el):
+    # Iterate over the <measure> elements of `part_el` as they are parsed,
+    # freeing the memory of each measure after it has been handled
+    for event, el in events:
+        if event == "end" and el is part_el:
+            return
+        if event == "end" and el.tag == "measure" and el.getparent() is part_el:
+            yield el
+            el.clear()
+            while el.getprevious() is not None:
+                del part_el[0]
+
+
+def _parse_part(part, measure_els):
+    """
+    Populate a Part instance with the musical content in a sequence of
+    <measure> elements.
+
+    Parameters
+    ----------
+    part : :class:`partitura.score.Part`
+        The part to populate
+    measure_els : iterable of lxml.etree.Element
+        The <measure> elements of the part
+    """
+    position = 0
+    ongoing = {}
+    doc_order = 0
+    # add new page and system at start of part
+    _handle_new_page(position, part, ongoing)
+    _handle_new_system(position, part, ongoing)
+
+    # timepoints are merged into the timeline once the measures are parsed
+    with part.bulk_add():
+        for mc, measure_el in enumerate(measure_els):
             position, doc_order = _handle_measure(
                 measure_el, position, part, ongoing, doc_order, mc + 1
             )
 
-        # complete unfinished endings
-        for o in part.iter_all(score.Ending, mode="ending"):
-            if o.start is None:
-                part.add(o, part.measure_map(o.end.t - 1)[0], None)
-                warnings.warn(
-                    "Found ending[stop] without a preceding ending[start]\n"
-                    "Single measure bracket is assumed"
-                )
-
-        for o in part.iter_all(score.Ending, mode="starting"):
-            if o.end is None:
-                part.add(o, None, part.measure_map(o.start.t)[1])
-                warnings.warn(
-                    "Found ending[start] without a following ending[stop]\n"
-                    "Single measure bracket is assumed"
-                )
+    # complete unfinished endings
+    for o in part.iter_all(score.Ending, mode="ending"):
+        if o.start is None:
+            part.add(o, part.measure_map(o.end.t - 1)[0], None)
+            warnings.warn(
+                "Found ending[stop] without a preceding ending[start]\n"
+                "Single measure bracket is assumed"
+            )
 
-        # Complete repeats without end.
-        volta_repeats = list()
-        for o in part.iter_all(score.Repeat, mode="starting"):
-            if o.end is None:
-                # if len(o.start.starting_objects[score.Repeat]) > 0:
-                #     starting = list(o.start.starting_objects[score.Repeat].keys())[0]
-                #     # if unstarted repeat from volta, continue for now
-                #     if len(starting.end.ending_objects[score.Repeat]) > 0:
-                #         # if repeat from volta, continue for now
-                #         volta_repeats.append(o)
-                #         continue
-
-                starting_repeats = [
-                    r for r in part.iter_all(score.Repeat) if r.start is not None
-                ]
-                end_times = [r.start.t for r in starting_repeats] + [part._points[-1].t]
-                end_time_id = np.searchsorted(end_times, o.start.t + 1)
-                part.add(o, None, end_times[end_time_id])
-                warnings.warn(
-                    "Found repeat without end\n"
-                    "Ending point {} is assumed".format(end_times[end_time_id])
-                )
+    for o in part.iter_all(score.Ending, mode="starting"):
+        if o.end is None:
+            part.add(o, None, part.measure_map(o.start.t)[1])
+            warnings.warn(
+                "Found ending[start] without a following ending[stop]\n"
+                "Single measure bracket is assumed"
+            )
 
-        # complete unstarted repeats
-        volta_repeats = list()
-        for o in part.iter_all(score.Repeat, mode="ending"):
-            if o.start is None:
-                if len(o.end.ending_objects[score.Ending]) > 0:
-                    ending = list(o.end.ending_objects[score.Ending].keys())[0]
-                    # if unstarted repeat from volta, continue for now
-                    if len(ending.start.ending_objects[score.Repeat]) > 0:
-                        volta_repeats.append(o)
-                        continue
-
-                # go back to the end of the last repeat
-                start_times = [0] + [r.end.t for r in part.iter_all(score.Repeat)]
-                start_time_id = np.searchsorted(start_times, o.end.t) - 1
-                part.add(o, start_times[start_time_id], None)
-                warnings.warn(
-                    "Found repeat without start\n"
-                    "Starting point {} is assumed".format(start_times[start_time_id])
-                )
+    # Complete repeats without end.
+    volta_repeats = list()
+    for o in part.iter_all(score.Repeat, mode="starting"):
+        if o.end is None:
+            # if len(o.start.starting_objects[score.Repeat]) > 0:
+            #     starting = list(o.start.starting_objects[score.Repeat].keys())[0]
+            #     # if unstarted repeat from volta, continue for now
+            #     if len(starting.end.ending_objects[score.Repeat]) > 0:
+            #         # if repeat from volta, continue for now
+            #         volta_repeats.append(o)
+            #         continue
+
+            starting_repeats = [
+                r for r in part.iter_all(score.Repeat) if r.start is not None
+            ]
+            end_times = [r.start.t for r in starting_repeats] + [part._points[-1].t]
+            end_time_id = np.searchsorted(end_times, o.start.t + 1)
+            part.add(o, None, end_times[end_time_id])
+            warnings.warn(
+                "Found repeat without end\n"
+                "Ending point {} is assumed".format(end_times[end_time_id])
+            )
 
-        # complete unstarted repeats in volta with start time of first repeat
-        for o in volta_repeats:
-            start_times = [0] + [r.start.t for r in part.iter_all(score.Repeat)]
+    # complete unstarted repeats
+    volta_repeats = list()
+    for o in part.iter_all(score.Repeat, mode="ending"):
+        if o.start is None:
+            if len(o.end.ending_objects[score.Ending]) > 0:
+                ending = list(o.end.ending_objects[score.Ending].keys())[0]
+                # if unstarted repeat from volta, continue for now
+                if len(ending.start.ending_objects[score.Repeat]) > 0:
+                    volta_repeats.append(o)
+                    continue
+
+            # go back to the end of the last repeat
+            start_times = [0] + [r.end.t for r in part.iter_all(score.Repeat)]
             start_time_id = np.searchsorted(start_times, o.end.t) - 1
             part.add(o, start_times[start_time_id], None)
             warnings.warn(
@@ -441,55 +599,65 @@ def _parse_parts(document, part_dict):
                 "Starting point {} is assumed".format(start_times[start_time_id])
             )
 
-        # remove unfinished elements from the timeline
-        for k, o in ongoing.items():
-            if k not in ("page", "system", "repeat") and k[0] not in ("tie", "ending"):
-                if isinstance(o, list):
-                    for o_i in o:
-                        part.remove(o_i)
-                else:
-                    part.remove(o)
-
-        # check whether all grace notes have a main note
-        for gn in part.iter_all(score.GraceNote):
-            if gn.main_note is None:
-                for no in part.iter_all(
-                    score.Note,
-                    include_subclasses=False,
-                    start=gn.start.t,
-                    end=gn.start.t + 1,
-                ):
-                    if no.voice == gn.voice:
-                        gn.last_grace_note_in_seq.grace_next = no
-
-            if gn.main_note is None:
-                warnings.warn(
-                    "grace note without recoverable same voice main note: {}".format(gn)
-                )
-                warnings.warn("might be cadenza notation")
-
-        # set end times for various musical elements that only have a start time
-        # when constructed from MusicXML
-        score.set_end_times(part)
-
-        # Octave Shifts are only visual doesn't to change the octave of notes.
-        # Apply octave shifts directly to notes
-        # for shift in part.iter_all(score.OctaveShiftDirection):
-        #     # Shifts normal notes
-        #     for note in part.iter_all(score.Note, start=shift.start.t, end=shift.end.t):
-        #         if note.staff == shift.staff:
-        #             if shift.shift_type == "up":
-        #                 note.octave -= OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
-        #             elif shift.shift_type == "down":
-        #                 note.octave += OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
-        #     # Shifts grace notes
-        #     for note in part.iter_all(score.GraceNote, start=shift.start.t, end=shift.end.t):
-        #         if note.staff == shift.staff:
-        #             if shift.shift_type == "up":
-        #                 note.octave -= OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
-        #             elif shift.shift_type == "down":
-        #                 note.octave += OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
-        #     shift.applied = True
+    # complete unstarted repeats in volta with start time of first repeat
+    for o in volta_repeats:
+        start_times = [0] + [r.start.t for r in part.iter_all(score.Repeat)]
+        start_time_id = np.searchsorted(start_times, o.end.t) - 1
+        part.add(o, start_times[start_time_id], None)
+        warnings.warn(
+            "Found repeat without start\n"
+            "Starting point {} is assumed".format(start_times[start_time_id])
+        )
+
+    # remove unfinished elements from the timeline
+    for k, o in ongoing.items():
+        if k not in ("page", "system", "repeat") and k[0] not in ("tie", "ending"):
+            if isinstance(o, list):
+                for o_i in o:
+                    part.remove(o_i)
+            else:
+                part.remove(o)
+
+    # check whether all grace notes have a main note
+    for gn in part.iter_all(score.GraceNote):
+        if gn.main_note is None:
+            for no in part.iter_all(
+                score.Note,
+                include_subclasses=False,
+                start=gn.start.t,
+                end=gn.start.t + 1,
+            ):
+                if no.voice == gn.voice:
+                    gn.last_grace_note_in_seq.grace_next = no
+
+        if gn.main_note is None:
+            warnings.warn(
+                "grace note without recoverable same voice main note: {}".format(gn)
+            )
+            warnings.warn("might be cadenza notation")
+
+    # set end times for various musical elements that only have a start time
+    # when constructed from MusicXML
+    score.set_end_times(part)
+
+    # Octave Shifts are only visual doesn't to change the octave of notes.
+    # Apply octave shifts directly to notes
+    # for shift in part.iter_all(score.OctaveShiftDirection):
+    #     # Shifts normal notes
+    #     for note in part.iter_all(score.Note, start=shift.start.t, end=shift.end.t):
+    #         if note.staff == shift.staff:
+    #             if shift.shift_type == "up":
+    #                 note.octave -= OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
+    #             elif shift.shift_type == "down":
+    #                 note.octave += OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
+    #     # Shifts grace notes
+    #     for note in part.iter_all(score.GraceNote, start=shift.start.t, end=shift.end.t):
+    #         if note.staff == shift.staff:
+    #             if shift.shift_type == "up":
+    #                 note.octave -= OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
+    #             elif shift.shift_type == "down":
+    #                 note.octave += OCTAVE_SHIFTS[shift.shift_size] if shift.shift_size in OCTAVE_SHIFTS.keys() else 0
+    #     shift.applied = True
 
 
 def _handle_measure(measure_el, position, part, ongoing, doc_order, measure_counter):
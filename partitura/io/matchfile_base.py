@@ -34,6 +34,7 @@ from partitura.io.matchfile_utils import (
     format_list,
     MatchKeySignature,
     MatchTimeSignature,
+    format_pnote_id,
 )
 
 from partitura.utils.misc import (
@@ -50,6 +51,46 @@ class MatchError(Exception):
     pass
 
 
+# The functors of a match line are the name of its first element (e.g.,
+# "snote", "info" or "insertion") and, for lines combining two elements,
+# the name of the last one (e.g., "note" or "deletion").
+FUNCTOR_PATTERN = re.compile(r"(?P<Head>[a-z_]+)(?:\(.*\)-(?P<Tail>[a-z_]+))?")
+
+
+def get_matchline_functors(matchline: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the functors of a match line, used to select the class that
+    parses the line without trying all match line classes.
+
+    Parameters
+    ----------
+    matchline : str
+        String with a matchline
+
+    Returns
+    -------
+    head : str or None
+        Name of the first element of the line (e.g., "snote"), or None
+        if the line does not start with a functor.
+    tail : str or None
+        Name of the last element of the line (e.g., "note" or "deletion")
+        if the line combines two elements, and None otherwise.
+
+    Examples
+    --------
+    >>> get_matchline_functors("snote(n1,[C,n],4,1:1,0,1/4,0.0,1.0,[])-deletion.")
+    ('snote', 'deletion')
+    >>> get_matchline_functors("sustain(779,59).")
+    ('sustain', None)
+    """
+    match_pattern = FUNCTOR_PATTERN.match(matchline)
+
+    if match_pattern is None:
+        return None, None
+
+    return match_pattern.group("Head"), match_pattern.group("Tail")
+
+
 class MatchLine(object):
     """
     Base class for representing match lines.
@@ -1007,13 +1048,41 @@ snote_classes = (BaseSnoteLine, BaseSnoteNoteLine, BaseDeletionLine)
 note_classes = (BaseNoteLine, BaseSnoteNoteLine, BaseInsertionLine)
 
 
+def _make_structured_array(
+    rows: List[tuple], fields: List[Tuple[str, Optional[type]]]
+) -> np.ndarray:
+    """
+    Make a structured array from a list of rows. The type of the fields
+    with dtype None is inferred from the values.
+    """
+    columns = list(zip(*rows)) if len(rows) > 0 else [[]] * len(fields)
+    arrays = [
+        np.array(column, dtype=dtype) for column, (_, dtype) in zip(columns, fields)
+    ]
+    structured_array = np.empty(
+        len(rows),
+        dtype=[(name, array.dtype) for (name, _), array in zip(fields, arrays)],
+    )
+    for (name, _), array in zip(fields, arrays):
+        structured_array[name] = array
+
+    return structured_array
+
+
 class MatchFile(object):
     """
     Class for representing MatchFiles
+
+    Besides the list of match lines, a MatchFile provides a columnar view
+    of the score notes, performed notes, score-to-performance note pairs
+    and pedal lines as structured arrays (see `snote_array`,
+    `pnote_array`, `note_pair_array` and `pedal_array`). These arrays are
+    computed (once) the first time they are accessed. The `line` field of
+    each array is the index of the corresponding `MatchLine` object in
+    `lines`.
     """
 
     version: Version
-    lines: np.ndarray
 
     def __init__(self, lines: Iterable[MatchLine]) -> None:
         # check that all lines have the same version
@@ -1024,53 +1093,205 @@ class MatchFile(object):
 
         self.lines = np.array(lines)
 
+    @property
+    def lines(self) -> np.ndarray:
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: np.ndarray) -> None:
+        self._lines = lines
+        # reset the columnar view of the lines
+        self._columns = None
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Structured arrays with the information of the match lines,
+        indexed by "snote", "pnote", "note_pair", "pedal" and "attribute"
+        (for the lines specifying an attribute, like info lines).
+        """
+        if self._columns is None:
+            self._columns = self._make_columns()
+        return self._columns
+
+    def _make_columns(self) -> Dict[str, np.ndarray]:
+        snote_rows = []
+        pnote_rows = []
+        note_pair_rows = []
+        pedal_rows = []
+        attribute_rows = []
+        # the kind of information contained in each class of match line
+        line_kinds = {}
+        for i, line in enumerate(self.lines):
+            line_type = type(line)
+            if line_type not in line_kinds:
+                pedal_number = None
+                if issubclass(line_type, BaseSustainPedalLine):
+                    pedal_number = 64
+                elif issubclass(line_type, BaseSoftPedalLine):
+                    pedal_number = 67
+                line_kinds[line_type] = (
+                    issubclass(line_type, snote_classes),
+                    issubclass(line_type, note_classes),
+                    issubclass(line_type, BaseSnoteNoteLine),
+                    pedal_number,
+                    issubclass(line_type, BaseInfoLine),
+                )
+            has_snote, has_note, is_pair, pedal_number, is_info = line_kinds[line_type]
+
+            if has_snote:
+                snote = line if isinstance(line, BaseSnoteLine) else line.snote
+                snote_rows.append(
+                    (
+                        str(snote.Anchor),
+                        snote.Measure,
+                        snote.OnsetInBeats,
+                        snote.DurationInBeats,
+                        i,
+                    )
+                )
+            if has_note:
+                note = line if isinstance(line, BaseNoteLine) else line.note
+                pnote_rows.append(
+                    (
+                        format_pnote_id(note.Id),
+                        note.MidiPitch,
+                        note.Onset,
+                        note.Offset,
+                        note.Velocity,
+                        getattr(note, "Track", 0),
+                        getattr(note, "Channel", 0),
+                        i,
+                    )
+                )
+            if is_pair:
+                note_pair_rows.append((len(snote_rows) - 1, len(pnote_rows) - 1, i))
+            elif pedal_number is not None:
+                pedal_rows.append((pedal_number, line.Time, line.Value, i))
+            elif hasattr(line, "Attribute"):
+                # info, meta and score property lines
+                attribute_rows.append((line.Attribute, is_info, i))
+
+        # The type of the fields with dtype None is inferred from the
+        # values (e.g., MIDI ticks are floats in some versions).
+        columns = dict(
+            snote=_make_structured_array(
+                snote_rows,
+                [
+                    ("id", str),
+                    ("measure", None),
+                    ("onset_beat", float),
+                    ("duration_beat", float),
+                    ("line", int),
+                ],
+            ),
+            pnote=_make_structured_array(
+                pnote_rows,
+                [
+                    ("id", str),
+                    ("pitch", int),
+                    ("onset_tick", None),
+                    ("offset_tick", None),
+                    ("velocity", int),
+                    ("track", int),
+                    ("channel", int),
+                    ("line", int),
+                ],
+            ),
+            note_pair=_make_structured_array(
+                note_pair_rows,
+                [("snote_idx", int), ("pnote_idx", int), ("line", int)],
+            ),
+            pedal=_make_structured_array(
+                pedal_rows,
+                [("number", int), ("time", None), ("value", int), ("line", int)],
+            ),
+            attribute=_make_structured_array(
+                attribute_rows, [("attribute", str), ("is_info", bool), ("line", int)]
+            ),
+        )
+        return columns
+
+    @property
+    def snote_array(self) -> np.ndarray:
+        """
+        Structured array with the score notes (with fields "id",
+        "measure", "onset_beat", "duration_beat" and "line")
+        """
+        return self.columns["snote"]
+
+    @property
+    def pnote_array(self) -> np.ndarray:
+        """
+        Structured array with the performed notes (with fields "id",
+        "pitch", "onset_tick", "offset_tick", "velocity", "track",
+        "channel" and "line")
+        """
+        return self.columns["pnote"]
+
+    @property
+    def note_pair_array(self) -> np.ndarray:
+        """
+        Structured array with the (snote, note) pairs, given as the
+        indices "snote_idx" and "pnote_idx" of the notes in `snote_array`
+        and `pnote_array`.
+        """
+        return self.columns["note_pair"]
+
+    @property
+    def pedal_array(self) -> np.ndarray:
+        """
+        Structured array with the pedal lines (with fields "number", which
+        is 64 for the sustain pedal and 67 for the soft pedal, "time",
+        "value" and "line")
+        """
+        return self.columns["pedal"]
+
     @property
     def note_pairs(self) -> List[Tuple[BaseSnoteLine, BaseNoteLine]]:
         """
         Return all(snote, note) tuples
 
         """
-        return [
-            (x.snote, x.note) for x in self.lines if isinstance(x, BaseSnoteNoteLine)
-        ]
+        return [(x.snote, x.note) for x in self.lines[self.note_pair_array["line"]]]
 
     @property
     def notes(self) -> List[BaseNoteLine]:
         """
         Return all performed notes (as MatchNote objects)
         """
-        return [x.note for x in self.lines if isinstance(x, note_classes)]
+        return list(self.iter_notes())
 
     def iter_notes(self) -> BaseNoteLine:
         """
         Iterate over all performed notes (as MatchNote objects)
         """
-        for x in self.lines:
-            if isinstance(x, note_classes):
-                yield x.note
+        for x in self.lines[self.pnote_array["line"]]:
+            yield x if isinstance(x, BaseNoteLine) else x.note
 
     @property
     def snotes(self) -> List[BaseSnoteLine]:
         """
         Return all score notes (as MatchSnote objects)
         """
-        return [x.snote for x in self.lines if isinstance(x, snote_classes)]
+        return list(self.iter_snotes())
 
     def iter_snotes(self) -> BaseSnoteLine:
         """
-        Iterate over all performed notes (as MatchNote objects)
+        Iterate over all score notes (as MatchSnote objects)
         """
-        for x in self.lines:
-            if hasattr(x, "snote"):
-                yield x.snote
+        for x in self.lines[self.snote_array["line"]]:
+            yield x if isinstance(x, BaseSnoteLine) else x.snote
 
     @property
     def sustain_pedal(self) -> List[BaseSustainPedalLine]:
-        return [line for line in self.lines if isinstance(line, BaseSustainPedalLine)]
+        pedal_array = self.pedal_array
+        return list(self.lines[pedal_array["line"][pedal_array["number"] == 64]])
 
     @property
     def soft_pedal(self) -> List[BasePedalLine]:
-        return [line for line in self.lines if isinstance(line, BaseSoftPedalLine)]
+        pedal_array = self.pedal_array
+        return list(self.lines[pedal_array["line"][pedal_array["number"] == 67]])
 
     @property
     def insertions(self) -> List[BaseNoteLine]:
@@ -1086,7 +1307,8 @@ class MatchFile(object):
         Return all InfoLine objects
 
         """
-        return [i for i in self.lines if isinstance(i, BaseInfoLine)]
+        attribute_array = self.columns["attribute"]
+        return list(self.lines[attribute_array["line"][attribute_array["is_info"]]])
 
     def info(
         self, attribute: Optional[str] = None
@@ -1099,21 +1321,23 @@ class MatchFile(object):
 
         """
         if attribute:
-            try:
-                idx = [i.Attribute for i in self._info].index(attribute)
-                return self._info[idx].Value
-            except ValueError:
+            attribute_array = self.columns["attribute"]
+            idxs = np.flatnonzero(
+                attribute_array["is_info"] & (attribute_array["attribute"] == attribute)
+            )
+            if len(idxs) == 0:
                 return None
+            return self.lines[attribute_array["line"][idxs[0]]].Value
         else:
             return self._info
 
     @property
     def first_onset(self) -> float:
-        return min([n.OnsetInBeats for n in self.snotes])
+        return self.snote_array["onset_beat"].min().item()
 
     @property
     def first_measure(self) -> float:
-        return min([n.Measure for n in self.snotes])
+        return self.snote_array["measure"].min().item()
 
     @property
     def time_signatures(self):
@@ -1145,11 +1369,12 @@ class MatchFile(object):
 
     @property
     def time_sig_lines(self):
-        ml = [
-            line
-            for line in self.lines
-            if getattr(line, "Attribute", None) == "timeSignature"
-        ]
+        attribute_array = self.columns["attribute"]
+        ml = list(
+            self.lines[
+                attribute_array["line"][attribute_array["attribute"] == "timeSignature"]
+            ]
+        )
         return ml
 
     @property
@@ -1180,11 +1405,12 @@ class MatchFile(object):
 
     @property
     def key_sig_lines(self):
-        ml = [
-            line
-            for line in self.lines
-            if getattr(line, "Attribute", None) == "keySignature"
-        ]
+        attribute_array = self.columns["attribute"]
+        ml = list(
+            self.lines[
+                attribute_array["line"][attribute_array["attribute"] == "keySignature"]
+            ]
+        )
 
         return ml
 
@@ -989,6 +989,24 @@ FROM_MATCHLINE_METHODS = [
     MatchMeta.from_matchline,
 ]
 
+# `from_matchline` methods indexed by the functors of the line (see
+# `get_matchline_functors`). Lines combining two elements are indexed by
+# "{head}-{tail}" if the second element determines the type of the line.
+FROM_MATCHLINE_FUNCTORS = {
+    "snote-note": MatchSnoteNote.from_matchline,
+    "snote-deletion": MatchSnoteDeletion.from_matchline,
+    "snote-trailing_score_note": MatchSnoteTrailingScore.from_matchline,
+    "snote-no_played_note": MatchSnoteNoPlayedNote.from_matchline,
+    "insertion": MatchInsertionNote.from_matchline,
+    "hammer_bounce": MatchHammerBounceNote.from_matchline,
+    "trailing_played_note": MatchTrailingPlayedNote.from_matchline,
+    "trill": MatchTrillNote.from_matchline,
+    "sustain": MatchSustainPedal.from_matchline,
+    "soft": MatchSoftPedal.from_matchline,
+    "info": MatchInfo.from_matchline,
+    "meta": MatchMeta.from_matchline,
+}
+
 
 def parse_matchline(line: str, version: Version) -> Optional[MatchLine]:
     def parse(mlt: MatchLine) -> Optional[MatchLine]:
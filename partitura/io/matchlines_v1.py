@@ -1277,6 +1277,22 @@ FROM_MATCHLINE_METHODS = [
     MatchStimePtime.from_matchline,
 ]
 
+# `from_matchline` methods indexed by the functors of the line (see
+# `get_matchline_functors`). Lines combining two elements are indexed by
+# "{head}-{tail}" if the second element determines the type of the line.
+FROM_MATCHLINE_FUNCTORS = {
+    "snote-note": MatchSnoteNote.from_matchline,
+    "snote-deletion": MatchSnoteDeletion.from_matchline,
+    "insertion": MatchInsertionNote.from_matchline,
+    "ornament": MatchOrnamentNote.from_matchline,
+    "sustain": MatchSustainPedal.from_matchline,
+    "soft": MatchSoftPedal.from_matchline,
+    "info": MatchInfo.from_matchline,
+    "scoreprop": MatchScoreProp.from_matchline,
+    "section": MatchSection.from_matchline,
+    "stime": MatchStimePtime.from_matchline,
+}
+
 
 ## Helper methods to build the corresponding line for each parameter
 
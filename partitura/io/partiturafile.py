@@ -0,0 +1,818 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for saving and loading scores and parts in
+partitura's own binary format.
+
+A file stores the timeline of each part and all timed objects (notes,
+ties, slurs, measures, directions, time and key signatures, repeats,
+etc.) as columnar arrays, with one column per class and attribute. The
+references between objects (like `tie_next` or `slur_starts`) and from
+the timeline to the objects are stored as integer indices into the
+table of objects. Columns of a single type (int, float, bool or str)
+are stored as typed arrays, and other values are pickled, storing each
+distinct value only once.
+
+The file starts with a fixed-size preamble (magic bytes, format version
+and header length), followed by a JSON header describing the columns
+and the arrays, and by the data of the arrays, which are aligned so
+that they can be memory mapped.
+
+Loading a file only creates objects of the classes in
+`partitura.score` and `partitura.performance`, and the pickled values
+may only refer to these classes and to the types in `PICKLE_GLOBALS`.
+Still, unpickling data is not safe in general (a crafted file can,
+e.g., exhaust the memory), so only load files from trusted sources.
+"""
+import gc
+import importlib
+import io
+import json
+import pickle
+import struct
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from partitura.score import Part, Score, TimedObject, TimePoint
+from partitura.utils.misc import PathLike
+
+__all__ = ["save_partitura", "load_partitura"]
+
+MAGIC = b"PARTITUR"
+FORMAT_VERSION = 1
+# magic bytes, format version and length of the header
+PREAMBLE = struct.Struct("<8sIQ")
+# keys of the JSON header
+HEADER_KEYS = ("classes", "columns", "part_classes", "timelines", "detached", "arrays")
+# alignment of the arrays in the file, in bytes
+ALIGNMENT = 64
+
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+# types of values that cannot contain references to other objects
+ATOM_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+# modules whose classes can be stored in a file
+CLASS_MODULES = ("partitura.score", "partitura.performance")
+
+# other globals that pickled values may refer to, as (module, name) pairs
+PICKLE_GLOBALS = frozenset(
+    [
+        ("builtins", name)
+        for name in (
+            "bool",
+            "bytearray",
+            "bytes",
+            "complex",
+            "dict",
+            "float",
+            "frozenset",
+            "int",
+            "list",
+            "range",
+            "set",
+            "slice",
+            "str",
+            "tuple",
+        )
+    ]
+    + [
+        ("collections", "OrderedDict"),
+        ("collections", "defaultdict"),
+        ("collections", "deque"),
+        ("fractions", "Fraction"),
+        # strings returned by lxml (e.g., the text of MusicXML elements)
+        ("lxml.etree", "_ElementUnicodeResult"),
+        ("numpy", "dtype"),
+        ("numpy", "ndarray"),
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy.core.multiarray", "scalar"),
+        ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "scalar"),
+    ]
+)
+
+# attributes of Part that are rebuilt when loading
+PART_TIMELINE_ATTRS = (
+    "_points",
+    "_point_times",
+    "_pending_points",
+    "_bulk_depth",
+    "_starting_index",
+    "_ending_index",
+    "_class_closures",
+    "_index_cache",
+    "_version",
+    "_version_cache",
+    "_quarter_map",
+)
+
+
+class PartituraFileError(Exception):
+    pass
+
+
+def _without_gc(func):
+    # Disable the cyclic garbage collector while building or traversing
+    # the objects of a score. Otherwise, the collector runs repeatedly over
+    # all the objects created so far, which takes more time than the
+    # conversion itself for large scores
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if enabled:
+                gc.enable()
+
+    return wrapper
+
+
+def _class_path(cls: type) -> str:
+    if cls.__module__ not in CLASS_MODULES:
+        raise PartituraFileError(
+            "Cannot save objects of class {0}. Only classes defined in {1} "
+            "can be saved".format(cls.__qualname__, ", ".join(CLASS_MODULES))
+        )
+    return "{0}:{1}".format(cls.__module__, cls.__qualname__)
+
+
+def _import_class(path: str, base: type) -> type:
+    # get a subclass of `base` defined in one of the `CLASS_MODULES`
+    module_name, _, qualname = str(path).partition(":")
+    obj = None
+    if module_name in CLASS_MODULES:
+        obj = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name, None)
+    if not (
+        isinstance(obj, type)
+        and issubclass(obj, base)
+        and obj.__module__ == module_name
+    ):
+        raise PartituraFileError(
+            "Class {0} is not allowed in a partitura file".format(path)
+        )
+    return obj
+
+
+def _atom_key(value):
+    # hashable key of an atom. Floats are compared by representation, so
+    # that 0.0 and -0.0 (or 1 and 1.0) are different values
+    return (type(value), repr(value) if type(value) is float else value)
+
+
+def _flat_key(value):
+    # A hashable key identifying `value` if it is an atom or a container
+    # of atoms (e.g., a list of strings), and None otherwise
+    cls = type(value)
+    if cls in ATOM_TYPES:
+        return _atom_key(value)
+    elif isinstance(value, np.generic):
+        return (cls, value.tobytes())
+    elif cls is dict:
+        if all(
+            type(k) in ATOM_TYPES and type(v) in ATOM_TYPES for k, v in value.items()
+        ):
+            return (cls, tuple((_atom_key(k), _atom_key(v)) for k, v in value.items()))
+    elif cls in (list, tuple, set, frozenset):
+        if all(type(v) in ATOM_TYPES for v in value):
+            return (cls, tuple(_atom_key(v) for v in value))
+    return None
+
+
+def _iter_refs(value):
+    # the timed objects referred to by an attribute value
+    if isinstance(value, TimedObject):
+        yield value
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            if isinstance(item, TimedObject):
+                yield item
+    elif isinstance(value, dict):
+        for item in value.values():
+            if isinstance(item, TimedObject):
+                yield item
+
+
+class _Pickler(pickle.Pickler):
+    # pickles timed objects and parts as references to their indices
+    def __init__(self, file, obj_index, part_index):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.obj_index = obj_index
+        self.part_index = part_index
+
+    def persistent_id(self, obj):
+        if isinstance(obj, TimedObject):
+            if obj not in self.obj_index:
+                raise PartituraFileError(
+                    "Cannot save a reference to {0}, which is not part "
+                    "of the score".format(obj)
+                )
+            return ("object", self.obj_index[obj])
+        if isinstance(obj, Part):
+            if obj not in self.part_index:
+                raise PartituraFileError(
+                    "Cannot save a reference to {0}, which is not part "
+                    "of the score".format(obj)
+                )
+            return ("part", self.part_index[obj])
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    # restores references to timed objects and parts, and only allows
+    # the classes of `CLASS_MODULES` and the globals in `PICKLE_GLOBALS`
+    def __init__(self, file, objects, parts):
+        super().__init__(file)
+        self.objects = objects
+        self.parts = parts
+
+    def persistent_load(self, pid):
+        kind, idx = pid
+        return self.objects[idx] if kind == "object" else self.parts[idx]
+
+    def find_class(self, module, name):
+        if module in CLASS_MODULES:
+            return _import_class("{0}:{1}".format(module, name), object)
+        if (module, name) not in PICKLE_GLOBALS:
+            raise PartituraFileError(
+                "Global {0}.{1} is not allowed in a partitura file".format(module, name)
+            )
+        return super().find_class(module, name)
+
+
+class _Writer(object):
+    # collects the arrays and column descriptions of a file
+
+    def __init__(self, obj_index, part_index):
+        self.obj_index = obj_index
+        self.part_index = part_index
+        self.arrays = {}
+
+    def dumps(self, value):
+        f = io.BytesIO()
+        _Pickler(f, self.obj_index, self.part_index).dump(value)
+        return f.getvalue()
+
+    def add_bytes(self, name, blobs):
+        # store a list of byte strings as a buffer and offsets
+        offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in blobs], out=offsets[1:])
+        self.arrays[name + "/offsets"] = offsets
+        self.arrays[name + "/data"] = np.frombuffer(b"".join(blobs), dtype=np.uint8)
+
+    def add_indices(self, name, lists):
+        # store a list of lists of indices as a buffer and offsets
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices in lists], out=offsets[1:])
+        self.arrays[name + "/offsets"] = offsets
+        self.arrays[name + "/values"] = np.array(
+            [i for indices in lists for i in indices], dtype=np.int64
+        )
+
+    def add_column(self, name, values):
+        """
+        Store a column of values, and return its kind.
+        """
+        types = set(map(type, values))
+        has_none = type(None) in types
+        types.discard(type(None))
+
+        kind = "object"
+        if not types:
+            kind = "none"
+        elif len(types) == 1 and next(iter(types)) in (int, float, bool, str, list):
+            kind = next(iter(types)).__name__
+            if kind == "int" and not all(
+                INT64_MIN <= v <= INT64_MAX for v in values if v is not None
+            ):
+                kind = "object"
+            elif kind == "list":
+                kind = (
+                    "reflist"
+                    if not has_none
+                    and all(isinstance(x, TimedObject) for v in values for x in v)
+                    else "object"
+                )
+        elif all(isinstance(v, TimedObject) for v in values if v is not None):
+            kind = "ref"
+
+        if kind in ("int", "float", "bool"):
+            dtype = dict(int=np.int64, float=np.float64, bool=np.bool_)[kind]
+            self.arrays[name + "/values"] = np.array(
+                [v if v is not None else 0 for v in values], dtype=dtype
+            )
+        elif kind == "str":
+            self.add_bytes(
+                name, [v.encode("utf8") if v is not None else b"" for v in values]
+            )
+        elif kind == "ref":
+            self.arrays[name + "/values"] = np.array(
+                [self.obj_index[v] if v is not None else -1 for v in values],
+                dtype=np.int64,
+            )
+        elif kind == "reflist":
+            self.add_indices(name, [[self.obj_index[x] for x in v] for v in values])
+        elif kind == "object":
+            # store each distinct (pickled) value only once. Values without
+            # references are identified by a key, to avoid pickling them
+            # for each object
+            blob_codes = {}
+            flat_codes = {}
+            codes = np.empty(len(values), dtype=np.int64)
+            for i, value in enumerate(values):
+                key = _flat_key(value)
+                code = flat_codes.get(key) if key is not None else None
+                if code is None:
+                    code = blob_codes.setdefault(self.dumps(value), len(blob_codes))
+                    if key is not None:
+                        flat_codes[key] = code
+                codes[i] = code
+            self.arrays[name + "/codes"] = codes
+            self.add_bytes(name, list(blob_codes))
+
+        if has_none and kind in ("int", "float", "bool", "str"):
+            self.arrays[name + "/none"] = np.array([v is None for v in values])
+
+        return kind
+
+
+class _Reader(object):
+    # reads the arrays and columns of a file
+
+    def __init__(self, arrays, objects, parts):
+        self.arrays = arrays
+        self.objects = objects
+        self.parts = parts
+
+    def loads(self, blob):
+        return _Unpickler(io.BytesIO(blob), self.objects, self.parts).load()
+
+    def get_bytes(self, name):
+        offsets = self.arrays[name + "/offsets"].tolist()
+        data = self.arrays[name + "/data"].tobytes()
+        return [data[i:j] for i, j in zip(offsets[:-1], offsets[1:])]
+
+    def get_column(self, name, kind, n):
+        """
+        Load a column of `n` values of a given kind as a list.
+        """
+        if kind == "none":
+            return [None] * n
+        elif kind in ("int", "float", "bool"):
+            values = self.arrays[name + "/values"].tolist()
+        elif kind == "str":
+            values = [b.decode("utf8") for b in self.get_bytes(name)]
+        elif kind == "ref":
+            objects = self.objects
+            values = [
+                objects[i] if i >= 0 else None
+                for i in self.arrays[name + "/values"].tolist()
+            ]
+        elif kind == "reflist":
+            objects = self.objects
+            offsets = self.arrays[name + "/offsets"].tolist()
+            refs = self.arrays[name + "/values"].tolist()
+            values = [
+                [objects[k] for k in refs[i:j]]
+                for i, j in zip(offsets[:-1], offsets[1:])
+            ]
+        elif kind == "object":
+            blobs = self.get_bytes(name)
+            unique = [self.loads(blob) for blob in blobs]
+            # mutable values are copied (or unpickled again, if they may
+            # contain references) for each row, so that they are not
+            # shared between objects
+            modes = []
+            for value in unique:
+                flat = _flat_key(value) is not None
+                if flat and type(value) not in (list, dict, set):
+                    modes.append("share")
+                elif flat:
+                    modes.append("copy")
+                else:
+                    modes.append("unpickle")
+            values = []
+            for code in self.arrays[name + "/codes"].tolist():
+                mode = modes[code]
+                if mode == "share":
+                    values.append(unique[code])
+                elif mode == "copy":
+                    values.append(unique[code].copy())
+                else:
+                    values.append(self.loads(blobs[code]))
+        else:
+            raise PartituraFileError("Unknown column kind {0}".format(kind))
+
+        none_name = name + "/none"
+        if none_name in self.arrays:
+            values = [
+                None if is_none else v
+                for v, is_none in zip(values, self.arrays[none_name].tolist())
+            ]
+        return values
+
+
+def _collect_objects(
+    parts: List[Part],
+) -> Tuple[List[TimedObject], Dict[TimedObject, int]]:
+    # All timed objects in the timelines of `parts`, and the timed objects
+    # they refer to
+    objects = []
+    obj_index = {}
+    stack = []
+
+    def visit(obj):
+        if obj not in obj_index:
+            obj_index[obj] = len(objects)
+            objects.append(obj)
+            stack.append(obj)
+
+    for part in parts:
+        for tp in part._points:
+            for objs in tp.starting_objects.values():
+                for obj in objs:
+                    visit(obj)
+            for objs in tp.ending_objects.values():
+                for obj in objs:
+                    visit(obj)
+
+        while stack:
+            obj = stack.pop()
+            for name, value in obj.__dict__.items():
+                if type(value) in ATOM_TYPES or name in ("start", "end"):
+                    continue
+                for ref in _iter_refs(value):
+                    visit(ref)
+
+    return objects, obj_index
+
+
+@_without_gc
+def save_partitura(score_data: Union[Score, Part], filename: PathLike) -> None:
+    """
+    Save a score or a part in partitura's binary format.
+
+    The file can be loaded with :func:`load_partitura`, which restores
+    the timeline and all the attributes of the objects of the score,
+    including the references between objects. The values of the
+    attributes should be picklable, and refer only to the classes
+    allowed when loading (see :func:`load_partitura`).
+
+    Parameters
+    ----------
+    score_data : :class:`partitura.score.Score` or :class:`partitura.score.Part`
+        The score or part to save. When saving a part, the part group
+        it belongs to (its `parent` attribute) is not saved.
+    filename : PathLike
+        The path of the file.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> import partitura as pt
+    >>> score = pt.load_musicxml(pt.EXAMPLE_MUSICXML)
+    >>> fn = os.path.join(tempfile.mkdtemp(), "score_example.partitura")
+    >>> pt.save_partitura(score, fn)
+    >>> loaded = pt.load_partitura(fn)
+    >>> bool(all(loaded.note_array() == score.note_array()))
+    True
+    """
+    if isinstance(score_data, Score):
+        parts = list(score_data.parts)
+    elif isinstance(score_data, Part):
+        parts = [score_data]
+    else:
+        raise ValueError(
+            "`score_data` should be a Score or a Part, but is {0}".format(
+                type(score_data)
+            )
+        )
+
+    for part in parts:
+        part._flush_points()
+
+    objects, obj_index = _collect_objects(parts)
+    part_index = dict((part, i) for i, part in enumerate(parts))
+    writer = _Writer(obj_index, part_index)
+
+    classes = list(dict.fromkeys(type(obj) for obj in objects))
+    class_codes = dict((cls, i) for i, cls in enumerate(classes))
+    obj_class = np.array([class_codes[type(obj)] for obj in objects], dtype=np.int64)
+    writer.arrays["objects/class"] = obj_class
+
+    class_columns = []
+    for code, cls in enumerate(classes):
+        rows = [objects[i] for i in np.flatnonzero(obj_class == code)]
+        names = list(
+            dict.fromkeys(
+                name
+                for obj in rows
+                for name in obj.__dict__
+                if name not in ("start", "end")
+            )
+        )
+        columns = []
+        for j, name in enumerate(names):
+            array_name = "class{0}/{1}".format(code, j)
+            present = [name in obj.__dict__ for obj in rows]
+            if not all(present):
+                writer.arrays[array_name + "/present"] = np.array(present)
+            kind = writer.add_column(
+                array_name, [obj.__dict__[name] for obj in rows if name in obj.__dict__]
+            )
+            columns.append((name, kind))
+        class_columns.append(columns)
+
+    # the start and end of each object, as indices into the timepoints of
+    # all parts, followed by the timepoints that are not in a timeline
+    # (some objects, like beams, refer to timepoints without being
+    # registered in the timeline). Timepoints are not hashable, so they
+    # are indexed by id
+    point_index = {}
+    for part in parts:
+        for tp in part._points:
+            point_index[id(tp)] = len(point_index)
+    detached_points = []
+    for name in ("start", "end"):
+        indices = np.full(len(objects), -1, dtype=np.int64)
+        for i, obj in enumerate(objects):
+            tp = getattr(obj, name, None)
+            if tp is None:
+                continue
+            if id(tp) not in point_index:
+                point_index[id(tp)] = len(point_index)
+                detached_points.append(tp)
+            indices[i] = point_index[id(tp)]
+        writer.arrays["objects/{0}".format(name)] = indices
+    detached = dict(
+        t=writer.add_column("detached/t", [tp.t for tp in detached_points]),
+        quarter=writer.add_column(
+            "detached/quarter", [tp.quarter for tp in detached_points]
+        ),
+        n_points=len(detached_points),
+    )
+
+    timelines = []
+    for p, part in enumerate(parts):
+        points = part._points
+        starting = [
+            [obj_index[obj] for objs in tp.starting_objects.values() for obj in objs]
+            for tp in points
+        ]
+        ending = [
+            [obj_index[obj] for objs in tp.ending_objects.values() for obj in objs]
+            for tp in points
+        ]
+        timeline = dict(
+            t=writer.add_column("part{0}/t".format(p), [tp.t for tp in points]),
+            quarter=writer.add_column(
+                "part{0}/quarter".format(p), [tp.quarter for tp in points]
+            ),
+            n_points=len(points),
+        )
+        writer.add_indices("part{0}/starting".format(p), starting)
+        writer.add_indices("part{0}/ending".format(p), ending)
+        timelines.append(timeline)
+
+    part_states = []
+    for part in parts:
+        state = dict(
+            (name, value)
+            for name, value in part.__dict__.items()
+            if name not in PART_TIMELINE_ATTRS
+        )
+        if isinstance(score_data, Part):
+            state["parent"] = None
+        part_states.append(state)
+
+    score_state = None
+    if isinstance(score_data, Score):
+        score_state = (
+            type(score_data),
+            dict(
+                (name, value)
+                for name, value in score_data.__dict__.items()
+                if name not in ("_note_array_cache", "iter_idx")
+            ),
+        )
+
+    meta = writer.dumps(dict(score=score_state, parts=part_states))
+    writer.arrays["meta"] = np.frombuffer(meta, dtype=np.uint8)
+
+    header = dict(
+        classes=[_class_path(cls) for cls in classes],
+        columns=class_columns,
+        part_classes=[_class_path(type(part)) for part in parts],
+        timelines=timelines,
+        detached=detached,
+        arrays={},
+    )
+
+    # compute the offsets of the arrays. The length of the header
+    # depends on the offsets, so they are computed relative to the
+    # start of the data, which is aligned after the header
+    offset = 0
+    for name, array in writer.arrays.items():
+        array = np.ascontiguousarray(array)
+        writer.arrays[name] = array
+        header["arrays"][name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header_bytes = json.dumps(header).encode("utf8")
+    data_start = PREAMBLE.size + len(header_bytes)
+    data_start = -(-data_start // ALIGNMENT) * ALIGNMENT
+
+    with open(filename, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - f.tell()))
+        for name, array in writer.arrays.items():
+            f.write(array.tobytes())
+            f.write(b"\0" * (-array.nbytes % ALIGNMENT))
+
+
+def _read_arrays(filename: PathLike) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    # read the header and memory map the arrays of a file
+    with open(filename, "rb") as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) < PREAMBLE.size:
+            raise PartituraFileError("{0} is not a partitura file".format(filename))
+        magic, version, header_len = PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise PartituraFileError("{0} is not a partitura file".format(filename))
+        if version > FORMAT_VERSION:
+            raise PartituraFileError(
+                "{0} has format version {1}, but only versions up to {2} "
+                "are supported. Please update partitura".format(
+                    filename, version, FORMAT_VERSION
+                )
+            )
+        header_bytes = f.read(header_len)
+        try:
+            if len(header_bytes) < header_len:
+                raise ValueError("truncated header")
+            header = json.loads(header_bytes.decode("utf8"))
+        except ValueError:
+            raise PartituraFileError(
+                "{0} has a corrupted header".format(filename)
+            ) from None
+
+    data_start = -(-(PREAMBLE.size + header_len) // ALIGNMENT) * ALIGNMENT
+    data = np.memmap(filename, dtype=np.uint8, mode="r")
+    arrays = {}
+    try:
+        missing = [key for key in HEADER_KEYS if key not in header]
+        if missing:
+            raise ValueError("missing {0}".format(", ".join(missing)))
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            if dtype.hasobject:
+                raise ValueError("object arrays are not allowed")
+            start = data_start + offset
+            nbytes = dtype.itemsize * int(np.prod(shape))
+            if offset < 0 or start + nbytes > len(data):
+                raise ValueError("array {0} is out of bounds".format(name))
+            arrays[name] = data[start : start + nbytes].view(dtype).reshape(shape)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise PartituraFileError(
+            "{0} has a corrupted header ({1})".format(filename, e)
+        ) from None
+    return header, arrays
+
+
+@_without_gc
+def load_partitura(filename: PathLike) -> Union[Score, Part]:
+    """
+    Load a score or a part saved with :func:`save_partitura`.
+
+    The arrays stored in the file are memory mapped, so that only the
+    data needed to build the objects is read from disk.
+
+    .. warning::
+        Part of the data is stored with :mod:`pickle`. Only load files
+        you trust. Loading is restricted to the classes in
+        `partitura.score` and `partitura.performance` and a few basic
+        types (see `PICKLE_GLOBALS`), and other classes raise a
+        `PartituraFileError`, but unpickling a crafted file may still
+        exhaust memory or time.
+
+    Parameters
+    ----------
+    filename : PathLike
+        The path of the file.
+
+    Returns
+    -------
+    score_data : :class:`partitura.score.Score` or :class:`partitura.score.Part`
+        The score or part stored in the file.
+    """
+    header, arrays = _read_arrays(filename)
+
+    classes = [_import_class(path, TimedObject) for path in header["classes"]]
+    obj_class = arrays["objects/class"].tolist()
+    objects = [cls.__new__(cls) for cls in (classes[c] for c in obj_class)]
+    parts = [
+        cls.__new__(cls)
+        for cls in (_import_class(p, Part) for p in header["part_classes"])
+    ]
+    reader = _Reader(arrays, objects, parts)
+
+    obj_class = np.asarray(obj_class, dtype=np.int64)
+    for code, columns in enumerate(header["columns"]):
+        rows = [objects[i] for i in np.flatnonzero(obj_class == code)]
+        states = [dict(start=None, end=None) for _ in rows]
+        for j, (name, kind) in enumerate(columns):
+            array_name = "class{0}/{1}".format(code, j)
+            if array_name + "/present" in arrays:
+                present = np.flatnonzero(arrays[array_name + "/present"])
+                values = reader.get_column(array_name, kind, len(present))
+                for i, value in zip(present.tolist(), values):
+                    states[i][name] = value
+            else:
+                values = reader.get_column(array_name, kind, len(rows))
+                for state, value in zip(states, values):
+                    state[name] = value
+        for obj, state in zip(rows, states):
+            obj.__dict__.update(state)
+
+    all_points = []
+    for p, (part, timeline) in enumerate(zip(parts, header["timelines"])):
+        n_points = timeline["n_points"]
+        times = reader.get_column("part{0}/t".format(p), timeline["t"], n_points)
+        quarters = reader.get_column(
+            "part{0}/quarter".format(p), timeline["quarter"], n_points
+        )
+        starting = reader.get_column("part{0}/starting".format(p), "reflist", n_points)
+        ending = reader.get_column("part{0}/ending".format(p), "reflist", n_points)
+
+        starting_index = defaultdict(dict)
+        ending_index = defaultdict(dict)
+        points = []
+        for t, quarter, starting_objs, ending_objs in zip(
+            times, quarters, starting, ending
+        ):
+            tp = TimePoint(t, quarter)
+            tp._part = part
+            key = t.item() if isinstance(t, np.ndarray) else t
+            for obj in starting_objs:
+                tp.starting_objects[type(obj)][obj] = None
+                starting_index[type(obj)][key] = tp
+            for obj in ending_objs:
+                tp.ending_objects[type(obj)][obj] = None
+                ending_index[type(obj)][key] = tp
+            points.append(tp)
+        all_points.extend(points)
+
+        for prev_tp, tp in zip(points[:-1], points[1:]):
+            prev_tp.next = tp
+            tp.prev = prev_tp
+
+        part.__dict__.update(
+            _points=points,
+            _point_times=[tp.t for tp in points],
+            _pending_points={},
+            _bulk_depth=0,
+            _starting_index=dict(starting_index),
+            _ending_index=dict(ending_index),
+            _class_closures={},
+            _index_cache={},
+            _version=0,
+            _version_cache={},
+        )
+
+    detached = header["detached"]
+    for t, quarter in zip(
+        reader.get_column("detached/t", detached["t"], detached["n_points"]),
+        reader.get_column(
+            "detached/quarter", detached["quarter"], detached["n_points"]
+        ),
+    ):
+        all_points.append(TimePoint(t, quarter))
+
+    for name in ("start", "end"):
+        for obj, i in zip(objects, arrays["objects/{0}".format(name)].tolist()):
+            if i >= 0:
+                obj.__dict__[name] = all_points[i]
+
+    meta = reader.loads(arrays["meta"].tobytes())
+    for part, state in zip(parts, meta["parts"]):
+        part.__dict__.update(state)
+        part._quarter_map = part.quarter_duration_map
+
+    if meta["score"] is None:
+        return parts[0]
+
+    score_cls, score_state = meta["score"]
+    if not (isinstance(score_cls, type) and issubclass(score_cls, Score)):
+        raise PartituraFileError("{0} does not contain a score".format(filename))
+    score = score_cls.__new__(score_cls)
+    score.__dict__.update(score_state)
+    score._note_array_cache = None
+    return score
@@ -20,7 +20,12 @@ from .note_features import (
     make_rest_feats,
     make_rest_features,
 )
-from .performance_codec import encode_performance, decode_performance
+from .performance_codec import (
+    encode_performance,
+    decode_performance,
+    encode_performances,
+    decode_performances,
+)
 from .performance_features import make_performance_features
 from .note_array_to_score import note_array_to_score
 
@@ -36,6 +41,8 @@ __all__ = [
     "make_rest_features",
     "encode_performance",
     "decode_performance",
+    "encode_performances",
+    "decode_performances",
     "compute_note_array",
     "full_note_array",
     "make_performance_features",
@@ -4,6 +4,7 @@ from partitura.utils import (
     estimate_clef_properties,
     key_name_to_fifths_mode,
     fifths_mode_to_key_name,
+    set_string_field,
 )
 import warnings
 import numpy as np
@@ -164,6 +165,7 @@ def create_part(
 
     warnings.warn("add notes", stacklevel=2)
     # add the notes
+    notes = []
     for n in note_array:
         if n["duration_div"] > 0:
             note = score.Note(
@@ -185,7 +187,13 @@ def create_part(
                 symbolic_duration=dict(type="quarter"),
             )
 
-        part.add(note, n["onset_div"], n["onset_div"] + n["duration_div"])
+        notes.append(note)
+
+    part.add_many(
+        notes,
+        note_array["onset_div"],
+        note_array["onset_div"] + note_array["duration_div"],
+    )
 
     warnings.warn("add measures", stacklevel=2)
 
@@ -470,7 +478,7 @@ def note_array_to_score(
         )
     elif assign_note_ids or np.all(note_array["id"] == note_array["id"][0]):
         note_ids = ["{}n{:4d}".format(name_id, i) for i in range(len(note_array))]
-        note_array["id"] = np.array(note_ids)
+        note_array = set_string_field(note_array, "id", note_ids)
 
     # estimate voice
     if "voice" in dtypes:
@@ -3,14 +3,16 @@
 """
 This module contains methods to compute note-level features.
 """
+import os
 import sys
 import warnings
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from scipy.interpolate import interp1d
 import partitura.score as score
 
 import types
-from typing import List, Union, Tuple
+from typing import Callable, List, Optional, Union, Tuple
 from partitura.utils import ensure_notearray, ensure_rest_array
 from partitura.score import ScoreLike
 
@@ -25,6 +27,8 @@ __all__ = [
     "make_rest_features",
     "compute_note_array",
     "full_note_array",
+    "FeatureInputs",
+    "requires",
 ]
 
 
@@ -32,6 +36,149 @@ class InvalidNoteFeatureException(Exception):
     pass
 
 
+class FeatureInputs(object):
+    """Inputs shared by the feature functions of a part.
+
+    Each input is computed the first time it is accessed and then
+    reused, so that `make_note_features` only has to iterate over the
+    notes, directions and measures of a part once, no matter how many
+    feature functions use them. Feature functions declare the inputs
+    they use with the `requires` decorator and receive this object as
+    the keyword argument `inputs`.
+
+    Parameters
+    ----------
+    na : structured array
+        The note (or rest) array of the part.
+    part : Part
+        The part.
+
+    Attributes
+    ----------
+    notes : list
+        The notes of the part (`part.notes_tied`), or its rests if `na`
+        is a rest array.
+    time_signature_map : callable
+        `part.time_signature_map`
+    beat_map : callable
+        `part.beat_map`
+    measure_starts : ndarray
+        The start time of the measure in which each element of `notes`
+        starts (0 for notes before the first measure).
+    onset_groups : ndarray
+        For each row of `na`, the index of its onset (`onset_beat`) in
+        the sorted unique onsets of `na`.
+    """
+
+    def __init__(self, na, part):
+        self.na = na
+        self.part = part
+        self._cache = {}
+
+    def _get(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def objects(self, cls, include_subclasses=True):
+        """The objects of class `cls` in the part, in temporal order.
+
+        Parameters
+        ----------
+        cls : class
+            The class of the objects (e.g. `score.LoudnessDirection`).
+        include_subclasses : bool, optional
+            If True include subclasses of `cls`. Defaults to True.
+
+        Returns
+        -------
+        list
+            The objects
+        """
+        return self._get(
+            (cls, include_subclasses),
+            lambda: list(
+                self.part.iter_all(cls, include_subclasses=include_subclasses)
+            ),
+        )
+
+    @property
+    def notes(self):
+        return self._get(
+            "notes",
+            lambda: (
+                self.part.notes_tied
+                if not np.all(self.na["pitch"] == 0)
+                else self.part.rests
+            ),
+        )
+
+    @property
+    def time_signature_map(self):
+        return self._get("time_signature_map", lambda: self.part.time_signature_map)
+
+    @property
+    def beat_map(self):
+        return self._get("beat_map", lambda: self.part.beat_map)
+
+    @property
+    def measure_starts(self):
+        def compute():
+            starts = np.array(
+                [m.start.t for m in self.objects(score.Measure, False)], dtype=int
+            )
+            onsets = np.array([n.start.t for n in self.notes], dtype=int)
+            idx = np.searchsorted(starts, onsets, side="right") - 1
+            measure_starts = np.zeros(len(onsets), dtype=int)
+            measure_starts[idx >= 0] = starts[idx[idx >= 0]]
+            return measure_starts
+
+        return self._get("measure_starts", compute)
+
+    @property
+    def onset_groups(self):
+        return self._get(
+            "onset_groups",
+            lambda: np.unique(self.na["onset_beat"], return_inverse=True)[1],
+        )
+
+    def prepare(self, requirements):
+        """Compute the inputs in `requirements` (names of attributes or
+        classes of objects, see `requires`)."""
+        for req in requirements:
+            if isinstance(req, str):
+                getattr(self, req)
+            else:
+                self.objects(req)
+
+
+def requires(*inputs) -> Callable:
+    """Declare the shared inputs used by a feature function.
+
+    The inputs are names of attributes of `FeatureInputs` (e.g.
+    "notes" or "measure_starts") or classes of objects in the part
+    (e.g. `score.TempoDirection`, see `FeatureInputs.objects`).
+    `make_note_features` computes the declared inputs once per part
+    and passes them to the function as the keyword argument `inputs`.
+    Feature functions without declared inputs are called without it.
+
+    Examples
+    --------
+    >>> @requires("notes")
+    ... def staff_parity_feature(na, part, inputs=None, **kwargs):
+    ...     if inputs is None:
+    ...         inputs = FeatureInputs(na, part)
+    ...     W = np.array([[n.staff % 2] for n in inputs.notes], dtype=float)
+    ...     return W, ["staff_parity"]
+    """
+
+    def decorator(func):
+        func.requires = inputs
+        return func
+
+    return decorator
+
+
 def print_note_feats_functions():
     """Print a list of all featurefunction names defined in this module,
     with descriptions where available.
@@ -74,12 +221,89 @@ def list_note_feats_functions():
     return bfs
 
 
+def _compute_features(na, part, feature_functions, n_jobs=1, **kwargs):
+    """Compute feature functions for a note (or rest) array and check
+    their output.
+
+    Returns a list of (feature, names) tuples for the non-empty
+    features, with the names prefixed by the name of the function.
+    Each feature must have one row per row of `na` (i.e., per note in
+    `part.notes_tied`, or per rest in `part.rests`).
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs < 1:
+        raise ValueError("`n_jobs` should be a positive integer")
+
+    funcs = []
+    for bf in feature_functions:
+        if isinstance(bf, str):
+            # get function by name from module
+            funcs.append(getattr(sys.modules[__name__], bf))
+        elif isinstance(bf, types.FunctionType):
+            funcs.append(bf)
+        else:
+            warnings.warn("Ignoring unknown feature function {}".format(bf))
+
+    # compute the inputs shared by the feature functions once, before
+    # the (possibly concurrent) feature functions use them
+    inputs = FeatureInputs(na, part)
+    for func in funcs:
+        inputs.prepare(getattr(func, "requires", ()))
+
+    def compute(func):
+        if hasattr(func, "requires"):
+            return func(na, part, inputs=inputs, **kwargs)
+        return func(na, part, **kwargs)
+
+    if n_jobs == 1 or len(funcs) < 2:
+        results = map(compute, funcs)
+    else:
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(funcs))) as executor:
+            results = list(executor.map(compute, funcs))
+
+    acc = []
+    for func, (bf, bn) in zip(funcs, results):
+        # check if the size and number of the feature function are correct
+        if bf.size != 0:
+            if bf.shape[1] != len(bn):
+                msg = (
+                    "number of feature names {} does not equal "
+                    "number of feature {}".format(len(bn), bf.shape[1])
+                )
+                raise InvalidNoteFeatureException(msg)
+            if len(bf) != len(na):
+                msg = (
+                    "length of feature {} does not equal "
+                    "number of notes {}".format(len(bf), len(na))
+                )
+                raise InvalidNoteFeatureException(msg)
+
+            if np.any(np.logical_or(np.isnan(bf), np.isinf(bf))):
+                problematic = np.unique(
+                    np.where(np.logical_or(np.isnan(bf), np.isinf(bf)))[1]
+                )
+                msg = "NaNs or Infs found in the following feature: {} ".format(
+                    ", ".join(np.array(bn)[problematic])
+                )
+                raise InvalidNoteFeatureException(msg)
+
+            # prefix feature names by function name
+            bn = ["{}.{}".format(func.__name__, n) for n in bn]
+
+            acc.append((bf, bn))
+
+    return acc
+
+
 def make_note_features(
     part: ScoreLike,
     feature_functions: Union[List, str],
     add_idx: bool = False,
     include_empty_features: bool = True,
     force_fixed_size: bool = False,
+    n_jobs: Optional[int] = 1,
 ) -> Tuple[np.ndarray, List]:
     """Compute the specified feature functions for a part.
 
@@ -113,6 +337,10 @@ def make_note_features(
         Otherwise, they are omitted.
     force_fixed_size : bool (default: False)
         If True, the output array uses only features that have a fixed size with no new entries added.
+    n_jobs : int or None (default: 1)
+        Number of threads in which the feature functions are computed.
+        If None, the number of CPUs is used. The inputs shared by the
+        feature functions (see `FeatureInputs`) are computed only once.
 
     Returns
     -------
@@ -131,7 +359,6 @@ def make_note_features(
         include_grace_notes=True,
         include_time_signature=True,
     )
-    acc = []
     if isinstance(feature_functions, str) and feature_functions == "all":
         feature_functions = list_note_feats_functions()
     elif not isinstance(feature_functions, list):
@@ -141,59 +368,27 @@ def make_note_features(
             )
         )
 
-    for bf in feature_functions:
-        # skip time_signature_feature if force_fixed_size is True
-        if force_fixed_size and (
-            bf == "time_signature_feature" or bf == time_signature_feature
-        ):
-            continue
-        # skip metrical_feature if force_fixed_size is True
-        if force_fixed_size and (bf == "metrical_feature" or bf == metrical_feature):
-            continue
-
-        if isinstance(bf, str):
-            # get function by name from module
-            func = getattr(sys.modules[__name__], bf)
-        elif isinstance(bf, types.FunctionType):
-            func = bf
-        else:
-            warnings.warn("Ignoring unknown feature function {}".format(bf))
-        bf, bn = func(
-            na,
-            part,
-            include_empty_features=(
-                True if force_fixed_size else include_empty_features
-            ),
-        )
-        # check if the size and number of the feature function are correct
-        if bf.size != 0:
-            if bf.shape[1] != len(bn):
-                msg = (
-                    "number of feature names {} does not equal "
-                    "number of feature {}".format(len(bn), bf.shape[1])
-                )
-                raise InvalidNoteFeatureException(msg)
-            n_notes = len(part.notes_tied)
-            if len(bf) != n_notes:
-                msg = (
-                    "length of feature {} does not equal "
-                    "number of notes {}".format(len(bf), n_notes)
-                )
-                raise InvalidNoteFeatureException(msg)
-
-            if np.any(np.logical_or(np.isnan(bf), np.isinf(bf))):
-                problematic = np.unique(
-                    np.where(np.logical_or(np.isnan(bf), np.isinf(bf)))[1]
-                )
-                msg = "NaNs or Infs found in the following feature: {} ".format(
-                    ", ".join(np.array(bn)[problematic])
-                )
-                raise InvalidNoteFeatureException(msg)
-
-            # prefix feature names by function name
-            bn = ["{}.{}".format(func.__name__, n) for n in bn]
+    if force_fixed_size:
+        # skip time_signature_feature and metrical_feature
+        feature_functions = [
+            bf
+            for bf in feature_functions
+            if bf
+            not in (
+                "time_signature_feature",
+                time_signature_feature,
+                "metrical_feature",
+                metrical_feature,
+            )
+        ]
 
-            acc.append((bf, bn))
+    acc = _compute_features(
+        na,
+        part,
+        feature_functions,
+        n_jobs=n_jobs,
+        include_empty_features=True if force_fixed_size else include_empty_features,
+    )
 
     if add_idx:
         _data, _names = zip(*acc)
@@ -218,6 +413,7 @@ def make_rest_features(
     part: Union[score.Part, score.PartGroup, List],
     feature_functions: Union[List, str],
     add_idx: bool = False,
+    n_jobs: Optional[int] = 1,
 ) -> Tuple[np.ndarray, List]:
     """Compute the specified feature functions for a part.
 
@@ -235,6 +431,12 @@ def make_rest_features(
         the functions themselves or the names of a feature function as
         strings (or a mix), or the keywork "all". The feature functions specified by name are
         looked up in the `featuremixer.featurefunctions` module.
+    add_idx : bool (default: False)
+        If True, the index of the rest in the part is added as a
+        feature.
+    n_jobs : int or None (default: 1)
+        Number of threads in which the feature functions are computed.
+        If None, the number of CPUs is used.
 
     Returns
     -------
@@ -256,7 +458,6 @@ def make_rest_features(
     if na.size == 0:
         return np.array([])
 
-    acc = []
     if isinstance(feature_functions, str) and feature_functions == "all":
         feature_functions = list_note_feats_functions()
     elif not isinstance(feature_functions, list):
@@ -266,44 +467,7 @@ def make_rest_features(
             )
         )
 
-    for bf in feature_functions:
-        if isinstance(bf, str):
-            # get function by name from module
-            func = getattr(sys.modules[__name__], bf)
-        elif isinstance(bf, types.FunctionType):
-            func = bf
-        else:
-            warnings.warn("Ignoring unknown feature function {}".format(bf))
-        bf, bn = func(na, part)
-        # check if the size and number of the feature function are correct
-        if bf.size != 0:
-            if bf.shape[1] != len(bn):
-                msg = (
-                    "number of feature names {} does not equal "
-                    "number of feature {}".format(len(bn), bf.shape[1])
-                )
-                raise InvalidNoteFeatureException(msg)
-            n_notes = len(part.rests)
-            if len(bf) != n_notes:
-                msg = (
-                    "length of feature {} does not equal "
-                    "number of notes {}".format(len(bf), n_notes)
-                )
-                raise InvalidNoteFeatureException(msg)
-
-            if np.any(np.logical_or(np.isnan(bf), np.isinf(bf))):
-                problematic = np.unique(
-                    np.where(np.logical_or(np.isnan(bf), np.isinf(bf)))[1]
-                )
-                msg = "NaNs or Infs found in the following feature: {} ".format(
-                    ", ".join(np.array(bn)[problematic])
-                )
-                raise InvalidNoteFeatureException(msg)
-
-            # prefix feature names by function name
-            bn = ["{}.{}".format(func.__name__, n) for n in bn]
-
-            acc.append((bf, bn))
+    acc = _compute_features(na, part, feature_functions, n_jobs=n_jobs)
 
     if add_idx:
         _data, _names = zip(*acc)
@@ -491,7 +655,8 @@ def relative_score_position_feature(na, part, **kwargs):
     return W[:, 1:], names[1:]
 
 
-def grace_feature(na, part, **kwargs):
+@requires("notes")
+def grace_feature(na, part, inputs=None, **kwargs):
     """Grace feature.
 
     Returns:
@@ -508,11 +673,9 @@ def grace_feature(na, part, **kwargs):
     W = np.zeros((len(na), 3))
     W[:, 0] = na["is_grace"]
     grace_notes = na[np.nonzero(na["is_grace"])]
-    notes = (
-        {n.id: n for n in part.notes_tied}
-        if not np.all(na["pitch"] == 0)
-        else {n.id: n for n in part.rests}
-    )
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    notes = {n.id: n for n in inputs.notes}
     indices = np.nonzero(na["is_grace"])[0]
     for i, index in enumerate(indices):
         grace = grace_notes[i]
@@ -526,7 +689,8 @@ def grace_feature(na, part, **kwargs):
     return W, feature_names
 
 
-def loudness_direction_feature(na, part, **kwargs):
+@requires(score.LoudnessDirection)
+def loudness_direction_feature(na, part, inputs=None, **kwargs):
     """The loudness directions in part.
 
     This function returns a varying number of descriptors, depending
@@ -550,7 +714,9 @@ def loudness_direction_feature(na, part, **kwargs):
     impulsive = ["fp", "sf", "sfp", "sfz", "unknown_impulsive"]
     names = constant + impulsive + ["loudness_incr", "loudness_decr"]
 
-    directions = list(part.iter_all(score.LoudnessDirection, include_subclasses=True))
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    directions = inputs.objects(score.LoudnessDirection)
     if "include_empty_features" in kwargs.keys():
         force_size = kwargs["include_empty_features"]
     else:
@@ -606,7 +772,8 @@ def loudness_direction_feature(na, part, **kwargs):
     return W, names
 
 
-def tempo_direction_feature(na, part, **kwargs):
+@requires(score.TempoDirection)
+def tempo_direction_feature(na, part, inputs=None, **kwargs):
     """The tempo directions in part.
 
     This function returns a varying number of descriptors, depending
@@ -638,7 +805,9 @@ def tempo_direction_feature(na, part, **kwargs):
         "unknown_constant",
     ]
     names = constant + ["tempo_incr", "tempo_decr"]
-    directions = list(part.iter_all(score.TempoDirection, include_subclasses=True))
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    directions = inputs.objects(score.TempoDirection)
 
     if "include_empty_features" in kwargs.keys():
         force_size = kwargs["include_empty_features"]
@@ -706,14 +875,15 @@ def tempo_direction_feature(na, part, **kwargs):
     return W, names
 
 
-def articulation_direction_feature(na, part, **kwargs):
+@requires(score.ArticulationDirection)
+def articulation_direction_feature(na, part, inputs=None, **kwargs):
     """ """
     onsets = na["onset_div"]
     N = len(onsets)
 
-    directions = list(
-        part.iter_all(score.ArticulationDirection, include_subclasses=True)
-    )
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    directions = inputs.objects(score.ArticulationDirection)
     constant_names = ["staccato", "tenuto", "accent", "marcato", "unknown_articulation"]
 
     if "include_empty_features" in kwargs.keys():
@@ -808,7 +978,8 @@ def feature_function_activation(direction):
     return interp1d(x, y, bounds_error=False, fill_value=0)
 
 
-def slur_feature(na, part, **kwargs):
+@requires(score.Slur)
+def slur_feature(na, part, inputs=None, **kwargs):
     """Slur feature.
 
     Returns:
@@ -820,7 +991,9 @@ def slur_feature(na, part, **kwargs):
     """
     names = ["slur_incr", "slur_decr"]
     onsets = na["onset_div"]
-    slurs = part.iter_all(score.Slur)
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    slurs = inputs.objects(score.Slur)
     W = np.zeros((len(onsets), 2))
 
     for slur in slurs:
@@ -836,7 +1009,8 @@ def slur_feature(na, part, **kwargs):
     return W, names
 
 
-def articulation_feature(na, part, **kwargs):
+@requires("notes")
+def articulation_feature(na, part, inputs=None, **kwargs):
     """Articulation feature.
 
     This feature returns articulation-related note annotations, such as accents, legato, and tenuto.
@@ -872,7 +1046,9 @@ def articulation_feature(na, part, **kwargs):
         force_size = False
 
     feature_by_name = {}
-    notes = part.notes_tied if not np.all(na["pitch"] == 0) else part.rests
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    notes = inputs.notes
     N = len(notes)
     for i, n in enumerate(notes):
         if n.articulations:
@@ -900,7 +1076,8 @@ def articulation_feature(na, part, **kwargs):
     return W, names
 
 
-def ornament_feature(na, part, **kwargs):
+@requires("notes")
+def ornament_feature(na, part, inputs=None, **kwargs):
     """Ornament feature.
 
     This feature returns ornamentation note annotations,such as trills.
@@ -929,7 +1106,9 @@ def ornament_feature(na, part, **kwargs):
         "other-ornament",
     ]
     feature_by_name = {}
-    notes = part.notes_tied
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    notes = inputs.notes
     N = len(notes)
     for i, n in enumerate(notes):
         if n.ornaments:
@@ -960,10 +1139,13 @@ def ornament_feature(na, part, **kwargs):
     return W, names
 
 
-def staff_feature(na, part, **kwargs):
+@requires("notes")
+def staff_feature(na, part, inputs=None, **kwargs):
     """Staff feature"""
     names = ["staff"]
-    notes = {n.id: n.staff for n in part.notes_tied}
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    notes = {n.id: n.staff for n in inputs.notes}
     N = len(na)
     W = np.zeros((N, 1))
     for i, n in enumerate(na):
@@ -981,7 +1163,8 @@ def staff_feature(na, part, **kwargs):
 #         return np.empty(len(W)), []
 
 
-def fermata_feature(na, part, **kwargs):
+@requires(score.Fermata)
+def fermata_feature(na, part, inputs=None, **kwargs):
     """Fermata feature.
 
     Returns:
@@ -991,12 +1174,15 @@ def fermata_feature(na, part, **kwargs):
     names = ["fermata"]
     onsets = na["onset_div"]
     W = np.zeros((len(onsets), 1))
-    for ferm in part.iter_all(score.Fermata):
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    for ferm in inputs.objects(score.Fermata):
         W[onsets == ferm.start.t, 0] = 1
     return W, names
 
 
-def metrical_feature(na, part, **kwargs):
+@requires("notes", "time_signature_map", "beat_map", "measure_starts")
+def metrical_feature(na, part, inputs=None, **kwargs):
     """Metrical feature
 
     This feature encodes the metrical position in the bar. For example
@@ -1008,23 +1194,20 @@ def metrical_feature(na, part, **kwargs):
     non-zero value in the 'metrical_4_4_weak' descriptor.
 
     """
-    notes = part.notes_tied if not np.all(na["pitch"] == 0) else part.rests
-    ts_map = part.time_signature_map
-    bm = part.beat_map
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    notes = inputs.notes
+    bm = inputs.beat_map
     feature_by_name = {}
     eps = 10**-6
 
-    for i, n in enumerate(notes):
-        beats, beat_type, mus_beats = ts_map(n.start.t).astype(int)
-        measure = next(n.start.iter_prev(score.Measure, eq=True), None)
-
-        if measure:
-            measure_start = measure.start.t
-        else:
-            measure_start = 0
-
-        pos = bm(n.start.t) - bm(measure_start)
+    onsets = np.array([n.start.t for n in notes], dtype=int)
+    time_signatures = inputs.time_signature_map(onsets).astype(int).reshape(-1, 3)
+    positions = bm(onsets) - bm(inputs.measure_starts)
 
+    for i, ((beats, beat_type, mus_beats), pos) in enumerate(
+        zip(time_signatures.tolist(), positions.tolist())
+    ):
         if pos % 1 < eps:
             name = "metrical_{}_{}_{}".format(beats, beat_type, int(pos))
         else:
@@ -1068,13 +1251,16 @@ def metrical_strength_feature(na, part, **kwargs):
     return W, names
 
 
-def time_signature_feature(na, part, **kwargs):
+@requires("time_signature_map")
+def time_signature_feature(na, part, inputs=None, **kwargs):
     """TIme Signature feature
     This feature encodes the time signature of the note in two sets of one-hot vectors,
     a one hot encoding of number of beats and a one hot encoding of beat type
     """
 
-    ts_map = part.time_signature_map
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    ts_map = inputs.time_signature_map
     possible_beats = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, "other"]
     possible_beat_types = [1, 2, 4, 8, 16, "other"]
     W_beats = np.zeros((len(na), len(possible_beats)))
@@ -1084,25 +1270,27 @@ def time_signature_feature(na, part, **kwargs):
         "time_signature_den_{0}".format(b) for b in possible_beat_types
     ]
 
-    for i, n in enumerate(na):
-        beats, beat_type, mus_beats = ts_map(n["onset_div"]).astype(int)
+    time_signatures = ts_map(na["onset_div"]).astype(int).reshape(-1, 3)
+    beats = time_signatures[:, 0]
+    beat_types = time_signatures[:, 1]
+    rows = np.arange(len(na))
 
-        if beats in possible_beats:
-            W_beats[i, beats - 1] = 1
-        else:
-            W_beats[i, -1] = 1
+    # beats 1 to 12 are in columns 0 to 11, other beats in the last column
+    known_beats = (beats >= 1) & (beats <= 12)
+    W_beats[rows, np.where(known_beats, beats - 1, -1)] = 1
 
-        if beat_type in possible_beat_types:
-            W_types[i, possible_beat_types.index(beat_type)] = 1
-        else:
-            W_types[i, -1] = 1
+    type_columns = np.full(len(na), -1)
+    for j, beat_type in enumerate(possible_beat_types[:-1]):
+        type_columns[beat_types == beat_type] = j
+    W_types[rows, type_columns] = 1
 
     W = np.column_stack((W_beats, W_types))
 
     return W, names
 
 
-def vertical_neighbor_feature(na, part, **kwargs):
+@requires("onset_groups")
+def vertical_neighbor_feature(na, part, inputs=None, **kwargs):
     """Vertical neighbor feature.
 
     Describes various aspects of simultaneously starting notes.
@@ -1126,16 +1314,33 @@ def vertical_neighbor_feature(na, part, **kwargs):
         "pitch_range",
     ]
     W = np.zeros((len(na), len(names)))
-    for i, n in enumerate(na):
-        neighbors = na[np.where(na["onset_beat"] == n["onset_beat"])]["pitch"]
-        max_pitch = np.max(neighbors)
-        min_pitch = np.min(neighbors)
-        W[i, 0] = len(neighbors) - 1
-        W[i, 1] = np.sum(neighbors > n["pitch"])
-        W[i, 2] = np.sum(neighbors < n["pitch"])
-        W[i, 3] = max_pitch
-        W[i, 4] = min_pitch
-        W[i, 5] = max_pitch - min_pitch
+    if len(na) == 0:
+        return W, names
+
+    if inputs is None:
+        inputs = FeatureInputs(na, part)
+    groups = inputs.onset_groups
+    pitch = na["pitch"].astype(int)
+
+    # sort the notes by onset and pitch, so that the notes of each onset
+    # are contiguous and the neighbors below (above) a note precede
+    # (follow) it
+    keys = groups * (pitch.max() - pitch.min() + 1) + (pitch - pitch.min())
+    sorted_keys = np.sort(keys)
+    group_sizes = np.bincount(groups)
+    group_ends = np.cumsum(group_sizes)
+    group_starts = group_ends - group_sizes
+    max_pitch = np.full(len(group_sizes), pitch.min())
+    min_pitch = np.full(len(group_sizes), pitch.max())
+    np.maximum.at(max_pitch, groups, pitch)
+    np.minimum.at(min_pitch, groups, pitch)
+
+    W[:, 0] = group_sizes[groups] - 1
+    W[:, 1] = group_ends[groups] - np.searchsorted(sorted_keys, keys, side="right")
+    W[:, 2] = np.searchsorted(sorted_keys, keys, side="left") - group_starts[groups]
+    W[:, 3] = max_pitch[groups]
+    W[:, 4] = min_pitch[groups]
+    W[:, 5] = W[:, 3] - W[:, 4]
     return W, names
 
 
@@ -4,21 +4,30 @@
 This module implements a codec to encode and decode expressive performances to a set of
 expressive parameters.
 """
-from typing import Union, Callable
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Union, Callable, Iterable, Optional, Tuple
 import numpy as np
-import numpy.lib.recfunctions as rfn
 import warnings
 
 
 from partitura.score import Part, ScoreLike
 from partitura.performance import PerformedPart, PerformanceLike
 from partitura.musicanalysis import note_features
-from partitura.utils.misc import deprecated_alias
+from partitura.utils.misc import PathLike, deprecated_alias
 from partitura.utils.generic import interp1d, monotonize_times
 from partitura.utils.music import ensure_notearray
+from partitura.utils.alignment import Alignment, ensure_alignment
 from scipy.misc import derivative
 
-__all__ = ["encode_performance", "decode_performance", "to_matched_score"]
+__all__ = [
+    "encode_performance",
+    "decode_performance",
+    "encode_performances",
+    "decode_performances",
+    "to_matched_score",
+]
 
 
 #### Full Codecs ####
@@ -28,7 +37,7 @@ __all__ = ["encode_performance", "decode_performance", "to_matched_score"]
 def encode_performance(
     score: ScoreLike,
     performance: PerformanceLike,
-    alignment: list,
+    alignment: Union[list, Alignment],
     return_u_onset_idx=False,
     beat_normalization: str = "beat_period",  # "beat_period_log", "beat_period_ratio", "beat_period_ratio_log", "beat_period_standardized"
     tempo_smooth: Union[str, Callable] = "average",
@@ -43,8 +52,9 @@ def encode_performance(
         Score information, can be a part, score
     performance : partitura.performance.PerformanceLike
         Performance information, can be a ppart, performance
-    alignment : list
-        The score--performance alignment, a list of dictionaries
+    alignment : list or Alignment
+        The score--performance alignment, a list of dictionaries or an
+        `Alignment`
     return_u_onset_idx : bool
         Return the indices of the unique score onsets
     beat_normalization : str (Optional)
@@ -68,7 +78,21 @@ def encode_performance(
     """
 
     m_score, snote_ids = to_matched_score(score, performance, alignment)
+    parameters, unique_onset_idxs = _encode_matched_score(
+        m_score, beat_normalization=beat_normalization, tempo_smooth=tempo_smooth
+    )
+
+    if return_u_onset_idx:
+        return parameters, snote_ids, unique_onset_idxs
+    else:
+        return parameters, snote_ids
 
+
+def _encode_matched_score(
+    m_score: np.ndarray,
+    beat_normalization: str = "beat_period",
+    tempo_smooth: Union[str, Callable] = "average",
+):
     # Get time-related parameters
     (time_params, unique_onset_idxs) = encode_tempo(
         score_onsets=m_score["onset"],
@@ -87,10 +111,7 @@ def encode_performance(
     parameters = time_params
     parameters["velocity"] = dynamics_params["velocity"]
 
-    if return_u_onset_idx:
-        return parameters, snote_ids, unique_onset_idxs
-    else:
-        return parameters, snote_ids
+    return parameters, unique_onset_idxs
 
 
 @deprecated_alias(part="score")
@@ -128,8 +149,30 @@ def decode_performance(
         A list of dicts for the alignment.
     """
 
-    snotes = score.note_array()
+    return _decode_performance(
+        score.note_array(),
+        performance_array,
+        snote_ids,
+        part_id,
+        part_name,
+        return_alignment,
+        beat_normalization,
+        *args,
+        **kwargs
+    )
+
 
+def _decode_performance(
+    snotes,
+    performance_array,
+    snote_ids=None,
+    part_id=None,
+    part_name=None,
+    return_alignment=False,
+    beat_normalization="beat_period",
+    *args,
+    **kwargs
+):
     if snote_ids is None:
         snote_ids = [n["id"] for n in snotes]
         snote_info = snotes
@@ -196,6 +239,239 @@ def decode_performance(
         return ppart
 
 
+def _group_by_score(items):
+    # group the items that share a score object, so that the note array
+    # of each score is computed (and the score is sent to a worker
+    # process) only once. Paths are kept as groups of their own
+    groups = []
+    positions = []
+    group_of_score = dict()
+    for i, item in enumerate(items):
+        if isinstance(item, (str, bytes, os.PathLike)):
+            groups.append(item)
+            positions.append([i])
+            continue
+        score, rest = item[0], tuple(item[1:])
+        if id(score) not in group_of_score:
+            group_of_score[id(score)] = len(groups)
+            groups.append((score, []))
+            positions.append([])
+        group_idx = group_of_score[id(score)]
+        groups[group_idx][1].append(rest)
+        positions[group_idx].append(i)
+    return groups, positions
+
+
+def _map_groups(func, groups, positions, n_items, n_jobs):
+    # apply `func` to each group (in a pool of processes if n_jobs > 1)
+    # and return the results in the order of the items
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs < 1:
+        raise ValueError("`n_jobs` should be a positive integer")
+
+    if n_jobs == 1 or len(groups) < 2:
+        group_results = map(func, groups)
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(n_jobs, len(groups)))
+        chunksize = max(1, len(groups) // (4 * n_jobs))
+        with executor:
+            group_results = list(executor.map(func, groups, chunksize=chunksize))
+
+    results = [None] * n_items
+    for group_positions, group_result in zip(positions, group_results):
+        for i, result in zip(group_positions, group_result):
+            results[i] = result
+    return results
+
+
+def _encode_group(group, beat_normalization="beat_period", tempo_smooth="average"):
+    if isinstance(group, (str, bytes, os.PathLike)):
+        # imported here to avoid a circular import
+        from partitura.io.importmatch import load_match
+
+        performance, alignment, score = load_match(group, create_score=True)
+        group = (score, [(performance, alignment)])
+
+    score, pairs = group
+    na = note_features.compute_note_array(score)
+    results = []
+    for performance, alignment in pairs:
+        m_score, snote_ids = _to_matched_score(na, performance.note_array(), alignment)
+        parameters, _ = _encode_matched_score(
+            m_score, beat_normalization=beat_normalization, tempo_smooth=tempo_smooth
+        )
+        results.append((parameters, snote_ids))
+    return results
+
+
+def encode_performances(
+    items: Iterable[Union[PathLike, Tuple[ScoreLike, PerformanceLike, list]]],
+    beat_normalization: str = "beat_period",
+    tempo_smooth: Union[str, Callable] = "average",
+    n_jobs: Optional[int] = 1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode expressive parameters from a collection of matched
+    performances (see `encode_performance`).
+
+    The parameters of all performances are returned in a single array,
+    together with the offsets of each performance in it. The note array
+    of a score is computed only once for all performances of that
+    score (i.e., for all items sharing the same score object).
+
+    Parameters
+    ----------
+    items : list
+        The matched performances, each given either as a tuple
+        (score, performance, alignment) or as the path of a match file.
+    beat_normalization : str (Optional)
+        The normalization of the tempo parameters (see
+        `encode_performance`).
+    tempo_smooth : str or callable (Optional)
+        How the tempo curve is computed (see `encode_performance`). A
+        callable should be defined at the top level of a module if
+        `n_jobs` is larger than 1.
+    n_jobs : int or None (Optional)
+        Number of worker processes. If None, the number of CPUs is used.
+        Defaults to 1 (i.e., the performances are encoded in the
+        current process).
+
+    Returns
+    -------
+    parameters : structured array
+        The performance arrays of all performances, concatenated.
+    snote_ids : np.ndarray
+        The ids of the score notes corresponding to each row of
+        `parameters`.
+    offsets : np.ndarray
+        The parameters of the i-th performance are
+        `parameters[offsets[i]:offsets[i + 1]]`.
+    """
+    items = list(items)
+    groups, positions = _group_by_score(items)
+    results = _map_groups(
+        partial(
+            _encode_group,
+            beat_normalization=beat_normalization,
+            tempo_smooth=tempo_smooth,
+        ),
+        groups,
+        positions,
+        len(items),
+        n_jobs,
+    )
+
+    lengths = [len(parameters) for parameters, _ in results]
+    offsets = np.r_[0, np.cumsum(lengths, dtype=int)]
+    if len(results) > 0:
+        parameters = np.concatenate([parameters for parameters, _ in results])
+        snote_ids = np.concatenate(
+            [np.array(snote_ids, dtype=str) for _, snote_ids in results]
+        )
+    else:
+        parameters = np.zeros(0, dtype=[("beat_period", "f4")])
+        snote_ids = np.zeros(0, dtype=str)
+
+    return parameters, snote_ids, offsets
+
+
+def _decode_group(group, return_alignment=False, beat_normalization="beat_period"):
+    score, pairs = group
+    snotes = score.note_array()
+    return [
+        _decode_performance(
+            snotes,
+            performance_array,
+            snote_ids=snote_ids,
+            return_alignment=return_alignment,
+            beat_normalization=beat_normalization,
+        )
+        for performance_array, snote_ids in pairs
+    ]
+
+
+def decode_performances(
+    scores: Iterable[ScoreLike],
+    parameters: Union[np.ndarray, Iterable[np.ndarray]],
+    offsets: Optional[np.ndarray] = None,
+    snote_ids: Optional[Union[np.ndarray, Iterable]] = None,
+    return_alignment: bool = False,
+    beat_normalization: str = "beat_period",
+    n_jobs: Optional[int] = 1,
+) -> list:
+    """
+    Decode a collection of performance arrays into PerformedParts (see
+    `decode_performance`).
+
+    Parameters
+    ----------
+    scores : list of partitura.score.ScoreLike
+        The score of each performance. The note array of a score is
+        computed only once for all performances sharing the same score
+        object.
+    parameters : structured array or list of structured arrays
+        The performance arrays, either as a list, or concatenated in a
+        single array (as returned by `encode_performances`), in which
+        case `offsets` must be given.
+    offsets : np.ndarray or None (Optional)
+        The offsets of the performances in `parameters` (see
+        `encode_performances`).
+    snote_ids : np.ndarray, list or None (Optional)
+        The ids of the score notes of each performance, either
+        concatenated (split according to `offsets`) or as a list. If
+        None, all notes of the scores are decoded.
+    return_alignment : bool
+        True returns alignment list of dicts for each performance.
+    beat_normalization : str (Optional)
+        The normalization of the tempo parameters (see
+        `decode_performance`).
+    n_jobs : int or None (Optional)
+        Number of worker processes. If None, the number of CPUs is used.
+        Defaults to 1 (i.e., the performances are decoded in the
+        current process).
+
+    Returns
+    -------
+    pparts : list
+        The decoded PerformedParts (or tuples (PerformedPart, alignment)
+        if `return_alignment` is True).
+    """
+    scores = list(scores)
+    if offsets is not None:
+        parameters = np.split(parameters, offsets[1:-1])
+        if snote_ids is not None:
+            snote_ids = np.split(np.asarray(snote_ids), offsets[1:-1])
+    parameters = list(parameters)
+    if snote_ids is None:
+        snote_ids = [None] * len(parameters)
+
+    if not len(scores) == len(parameters) == len(snote_ids):
+        raise ValueError(
+            "`scores`, `parameters` and `snote_ids` should have the same "
+            "number of performances"
+        )
+
+    groups, positions = _group_by_score(
+        [
+            (score, performance_array, ids)
+            for score, performance_array, ids in zip(scores, parameters, snote_ids)
+        ]
+    )
+    return _map_groups(
+        partial(
+            _decode_group,
+            return_alignment=return_alignment,
+            beat_normalization=beat_normalization,
+        ),
+        groups,
+        positions,
+        len(parameters),
+        n_jobs,
+    )
+
+
 #### Time and Articulation Codecs ####
 
 
@@ -220,38 +496,22 @@ def decode_time(
         unique_onset_idxs=None,
         return_diff=True,
     )
-    unique_onset_idxs = score_info["unique_onset_idxs"]
+    onset_groups = get_onset_groups(score_info["unique_onset_idxs"])
     diff_u_onset_score = score_info["diff_u_onset"]
 
     # reconstruct the time by the extra parameters, for testing the inversion.
     # In practice, always reconstruct the time by beat_period.
     if normalization != "beat_period":
         tempo_param_names = list(TEMPO_NORMALIZATION[normalization]["param_names"])
-        time_param = np.array(
-            [
-                tuple(
-                    np.mean(
-                        rfn.structured_to_unstructured(
-                            parameters[tempo_param_names][uix]
-                        ),
-                        axis=0,
-                    ),
-                )
-                for uix in unique_onset_idxs
-            ],
-            dtype=[(tp, "f4") for tp in tempo_param_names],
-        )
-        beat_period = TEMPO_NORMALIZATION[normalization]["rescale"](time_param)
-
     else:
-        time_param = np.array(
-            [
-                tuple([np.mean(parameters["beat_period"][uix])])
-                for uix in unique_onset_idxs
-            ],
-            dtype=[("beat_period", "f4")],
-        )
-        beat_period = time_param["beat_period"]
+        tempo_param_names = ["beat_period"]
+
+    time_param = np.zeros(
+        len(onset_groups[2]), dtype=[(tp, "f4") for tp in tempo_param_names]
+    )
+    for tp in tempo_param_names:
+        time_param[tp] = group_mean(parameters[tp], onset_groups)
+    beat_period = TEMPO_NORMALIZATION[normalization]["rescale"](time_param)
 
     ioi_perf = diff_u_onset_score * beat_period
 
@@ -259,15 +519,16 @@ def decode_time(
 
     performance = np.zeros((len(score_onsets), 2))
 
-    for i, jj in enumerate(unique_onset_idxs):
-        # decode onset
-        performance[jj, 0] = eq_onset[i] - parameters["timing"][jj]
-        # decode duration
-        performance[jj, 1] = decode_articulation(
-            score_durations=score_durations[jj],
-            articulation_parameter=parameters["articulation_log"][jj],
-            beat_period=beat_period[i],
-        )
+    sort_idx, _, group_lengths = onset_groups
+    group_idx = np.repeat(np.arange(len(group_lengths)), group_lengths)
+    # decode onset
+    performance[sort_idx, 0] = eq_onset[group_idx] - parameters["timing"][sort_idx]
+    # decode duration
+    performance[sort_idx, 1] = decode_articulation(
+        score_durations=score_durations[sort_idx],
+        articulation_parameter=parameters["articulation_log"][sort_idx],
+        beat_period=beat_period[group_idx],
+    )
 
     performance[:, 0] -= np.min(performance[:, 0])
 
@@ -281,17 +542,23 @@ def encode_articulation(
     Encode articulation
     """
     articulation = np.zeros_like(score_durations)
-    for idx, bp in zip(unique_onset_idxs, beat_period):
-        sd = score_durations[idx]
-        pd = performed_durations[idx]
-
-        # indices of notes with duration 0 (grace notes)
-        grace_mask = sd <= 0
-
-        # Grace notes have an articulation ratio of 1
-        sd[grace_mask] = 1
-        pd[grace_mask] = bp
-        articulation[idx] = np.log2(pd / (bp * sd))
+    beat_period = np.asarray(beat_period)
+    sort_idx, _, group_lengths = get_onset_groups(unique_onset_idxs)
+    group_idx = np.repeat(np.arange(len(group_lengths)), group_lengths)
+    # onset groups without a beat period are not encoded
+    has_bp = group_idx < len(beat_period)
+    idx = sort_idx[has_bp]
+    bp = beat_period[group_idx[has_bp]]
+    sd = score_durations[idx]
+    pd = performed_durations[idx]
+
+    # indices of notes with duration 0 (grace notes)
+    grace_mask = sd <= 0
+
+    # Grace notes have an articulation ratio of 1
+    sd[grace_mask] = 1
+    pd[grace_mask] = bp[grace_mask]
+    articulation[idx] = np.log2(pd / (bp * sd))
 
     return articulation
 
@@ -383,12 +650,14 @@ def encode_tempo(
         parameter_names += tempo_param_names
     parameters = np.zeros(len(score), dtype=[(pn, "f4") for pn in parameter_names])
     parameters["articulation_log"] = articulation_param
-    for i, jj in enumerate(unique_onset_idxs):
-        parameters["beat_period"][jj] = beat_period[i]
-        # Defined as in Eq. (3.9) in Thesis (pp. 34)
-        parameters["timing"][jj] = eq_onsets[i] - performance[jj, 0]
-        if beat_normalization != "beat_period":
-            parameters[tempo_param_names][jj] = tuple(tempo_params[:, i])
+    sort_idx, _, group_lengths = get_onset_groups(unique_onset_idxs)
+    group_idx = np.repeat(np.arange(len(group_lengths)), group_lengths)
+    parameters["beat_period"][sort_idx] = beat_period[group_idx]
+    # Defined as in Eq. (3.9) in Thesis (pp. 34)
+    parameters["timing"][sort_idx] = eq_onsets[group_idx] - performance[sort_idx, 0]
+    if beat_normalization != "beat_period":
+        for tp, tempo_param in zip(tempo_param_names, tempo_params):
+            parameters[tp][sort_idx] = tempo_param[group_idx]
 
     if return_u_onset_idx:
         return parameters, unique_onset_idxs
@@ -610,7 +879,7 @@ def tempo_by_derivative(
 def to_matched_score(
     score: ScoreLike,
     performance: PerformanceLike,
-    alignment: list,
+    alignment: Union[list, Alignment],
     include_score_markings=False,
 ):
     """
@@ -620,7 +889,7 @@ def to_matched_score(
     Args:
         score (score.ScoreLike): score information
         performance (performance.PerformanceLike): performance information
-        alignment (List(Dict)): an alignment
+        alignment (List(Dict) or Alignment): an alignment
         include_score_markings (bool): include dynamcis and articulation
             markings (Optional)
 
@@ -629,11 +898,6 @@ def to_matched_score(
         score-performance note array
     """
 
-    # remove repetitions from aligment note ids
-    for a in alignment:
-        if a["label"] == "match":
-            a["score_id"] = str(a["score_id"])
-
     feature_functions = None
     if include_score_markings:
         feature_functions = [
@@ -645,34 +909,27 @@ def to_matched_score(
 
     na = note_features.compute_note_array(score, feature_functions=feature_functions)
     p_na = performance.note_array()
-    part_by_id = dict((n["id"], na[na["id"] == n["id"]]) for n in na)
-    ppart_by_id = dict((n["id"], p_na[p_na["id"] == n["id"]]) for n in p_na)
 
+    return _to_matched_score(na, p_na, alignment, include_score_markings)
+
+
+def _to_matched_score(na, p_na, alignment, include_score_markings=False):
     # pair matched score and performance notes
-    note_pairs = [
-        (part_by_id[a["score_id"]], ppart_by_id[a["performance_id"]])
-        for a in alignment
-        if (a["label"] == "match" and a["score_id"] in part_by_id)
-    ]
-    ms = []
+    alignment = ensure_alignment(alignment)
+    matches = alignment[alignment.mask("match")].index(na, p_na).array
+    s_idx = matches["score_idx"]
+    p_idx = matches["performance_idx"]
+    in_score = s_idx >= 0
+    missing = np.flatnonzero(in_score & (p_idx < 0))
+    if len(missing) > 0:
+        raise KeyError(matches["performance_id"][missing[0]])
+
+    sn = na[s_idx[in_score]]
+    n = p_na[p_idx[in_score]]
     # sort according to onset (primary) and pitch (secondary)
-    pitch_onset = [(sn["pitch"].item(), sn["onset_div"].item()) for sn, _ in note_pairs]
-    sort_order = np.lexsort(list(zip(*pitch_onset)))
-    snote_ids = []
-    for i in sort_order:
-        sn, n = note_pairs[int(i)]
-        sn_on, sn_off = [sn["onset_beat"], sn["onset_beat"] + sn["duration_beat"]]
-        sn_dur = sn_off - sn_on
-        # hack for notes with negative durations
-        n_dur = max(n["duration_sec"], 60 / 200 * 0.25)
-        pair_info = (sn_on, sn_dur, sn["pitch"], n["onset_sec"], n_dur, n["velocity"])
-        if include_score_markings:
-            pair_info += (sn["voice"].item(),)
-            pair_info += tuple(
-                [sn[field].item() for field in sn.dtype.names if "feature" in field]
-            )
-        ms.append(pair_info)
-        snote_ids.append(sn["id"].item())
+    sort_order = np.lexsort((sn["pitch"], sn["onset_div"]))
+    sn = sn[sort_order]
+    n = n[sort_order]
 
     fields = [
         ("onset", "f4"),
@@ -682,15 +939,29 @@ def to_matched_score(
         ("p_duration", "f4"),
         ("velocity", "i4"),
     ]
+    feature_fields = [field for field in na.dtype.names if "feature" in field]
     if include_score_markings:
         fields += [("voice", "i4")]
-        fields += [
-            (field, sn.dtype.fields[field][0])
-            for field in sn.dtype.fields
-            if "feature" in field
-        ]
+        fields += [(field, na.dtype.fields[field][0]) for field in feature_fields]
+
+    ms = np.empty(len(sn), dtype=fields)
+    sn_on = sn["onset_beat"]
+    sn_off = sn["onset_beat"] + sn["duration_beat"]
+    ms["onset"] = sn_on
+    ms["duration"] = sn_off - sn_on
+    ms["pitch"] = sn["pitch"]
+    ms["p_onset"] = n["onset_sec"]
+    # hack for notes with negative durations
+    ms["p_duration"] = np.maximum(n["duration_sec"], 60 / 200 * 0.25)
+    ms["velocity"] = n["velocity"]
+    if include_score_markings:
+        ms["voice"] = sn["voice"]
+        for field in feature_fields:
+            ms[field] = sn[field]
+
+    snote_ids = sn["id"].tolist()
 
-    return np.array(ms, dtype=fields), snote_ids
+    return ms, snote_ids
 
 
 def get_time_maps_from_alignment(
@@ -708,8 +979,9 @@ def get_time_maps_from_alignment(
     spart_or_note_array : Part or structured array
         Score information as either a Part object or the note array
         generated from such an object.
-    alignment : list
-        The score--performance alignment, a list of dictionaries.
+    alignment : list or Alignment
+        The score--performance alignment, a list of dictionaries or an
+        `Alignment`.
         (see `partitura.io.importmatch.alignment_from_matchfile` for reference)
     remove_ornaments : bool (optional)
         Whether to consider or not ornaments (including grace notes)
@@ -743,32 +1015,29 @@ def get_time_maps_from_alignment(
     perf_onsets = perf_note_array[match_idx[:, 1]]["onset_sec"]
 
     # Use only unique onsets
-    score_unique_onsets = np.unique(score_onsets)
+    score_unique_onsets, score_onset_idxs = np.unique(score_onsets, return_inverse=True)
 
     # Remove grace notes
     if remove_ornaments:
         # TODO: check that all onsets have a duration?
         # ornaments (grace notes) do not have a duration
-        score_unique_onset_idxs = np.array(
-            [
-                np.where(np.logical_and(score_onsets == u, score_durations > 0))[0]
-                for u in score_unique_onsets
-            ],
-            dtype=object,
-        )
-
+        valid = score_durations > 0
     else:
-        score_unique_onset_idxs = np.array(
-            [np.where(score_onsets == u)[0] for u in score_unique_onsets],
-            dtype=object,
-        )
+        valid = np.ones(len(score_onsets), dtype=bool)
 
     # For chords, we use the average performed onset as a proxy for
     # representing the "performeance time" of the position of the score
-    # onsets
-    eq_perf_onsets = np.array(
-        [np.mean(perf_onsets[u]) for u in score_unique_onset_idxs]
+    # onsets (onsets with only grace notes get NaN)
+    onset_counts = np.bincount(
+        score_onset_idxs[valid], minlength=len(score_unique_onsets)
     )
+    onset_sums = np.bincount(
+        score_onset_idxs[valid],
+        weights=perf_onsets[valid],
+        minlength=len(score_unique_onsets),
+    )
+    with np.errstate(invalid="ignore"):
+        eq_perf_onsets = (onset_sums / onset_counts).astype(perf_onsets.dtype)
 
     # Get maps
     ptime_to_stime_map = interp1d(
@@ -797,8 +1066,9 @@ def get_matched_notes(spart_note_array, ppart_note_array, alignment):
         note_array of the score part
     ppart_note_array : structured numpy array
         note_array of the performed part
-    alignment : list
-        The score--performance alignment, a list of dictionaries.
+    alignment : list or Alignment
+        The score--performance alignment, a list of dictionaries or an
+        `Alignment`.
         (see `partitura.io.importmatch.alignment_from_matchfile` for reference)
 
     Returns
@@ -808,27 +1078,16 @@ def get_matched_notes(spart_note_array, ppart_note_array, alignment):
         performed notes, where the columns are
         (index_in_score_note_array, index_in_performance_notearray)
     """
-    # Get matched notes
-    matched_idxs = []
-    for al in alignment:
-        # Get only matched notes (i.e., ignore inserted or deleted notes)
-        if al["label"] == "match":
-            # if ppart_note_array['id'].dtype != type(al['performance_id']):
-            if not isinstance(ppart_note_array["id"], type(al["performance_id"])):
-                p_id = str(al["performance_id"])
-            else:
-                p_id = al["performance_id"]
-
-            p_idx = np.where(ppart_note_array["id"] == p_id)[0]
+    # Get only matched notes (i.e., ignore inserted or deleted notes)
+    alignment = ensure_alignment(alignment)
+    matches = alignment[alignment.mask("match")]
+    matches = matches.index(spart_note_array, ppart_note_array).array
+    s_idx = matches["score_idx"]
+    p_idx = matches["performance_idx"]
+    valid = (s_idx >= 0) & (p_idx >= 0)
+    matched_idxs = np.column_stack((s_idx[valid], p_idx[valid]))
 
-            s_idx = np.where(spart_note_array["id"] == al["score_id"])[0]
-
-            if len(s_idx) > 0 and len(p_idx) > 0:
-                s_idx = int(s_idx)
-                p_idx = int(p_idx)
-                matched_idxs.append((s_idx, p_idx))
-
-    return np.array(matched_idxs)
+    return matched_idxs
 
 
 #### Sequence Processing: onset-wise/note-wise/monotonicity/uniqueness ####
@@ -854,7 +1113,7 @@ def get_unique_seq(onsets, offsets, unique_onset_idxs=None, return_diff=False):
         # unique_onset_idxs = unique_onset_idx(score[:, 0])
         unique_onset_idxs = get_unique_onset_idxs(onsets)
 
-    u_onset = np.array([np.mean(onsets[uix]) for uix in unique_onset_idxs])
+    u_onset = group_mean(onsets, get_onset_groups(unique_onset_idxs))
     # add last offset, so we have as many IOIs as notes
     u_onset = np.r_[u_onset, last_time]
 
@@ -901,13 +1160,82 @@ def get_unique_onset_idxs(
 
     if return_unique_onsets:
         # Instead of np.unique(onsets)
-        unique_onsets = np.array([onsets[uix].mean() for uix in unique_onset_idxs])
+        group_starts = np.r_[0, split_idx]
+        group_lengths = np.diff(np.r_[group_starts, len(onsets)])
+        unique_onsets = group_mean(onsets, (sort_idx, group_starts, group_lengths))
 
         return unique_onset_idxs, unique_onsets
     else:
         return unique_onset_idxs
 
 
+def get_onset_groups(unique_onset_idxs):
+    """
+    Represent groups of note indices (e.g., the notes sharing a score
+    onset) as a permutation of the notes and the boundaries of the
+    groups in it, so that values can be aggregated per group and
+    broadcast back to the notes without iterating over the groups.
+
+    Parameters
+    ----------
+    unique_onset_idxs : list of np.ndarray
+        The indices of the notes in each group (see
+        `get_unique_onset_idxs`).
+
+    Returns
+    -------
+    sort_idx : np.ndarray
+        The indices of the notes of all groups, one group after the
+        other.
+    group_starts : np.ndarray
+        The position in `sort_idx` of the first note of each group.
+    group_lengths : np.ndarray
+        The number of notes in each group.
+    """
+    group_lengths = np.array([len(uix) for uix in unique_onset_idxs], dtype=int)
+    if len(group_lengths) > 0:
+        sort_idx = np.concatenate(unique_onset_idxs).astype(int, copy=False)
+    else:
+        sort_idx = np.zeros(0, dtype=int)
+    group_starts = np.cumsum(group_lengths) - group_lengths
+    return sort_idx, group_starts, group_lengths
+
+
+def group_mean(values, onset_groups):
+    """
+    Average of the values of the notes in each group.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values of the notes. For multidimensional arrays, the
+        first axis corresponds to the notes.
+    onset_groups : tuple
+        The groups of notes, as returned by `get_onset_groups`.
+
+    Returns
+    -------
+    means : np.ndarray
+        The average of the values of each group (NaN for empty groups).
+    """
+    sort_idx, group_starts, group_lengths = onset_groups
+    values = np.asarray(values)
+    dtype = values.dtype if values.dtype.kind == "f" else float
+    sums = np.zeros((len(group_lengths),) + values.shape[1:], dtype=dtype)
+    non_empty = group_lengths > 0
+    if np.any(non_empty):
+        # empty groups are skipped, since reduceat would return the
+        # value at their start instead of 0
+        sums[non_empty] = np.add.reduceat(
+            values[sort_idx].astype(dtype, copy=False),
+            group_starts[non_empty],
+            axis=0,
+        )
+    counts = group_lengths.reshape((-1,) + (1,) * (values.ndim - 1))
+    with np.errstate(invalid="ignore"):
+        return sums / counts
+
+
 def notewise_to_onsetwise(notewise_inputs, unique_onset_idxs):
     """Agregate basis functions per onset"""
 
@@ -917,26 +1245,28 @@ def notewise_to_onsetwise(notewise_inputs, unique_onset_idxs):
         shape = (len(unique_onset_idxs),) + notewise_inputs.shape[1:]
     onsetwise_inputs = np.zeros(shape, dtype=notewise_inputs.dtype)
 
-    for i, uix in enumerate(unique_onset_idxs):
-        try:
-            onsetwise_inputs[i] = notewise_inputs[uix].mean(0)
-        except TypeError:
-            for tn in notewise_inputs.dtype.names:
-                onsetwise_inputs[i][tn] = notewise_inputs[uix][tn].mean()
+    onset_groups = get_onset_groups(unique_onset_idxs)
+    if notewise_inputs.dtype.names is None:
+        onsetwise_inputs[:] = group_mean(notewise_inputs, onset_groups)
+    else:
+        for tn in notewise_inputs.dtype.names:
+            onsetwise_inputs[tn] = group_mean(notewise_inputs[tn], onset_groups)
     return onsetwise_inputs
 
 
 def onsetwise_to_notewise(onsetwise_input, unique_onset_idxs):
     """Expand onsetwise predictions for each note"""
-    n_notes = sum([len(uix) for uix in unique_onset_idxs])
+    sort_idx, _, group_lengths = get_onset_groups(unique_onset_idxs)
+    n_notes = len(sort_idx)
     if onsetwise_input.ndim == 1:
         shape = n_notes
     else:
         shape = (n_notes,) + onsetwise_input.shape[1:]
     notewise_inputs = np.zeros(shape, dtype=onsetwise_input.dtype)
 
-    for i, uix in enumerate(unique_onset_idxs):
-        notewise_inputs[uix] = onsetwise_input[[i]]
+    notewise_inputs[sort_idx] = np.repeat(
+        onsetwise_input[: len(group_lengths)], group_lengths, axis=0
+    )
     return notewise_inputs
 
 
@@ -15,6 +15,7 @@ import numpy.lib.recfunctions as rfn
 from partitura.score import ScoreLike
 from partitura.performance import PerformanceLike, PerformedPart
 from partitura.utils.generic import interp1d
+from partitura.utils.alignment import Alignment
 from partitura.musicanalysis.performance_codec import (
     to_matched_score,
     onsetwise_to_notewise,
@@ -37,7 +38,7 @@ class InvalidPerformanceFeatureException(Exception):
 def make_performance_features(
     score: ScoreLike,
     performance: PerformanceLike,
-    alignment: list,
+    alignment: Union[list, Alignment],
     feature_functions: Union[List, str],
     add_idx: bool = True,
 ):
@@ -51,8 +52,9 @@ def make_performance_features(
         Score information, can be a part, score
     performance : partitura.performance.PerformanceLike
         Performance information, can be a ppart, performance
-    alignment : list
-        The score--performance alignment, a list of dictionaries
+    alignment : list or Alignment
+        The score--performance alignment, a list of dictionaries or an
+        `Alignment`
     feature_functions : list or str
         A list of performance feature functions. Elements of the list can be either
         the functions themselves or the names of a feature function as
@@ -140,7 +142,7 @@ def make_performance_features(
 def compute_matched_score(
     score: ScoreLike,
     performance: PerformanceLike,
-    alignment: list,
+    alignment: Union[list, Alignment],
 ):
     """
     Compute the matched score and add the score features
@@ -151,8 +153,9 @@ def compute_matched_score(
         Score information, can be a part, score
     performance : partitura.performance.PerformanceLike
         Performance information, can be a ppart, performance
-    alignment : list
-        The score--performance alignment, a list of dictionaries
+    alignment : list or Alignment
+        The score--performance alignment, a list of dictionaries or an
+        `Alignment`
 
     Returns
     -------
@@ -11,7 +11,7 @@ notes as well as continuous control parameters, such as sustain pedal.
 from typing import Union, List, Optional, Iterator, Iterable as Itertype
 import numpy as np
 from partitura.utils import note_array_from_part_list
-from partitura.utils.music import seconds_to_midi_ticks
+from partitura.utils.music import seconds_to_midi_ticks, _string_column
 
 __all__ = [
     "PerformedPart",
@@ -150,10 +150,13 @@ class PerformedPart(object):
             )
         )
 
-    def note_array(self, *args, **kwargs) -> np.ndarray:
+    def note_array(self, *args, compact_strings=True, **kwargs) -> np.ndarray:
         """Structured array containing performance information.
         The fields are 'id', 'pitch', 'onset_div', 'duration_div',
         'onset_sec', 'duration_sec' and 'velocity'.
+
+        If `compact_strings` is True (default), the 'id' field is only
+        as wide as the longest note id, otherwise it is `U256`.
         """
 
         fields = [
@@ -165,8 +168,9 @@ class PerformedPart(object):
             ("velocity", "i4"),
             ("track", "i4"),
             ("channel", "i4"),
-            ("id", "U256"),
         ]
+        note_ids = _string_column([n["id"] for n in self.notes], compact_strings)
+        fields += [("id", note_ids.dtype)]
         note_array = []
         for n in self.notes:
             note_on_sec = n["note_on"]
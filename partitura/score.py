@@ -9,9 +9,13 @@ object). This object serves as a timeline at which musical elements
 are registered in terms of their start and end times.
 """
 
+from bisect import bisect_left, bisect_right
 from copy import copy, deepcopy
+from functools import wraps
+from inspect import signature
 from collections import defaultdict
 from collections.abc import Iterable
+from contextlib import contextmanager
 from numbers import Number
 from partitura.utils.globals import (
     MUSICAL_BEATS,
@@ -42,6 +46,7 @@ from partitura.utils import (
     rest_array_from_part,
     rest_array_from_part_list,
     note_array_from_part_list,
+    project_note_array,
     to_quarter_tempo,
     key_mode_to_int,
     _OrderedSet,
@@ -49,6 +54,7 @@ from partitura.utils import (
 )
 from partitura.utils.generic import interp1d
 from partitura.utils.music import transpose_note, step2pc
+from partitura.utils.alignment import Alignment
 from partitura.utils.globals import (
     INT_TO_ALT,
     ALT_TO_INT,
@@ -57,6 +63,23 @@ from partitura.utils.globals import (
 )
 
 
+def _cached_by_version(method):
+    """Decorator caching the value of a method without arguments of a
+    :class:`Part`, until the version of the part changes (see
+    :attr:`Part.version`)."""
+
+    @wraps(method)
+    def wrapper(self):
+        cached = self._version_cache.get(method.__name__)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        value = method(self)
+        self._version_cache[method.__name__] = (self._version, value)
+        return value
+
+    return wrapper
+
+
 class Part(object):
     """Represents a score part, e.g. all notes of one single instrument
     (or multiple instruments written in the same staff). Note that
@@ -84,6 +107,9 @@ class Part(object):
         See parameters
     part_abbreviation : str
         See parameters
+    version : int
+        A counter that is incremented whenever the timeline of the part
+        changes (see :attr:`~partitura.score.Part.version`)
 
     """
 
@@ -94,8 +120,29 @@ class Part(object):
         self.part_name = part_name
         self.part_abbreviation = part_abbreviation
 
-        # timeline init
-        self._points = np.array([], dtype=TimePoint)
+        # timeline init; `_points` is a list of TimePoint objects kept
+        # sorted by time, so that insertions only shift references
+        # instead of copying the whole timeline. `_point_times` holds the
+        # times of the points, so that lookups can be done by binary search
+        # on plain numbers rather than on TimePoint objects
+        self._points = []
+        self._point_times = []
+        # timepoints created inside `bulk_add`, waiting to be merged into
+        # the timeline
+        self._pending_points = {}
+        self._bulk_depth = 0
+        # per-class indices of the timepoints where objects start/end, as
+        # dictionaries {class: {time: timepoint}}
+        self._starting_index = {}
+        self._ending_index = {}
+        # caches derived from the indices: the classes in the part that are
+        # subclasses of a given class, and the sorted timepoints to visit
+        # for a given class
+        self._class_closures = {}
+        self._index_cache = {}
+        # modification counter, and values cached for a given version
+        self._version = 0
+        self._version_cache = {}
         self._quarter_times = [0]
         self._quarter_durations = [quarter_duration]
         self._quarter_map = self.quarter_duration_map
@@ -109,7 +156,50 @@ class Part(object):
     def __str__(self):
         return 'Part id="{}" name="{}"'.format(self.id, self.part_name)
 
+    def __getstate__(self):
+        # The timeline is a graph of timepoints and objects referring to
+        # each other, that pickle (and deepcopy) would traverse
+        # recursively, exceeding the recursion limit for long parts. The
+        # timepoints are therefore stored without their objects and
+        # neighbors (see `TimePoint.__getstate__`), and the objects
+        # starting and ending at each timepoint are stored as flat lists
+        self._flush_points()
+        state = self.__dict__.copy()
+        state["_timeline"] = [
+            (
+                [(cls, list(objects)) for cls, objects in tp.starting_objects.items()],
+                [(cls, list(objects)) for cls, objects in tp.ending_objects.items()],
+            )
+            for tp in self._points
+        ]
+        # cached values are recomputed when needed
+        state["_class_closures"] = {}
+        state["_index_cache"] = {}
+        state["_version_cache"] = {}
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        timeline = state.pop("_timeline")
+        self.__dict__.update(state)
+        # when unpickling starts from an object in the timeline rather
+        # than from the part, some timepoints are not restored yet, so
+        # their attributes are assigned rather than updated (see
+        # `TimePoint.__setstate__`)
+        for tp, (starting, ending) in zip(self._points, timeline):
+            tp.starting_objects = defaultdict(
+                _OrderedSet,
+                ((cls, _OrderedSet.fromkeys(objects)) for cls, objects in starting),
+            )
+            tp.ending_objects = defaultdict(
+                _OrderedSet,
+                ((cls, _OrderedSet.fromkeys(objects)) for cls, objects in ending),
+            )
+        for i in range(len(self._points)):
+            self._link_point(i)
+
     def _pp(self, tree):
+        self._flush_points()
         result = [self.__str__()]
         tree.push()
         N = len(self._points)
@@ -135,6 +225,36 @@ class Part(object):
         return "\n".join(self._pp(PrettyPrintTree()))
 
     @property
+    def version(self):
+        """A counter that is incremented on every change to the timeline
+        of the part, i.e. when timepoints or objects are added or
+        removed, when the quarter duration changes, or when switching
+        between notated and musical beats.
+
+        Derived maps like :attr:`beat_map` or :attr:`measure_map` are
+        cached until the version changes. Setting the attributes of
+        notes that appear in note arrays (`id`, `voice`, `staff`,
+        `step`, `alter`, `octave`, `grace_type`, `tie_prev` and
+        `tie_next`) also changes the version. Modifying other
+        attributes of objects that are already in the part (e.g. the
+        `beats` of a :class:`TimeSignature`) does not change the
+        version; call :meth:`touch` to invalidate the cached values in
+        that case.
+
+        Returns
+        -------
+        int
+
+        """
+        return self._version
+
+    def touch(self):
+        """Mark the part as modified, invalidating cached values that
+        depend on its contents (see :attr:`version`)."""
+        self._version += 1
+
+    @property
+    @_cached_by_version
     def time_signature_map(self):
         """A function mapping timeline times to the beats and beat_type
         of the time signature at that time. The function can take
@@ -188,6 +308,7 @@ class Part(object):
         )
 
     @property
+    @_cached_by_version
     def key_signature_map(self):
         """A function mappting timeline times to the key and mode of
         the key signature at that time. The function can take scalar
@@ -230,6 +351,7 @@ class Part(object):
         )
 
     @property
+    @_cached_by_version
     def measure_map(self):
         """A function mapping timeline times to the start and end of
         the measure they are contained in. The function can take
@@ -278,6 +400,7 @@ class Part(object):
         return inter_function
 
     @property
+    @_cached_by_version
     def measure_number_map(self):
         """A function mapping timeline times to the measure number of
         the measure they are contained in. The function can take
@@ -336,6 +459,7 @@ class Part(object):
         return inter_function
 
     @property
+    @_cached_by_version
     def metrical_position_map(self):
         """A function mapping timeline times to their relative position in
         the measure they are contained in. The function can take
@@ -396,6 +520,7 @@ class Part(object):
             return int_interp1d
 
     def _time_interpolator(self, quarter=False, inv=False, musical_beat=False):
+        self._flush_points()
         if len(self._points) < 2:
             return lambda x: np.zeros(len(x))
 
@@ -464,6 +589,7 @@ class Part(object):
             return interp1d(x, y)
 
     @property
+    @_cached_by_version
     def beat_map(self):
         """A function mapping timeline times to beat times. The function
         can take scalar values or lists/arrays of values.
@@ -480,6 +606,7 @@ class Part(object):
             return self._time_interpolator()
 
     @property
+    @_cached_by_version
     def inv_beat_map(self):
         """A function mapping beat times to timeline times. The function
         can take scalar values or lists/arrays of values.
@@ -496,6 +623,7 @@ class Part(object):
             return self._time_interpolator(inv=True)
 
     @property
+    @_cached_by_version
     def quarter_map(self):
         """A function mapping timeline times to quarter times. The
         function can take scalar values or lists/arrays of values.
@@ -509,6 +637,7 @@ class Part(object):
         return self._time_interpolator(quarter=True)
 
     @property
+    @_cached_by_version
     def inv_quarter_map(self):
         """A function mapping quarter times to timeline times. The
         function can take scalar values or lists/arrays of values.
@@ -826,27 +955,118 @@ class Part(object):
             t_next = times[i + 1]
 
         # update quarter attribute of all timepoints in the range [t, t_next]
-        start_idx = np.searchsorted(self._points, TimePoint(t))
-        end_idx = np.searchsorted(self._points, TimePoint(t_next))
-        for tp in self._points[start_idx:end_idx]:
-            tp.quarter = quarter
+        start_idx = bisect_left(self._point_times, t)
+        end_idx = bisect_left(self._point_times, t_next)
+        for i in range(start_idx, end_idx):
+            self._points[i].quarter = quarter
 
         # update the interpolation function
         self._quarter_map = self.quarter_duration_map
+        self._version += 1
 
     def _add_point(self, tp):
         # Add `TimePoint` object `tp` to the part, unless there is
         # already a timepoint at the same time.
 
-        i = np.searchsorted(self._points, tp)
-        if i == len(self._points) or self._points[i].t != tp.t:
-            self._points = np.insert(self._points, i, tp)
-            if i > 0:
-                self._points[i - 1].next = self._points[i]
-                self._points[i].prev = self._points[i - 1]
-            if i < len(self._points) - 1:
-                self._points[i].next = self._points[i + 1]
-                self._points[i + 1].prev = self._points[i]
+        if self._bulk_depth > 0:
+            # defer sorting and linking until the bulk addition is over
+            tp = self._pending_points.setdefault(_point_key(tp.t), tp)
+            tp._part = self
+            self._version += 1
+            return
+
+        times = self._point_times
+        n = len(times)
+
+        if n == 0 or times[-1] < tp.t:
+            # fast path: timelines are mostly built in increasing time
+            # order, in which case the point is simply appended
+            i = n
+            self._points.append(tp)
+            times.append(tp.t)
+        else:
+            i = bisect_left(times, tp.t)
+            if times[i] == tp.t:
+                return
+            self._points.insert(i, tp)
+            times.insert(i, tp.t)
+
+        tp._part = self
+        self._version += 1
+
+        self._link_point(i)
+
+    def _flush_points(self):
+        # Merge the timepoints created during a bulk addition into the
+        # timeline, set their quarter durations and update the `prev`/`next`
+        # references from the first new timepoint onwards.
+        if not self._pending_points:
+            return
+
+        new_points = sorted(self._pending_points.values(), key=lambda tp: tp.t)
+        self._pending_points = {}
+
+        quarters = self._quarter_map([tp.t for tp in new_points])
+        for tp, quarter in zip(new_points, quarters):
+            tp.quarter = int(quarter)
+
+        points = self._points
+        i = bisect_left(self._point_times, new_points[0].t)
+        if i == len(points):
+            points.extend(new_points)
+            self._point_times.extend(tp.t for tp in new_points)
+        else:
+            # both lists are sorted, so this is a linear merge
+            points.extend(new_points)
+            points.sort(key=lambda tp: tp.t)
+            self._point_times = [tp.t for tp in points]
+
+        for j in range(max(i - 1, 0), len(points)):
+            self._link_point(j)
+
+        self._version += 1
+
+    @contextmanager
+    def bulk_add(self):
+        """Context manager for adding many objects to the part at once.
+
+        Inside the context, :meth:`add` registers objects at their
+        timepoints right away, but new timepoints are only sorted into
+        the timeline, linked to their neighbors and assigned a quarter
+        duration when the outermost context exits. Methods that read the
+        timeline (like :meth:`iter_all`) merge the pending timepoints
+        first, so the part remains consistent, but the `prev`/`next`
+        attributes of new timepoints are not set until then.
+
+        Examples
+        --------
+        >>> part = Part("P0")
+        >>> with part.bulk_add():
+        ...     for i in range(4):
+        ...         part.add(Note(step="C", octave=4), i, i + 1)
+        >>> len(part.notes)
+        4
+
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0:
+                self._flush_points()
+
+    def _link_point(self, i):
+        # Update the `prev`/`next` references of the timepoint at index `i`
+        # and its neighbors
+        points = self._points
+        tp = points[i]
+        tp.prev = points[i - 1] if i > 0 else None
+        tp.next = points[i + 1] if i < len(points) - 1 else None
+        if tp.prev is not None:
+            tp.prev.next = tp
+        if tp.next is not None:
+            tp.next.prev = tp
 
     @property
     def number_of_staves(self):
@@ -874,15 +1094,25 @@ class Part(object):
         return max_staves
 
     def _remove_point(self, tp):
-        i = np.searchsorted(self._points, tp)
-        if self._points[i] == tp:
-            self._points = np.delete(self._points, i)
-            if i > 0:
-                self._points[i - 1].next = self._points[i]
-                self._points[i].prev = self._points[i - 1]
-            if i < len(self._points) - 1:
-                self._points[i].next = self._points[i + 1]
-                self._points[i + 1].prev = self._points[i]
+        if self._pending_points.get(_point_key(tp.t)) is tp:
+            del self._pending_points[_point_key(tp.t)]
+            tp._part = None
+            self._version += 1
+            return
+
+        times = self._point_times
+        i = bisect_left(times, tp.t)
+        if i < len(times) and times[i] == tp.t:
+            del times[i]
+            tp = self._points.pop(i)
+            if tp.prev is not None:
+                tp.prev.next = tp.next
+            if tp.next is not None:
+                tp.next.prev = tp.prev
+            tp.prev = None
+            tp.next = None
+            tp._part = None
+            self._version += 1
 
     def get_point(self, t):
         """Return the `TimePoint` object with time `t`, or None if
@@ -894,8 +1124,13 @@ class Part(object):
                 "TimePoints should have non-negative integer values"
             )
 
-        i = np.searchsorted(self._points, TimePoint(t))
-        if i < len(self._points) and self._points[i].t == t:
+        if self._pending_points:
+            tp = self._pending_points.get(_point_key(t))
+            if tp is not None:
+                return tp
+
+        i = bisect_left(self._point_times, t)
+        if i < len(self._point_times) and self._point_times[i] == t:
             return self._points[i]
         else:
             return None
@@ -923,7 +1158,13 @@ class Part(object):
 
         tp = self.get_point(t)
         if tp is None:
-            tp = TimePoint(t, int(self._quarter_map(t)))
+            if self._bulk_depth > 0:
+                # the quarter duration is set when the point is merged
+                tp = TimePoint(t)
+            else:
+                # quarter duration in effect at `t` (see `quarter_duration_map`)
+                i = max(bisect_right(self._quarter_times, t) - 1, 0)
+                tp = TimePoint(t, int(self._quarter_durations[i]))
             self._add_point(tp)
         return tp
 
@@ -959,6 +1200,54 @@ class Part(object):
                 )
             self.get_or_add_point(end).add_ending_object(o)
 
+    def add_many(self, objects, starts=None, ends=None):
+        """Add multiple objects to the timeline.
+
+        This is equivalent to calling :meth:`add` for each object in
+        turn, but the timepoints needed for the objects are created in
+        a single pass and merged into the timeline at once (see
+        :meth:`bulk_add`), which is much faster when adding large
+        numbers of objects.
+
+        Parameters
+        ----------
+        objects : iterable of :class:`TimedObject`
+            Objects to be added
+        starts : iterable of int or None, optional
+            The start times of the objects. Objects whose start time is
+            None are not added by start time. If omitted, no object is
+            added by start time.
+        ends : iterable of int or None, optional
+            The end times of the objects. Objects whose end time is None
+            are not added by end time. If omitted, no object is added by
+            end time.
+
+        """
+        objects = list(objects)
+        n_objects = len(objects)
+        starts = [None] * n_objects if starts is None else list(starts)
+        ends = [None] * n_objects if ends is None else list(ends)
+
+        if len(starts) != n_objects or len(ends) != n_objects:
+            raise ValueError(
+                "`starts` and `ends` should have the same length as `objects`"
+            )
+
+        times = set(t for t in starts + ends if t is not None)
+
+        if times and min(times) < 0:
+            raise InvalidTimePointException(
+                "TimePoints should have non-negative integer values"
+            )
+
+        with self.bulk_add():
+            points = dict((t, self.get_or_add_point(t)) for t in times)
+            for o, start, end in zip(objects, starts, ends):
+                if start is not None:
+                    points[start].add_starting_object(o)
+                if end is not None:
+                    points[end].add_ending_object(o)
+
     def remove(self, o, which="both"):
         """Remove an object from the timeline.
 
@@ -977,6 +1266,7 @@ class Part(object):
         if which in ("start", "both") and o.start:
             try:
                 o.start.starting_objects[o.__class__].remove(o)
+                self._unindex_object(o.start, o.__class__, "starting")
             except (KeyError, ValueError):
                 raise Exception(
                     "Not implemented: removing an object "
@@ -989,6 +1279,7 @@ class Part(object):
         if which in ("end", "both") and o.end:
             try:
                 o.end.ending_objects[o.__class__].remove(o)
+                self._unindex_object(o.end, o.__class__, "ending")
             except (KeyError, ValueError):
                 raise Exception(
                     "Not implemented: removing an object "
@@ -998,6 +1289,55 @@ class Part(object):
             self._cleanup_point(o.end)
             o.end = None
 
+    def _index_object(self, tp, cls, mode):
+        # register that objects of class `cls` start/end (depending on
+        # `mode`) at timepoint `tp`
+        index = self._starting_index if mode == "starting" else self._ending_index
+        if cls not in index:
+            index[cls] = {}
+            self._class_closures.clear()
+        index[cls][_point_key(tp.t)] = tp
+        self._index_cache.clear()
+        self._version += 1
+
+    def _unindex_object(self, tp, cls, mode):
+        # unregister timepoint `tp` for class `cls` if no objects of that
+        # class start/end (depending on `mode`) there anymore
+        if mode == "starting":
+            index, objects = self._starting_index, tp.starting_objects
+        else:
+            index, objects = self._ending_index, tp.ending_objects
+        if not objects.get(cls):
+            index.get(cls, {}).pop(_point_key(tp.t), None)
+        self._index_cache.clear()
+        self._version += 1
+
+    def _class_closure(self, cls):
+        # The classes of the objects in the part that are `cls` or a
+        # subclass of `cls`, in the order of `iter_subclasses`
+        closure = self._class_closures.get(cls)
+        if closure is None:
+            present = set(self._starting_index) | set(self._ending_index)
+            closure = [c for c in [cls, *iter_subclasses(cls)] if c in present]
+            self._class_closures[cls] = closure
+        return closure
+
+    def _indexed_points(self, cls, include_subclasses, mode):
+        # The sorted times and timepoints at which objects of class `cls`
+        # (or any of its subclasses) start/end (depending on `mode`)
+        key = (cls, include_subclasses, mode)
+        cached = self._index_cache.get(key)
+        if cached is None:
+            index = self._starting_index if mode == "starting" else self._ending_index
+            classes = self._class_closure(cls) if include_subclasses else [cls]
+            points = {}
+            for c in classes:
+                points.update(index.get(c, {}))
+            times = sorted(points)
+            cached = (times, [points[t] for t in times])
+            self._index_cache[key] = cached
+        return cached
+
     def _cleanup_point(self, tp):
         # remove tp when it has no starting or ending objects
         if (
@@ -1043,30 +1383,38 @@ class Part(object):
             warnings.warn('unknown mode "{}", using "starting" instead'.format(mode))
             mode = "starting"
 
+        self._flush_points()
+
+        if cls is None:
+            cls = object
+            include_subclasses = True
+
+        times, points = self._indexed_points(cls, include_subclasses, mode)
+
         if start is None:
             start_idx = 0
         else:
-            if not isinstance(start, TimePoint):
-                start = TimePoint(start)
-            start_idx = np.searchsorted(self._points, start)
+            if isinstance(start, TimePoint):
+                start = start.t
+            start_idx = bisect_left(times, start)
 
         if end is None:
-            end_idx = len(self._points)
+            end_idx = len(points)
         else:
-            if not isinstance(end, TimePoint):
-                end = TimePoint(end)
-            end_idx = np.searchsorted(self._points, end)
+            if isinstance(end, TimePoint):
+                end = end.t
+            end_idx = bisect_left(times, end)
 
-        if cls is None:
-            cls = object
-            include_subclasses = True
+        classes = self._class_closure(cls) if include_subclasses else [cls]
 
-        if mode == "ending":
-            for tp in self._points[start_idx:end_idx]:
-                yield from tp.iter_ending(cls, include_subclasses)
-        else:
-            for tp in self._points[start_idx:end_idx]:
-                yield from tp.iter_starting(cls, include_subclasses)
+        for tp in points[start_idx:end_idx]:
+            if mode == "ending":
+                objects = tp.ending_objects
+            else:
+                objects = tp.starting_objects
+            for c in classes:
+                if c in objects:
+                    yield from objects[c]
 
     def apply(self):
         """Apply all changes to the timeline for objects like octave Shift."""
@@ -1082,6 +1430,7 @@ class Part(object):
         :class:`TimePoint`
 
         """
+        self._flush_points()
         return self._points[-1] if len(self._points) > 0 else None
 
     @property
@@ -1094,13 +1443,23 @@ class Part(object):
         :class:`TimePoint`
 
         """
+        self._flush_points()
         return self._points[0] if len(self._points) > 0 else None
 
-    def note_array(self, **kwargs):
+    def note_array(self, *args, **kwargs):
         """
         Create a structured array with note information
         from a `Part` object.
 
+        The note array is cached until the part changes (see
+        :attr:`version`), which includes setting the attributes of its
+        notes that appear in the note array (e.g. `note.voice = 2`).
+        After other in-place changes, like modifying the time signatures
+        in the part, call :meth:`touch` to recompute the note array. The
+        cached array holds the fields of all options requested so far,
+        and the returned array is a copy with the fields of the
+        requested options.
+
         Parameters
         ----------
 
@@ -1130,12 +1489,38 @@ class Part(object):
         include_divs_per_quarter : bool (optional)
             If `True`,  includes the number of divs per quarter note.
             Default is False
+        compact_strings : bool (optional)
+            If `True`, the string fields are only as wide as their
+            longest value. Otherwise they are stored as `U256`.
+            Default is True
 
         Returns:
 
         note_array : structured array
         """
-        return note_array_from_part(self, **kwargs)
+        options = signature(note_array_from_part).bind(self, *args, **kwargs)
+        options = dict(options.arguments)
+        del options["part"]
+
+        cached = self._version_cache.get("note_array")
+        if cached is not None and cached[0] == self._version:
+            cached_options, note_array = cached[1]
+        else:
+            cached_options, note_array = set(), None
+
+        requested_options = set(k for k, v in options.items() if v)
+        if note_array is None or not requested_options <= cached_options:
+            cached_options = cached_options | requested_options
+            note_array = note_array_from_part(
+                self, **dict.fromkeys(cached_options, True)
+            )
+            note_array.flags.writeable = False
+            self._version_cache["note_array"] = (
+                self._version,
+                (cached_options, note_array),
+            )
+
+        return project_note_array(note_array, **options)
 
     def rest_array(
         self,
@@ -1227,6 +1612,8 @@ class Part(object):
                 else:
                     ts.musical_beats = ts.beats
 
+        self._version += 1
+
     def use_musical_beat(self, mbeats_per_ts={}):
         """Consider the musical beat as the reference for all elements
         that concern the number and position of beats.
@@ -1246,6 +1633,7 @@ class Part(object):
         """
         if not self._use_musical_beat:
             self._use_musical_beat = True
+            self._version += 1
             if mbeats_per_ts != {}:  # set the number of nbeats if specified
                 self.set_musical_beat_per_ts(mbeats_per_ts)
         else:
@@ -1260,6 +1648,7 @@ class Part(object):
         """
         if self._use_musical_beat:
             self._use_musical_beat = False
+            self._version += 1
             # reset the number of musical beats to default values
             self.set_musical_beat_per_ts()
         else:
@@ -1282,6 +1671,11 @@ class Part(object):
     #         pg = pg.parent
 
 
+def _point_key(t):
+    # hashable key for time `t` (some importers use 0-d arrays as times)
+    return t.item() if isinstance(t, np.ndarray) else t
+
+
 class TimePoint(ComparableMixin):
     """A TimePoint represents a temporal position within a
     :class:`Part`.
@@ -1327,6 +1721,30 @@ class TimePoint(ComparableMixin):
         # prev and next are dynamically updated once the timepoint is part of a timeline
         self.next = None
         self.prev = None
+        # the part whose timeline contains this timepoint
+        self._part = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._part is not None:
+            # the objects and neighbors of a timepoint in a timeline are
+            # restored by the part (see `Part.__getstate__`)
+            state["starting_objects"] = defaultdict(_OrderedSet)
+            state["ending_objects"] = defaultdict(_OrderedSet)
+            state["next"] = None
+            state["prev"] = None
+        return state
+
+    def __setstate__(self, state):
+        # keep the objects and neighbors if the part has already restored
+        # them (see `Part.__setstate__`)
+        for key, value in state.items():
+            self.__dict__.setdefault(key, value)
+
+    def __copy__(self):
+        new = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
 
     def __iadd__(self, value):
         assert isinstance(value, Number)
@@ -1357,6 +1775,8 @@ class TimePoint(ComparableMixin):
         """Add object `obj` to the list of starting objects."""
         obj.start = self
         self.starting_objects[type(obj)].add(obj)
+        if self._part is not None:
+            self._part._index_object(self, type(obj), "starting")
 
     def remove_starting_object(self, obj):
         """Remove object `obj` from the list of starting objects."""
@@ -1368,6 +1788,8 @@ class TimePoint(ComparableMixin):
             except ValueError:
                 # don't complain if the object isn't in starting_objects
                 pass
+            if self._part is not None:
+                self._part._unindex_object(self, type(obj), "starting")
 
     def remove_ending_object(self, obj):
         """Remove object `obj` from the list of ending objects."""
@@ -1379,11 +1801,15 @@ class TimePoint(ComparableMixin):
             except ValueError:
                 # don't complain if the object isn't in ending_objects
                 pass
+            if self._part is not None:
+                self._part._unindex_object(self, type(obj), "ending")
 
     def add_ending_object(self, obj):
         """Add object `obj` to the list of ending objects."""
         obj.end = self
         self.ending_objects[type(obj)].add(obj)
+        if self._part is not None:
+            self._part._index_object(self, type(obj), "ending")
 
     def iter_starting(self, cls, include_subclasses=False):
         """Iterate over all objects of type `cls` that start at this
@@ -1403,10 +1829,13 @@ class TimePoint(ComparableMixin):
             Instance of type `cls`
 
         """
-        yield from self.starting_objects[cls]
+        objects = self.starting_objects
+        if cls in objects:
+            yield from objects[cls]
         if include_subclasses:
             for subcls in iter_subclasses(cls):
-                yield from self.starting_objects[subcls]
+                if subcls in objects:
+                    yield from objects[subcls]
 
     def iter_ending(self, cls, include_subclasses=False):
         """Iterate over all objects of type `cls` that end at this
@@ -1426,10 +1855,13 @@ class TimePoint(ComparableMixin):
             Instance of type `cls`
 
         """
-        yield from self.ending_objects[cls]
+        objects = self.ending_objects
+        if cls in objects:
+            yield from objects[cls]
         if include_subclasses:
             for subcls in iter_subclasses(cls):
-                yield from self.ending_objects[subcls]
+                if subcls in objects:
+                    yield from objects[subcls]
 
     def iter_prev(self, cls, eq=False, include_subclasses=False):
         """Iterate backwards in time from the current timepoint over
@@ -1605,6 +2037,34 @@ class TimedObject(ReplaceRefMixin):
             return self.end.t - self.start.t
 
 
+class _NoteArrayAttribute(object):
+    """An attribute of notes that appears in note arrays (directly, or
+    through the pitch, the tied duration or the list of tied notes).
+    Setting it on a note in a part marks the part as modified, so that
+    its cached note array is recomputed (see :meth:`Part.note_array`).
+
+    The value is stored in the `__dict__` of the note under the same
+    name."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        state = obj.__dict__
+        state[self.name] = value
+        start = state.get("start")
+        if start is not None and start._part is not None:
+            start._part.touch()
+
+
 class GenericNote(TimedObject):
     """Represents the common aspects of notes, rests, and unpitched
     notes.
@@ -1629,6 +2089,17 @@ class GenericNote(TimedObject):
 
     """
 
+    id = _NoteArrayAttribute()
+    voice = _NoteArrayAttribute()
+    staff = _NoteArrayAttribute()
+    tie_prev = _NoteArrayAttribute()
+    tie_next = _NoteArrayAttribute()
+    # pitch spelling of notes, and type of grace notes
+    step = _NoteArrayAttribute()
+    alter = _NoteArrayAttribute()
+    octave = _NoteArrayAttribute()
+    grace_type = _NoteArrayAttribute()
+
     def __init__(
         self,
         id=None,
@@ -3335,6 +3806,8 @@ class PartGroup(object):
         self.parent = None
         self.id = id
         self.children = []
+        # last computed note array (see `note_array`)
+        self._note_array_cache = None
 
     def _pp(self, tree):
         result = [
@@ -3371,10 +3844,17 @@ class PartGroup(object):
         ids in this array include the number of the part to which they
         belong.
 
+        The note array is cached until any of the parts in the group
+        changes.
+
         See Part.note_array()
 
         """
-        return note_array_from_part_list(self.children, *args, **kwargs)
+        key = (_part_list_key(self.children), args, kwargs)
+        if self._note_array_cache is None or self._note_array_cache[0] != key:
+            note_array = note_array_from_part_list(self.children, *args, **kwargs)
+            self._note_array_cache = (key, note_array)
+        return self._note_array_cache[1].copy()
 
     def rest_array(self, *args, **kwargs):
         """A structured array containing pitch, onset, duration, voice
@@ -3502,6 +3982,9 @@ class Score(object):
                 f" is {type(partlist)}."
             )
 
+        # last computed note array (see `note_array`)
+        self._note_array_cache = None
+
     def __getitem__(self, index: int) -> Part:
         """Get `Part in the score by index"""
         return self.parts[index]
@@ -3543,9 +4026,11 @@ class Score(object):
         """
         Get a note array that concatenates the note arrays of all Part/PartGroup
         objects in the score.
+
+        The note array is cached until any of the parts in the score
+        changes.
         """
-        return note_array_from_part_list(
-            part_list=self.parts,
+        options = dict(
             unique_id_per_part=unique_id_per_part,
             include_pitch_spelling=include_pitch_spelling,
             include_key_signature=include_key_signature,
@@ -3556,6 +4041,11 @@ class Score(object):
             include_divs_per_quarter=include_divs_per_quarter,
             **kwargs,
         )
+        key = (_part_list_key(self.parts), options)
+        if self._note_array_cache is None or self._note_array_cache[0] != key:
+            note_array = note_array_from_part_list(part_list=self.parts, **options)
+            self._note_array_cache = (key, note_array)
+        return self._note_array_cache[1].copy()
 
 
 # Alias for typing score-like objects
@@ -3795,6 +4285,9 @@ def add_measures(part):
                 pos = measure_end
                 mcounter += 1
 
+    # existing measures may have been renumbered
+    part.touch()
+
 
 def remove_grace_notes(part):
     """Remove all grace notes from a timeline.
@@ -3828,6 +4321,12 @@ def expand_grace_notes(part):
         part.add(gn, end=gn.start.t + int(np.round(dur)))
 
 
+def _part_list_key(partlist):
+    # Identify the parts in `partlist` and their versions, to check
+    # whether values computed from the parts are still valid
+    return tuple((id(part), part.version) for part in iter_parts(partlist))
+
+
 def iter_parts(partlist):
     """Iterate over all Part instances in partlist, which is a list of
     either Part or PartGroup instances. PartGroup instances contain
@@ -4274,6 +4773,8 @@ def sanitize_part(part, tie_tolerance=0):
                     tn.tie_next = None
                     tn.tie_prev = None
 
+    part.touch()
+
     warnings.warn(
         "part_sanitize removed {} incomplete tuplets, "
         "{} incomplete slurs, {} incomplete grace, "
@@ -4305,6 +4806,7 @@ def assign_note_ids(parts, keep=False):
                     n.id = "p{0}r{1}".format(p, ni) if n.id is None else n.id
                 else:
                     n.id = "p{0}n{1}".format(p, ni) if n.id is None else n.id
+            part.touch()
 
     else:
         # assign note ids to ensure uniqueness across all parts, discarding any
@@ -4319,6 +4821,7 @@ def assign_note_ids(parts, keep=False):
                 else:
                     n.id = "n{}".format(ni)
                     ni += 1
+            part.touch()
 
 
 class Segment(TimedObject):
@@ -5128,9 +5631,10 @@ def unfold_part_alignment(part, alignment):
     ----------
     part : :class:`Part`
         The Part to unfold.
-    alignment : list of dictionaries
+    alignment : list of dictionaries or Alignment
         List of dictionaries containing an alignment (like the ones
-        obtained from a MatchFile (see `alignment_from_matchfile`).
+        obtained from a MatchFile (see `alignment_from_matchfile`), or
+        an `Alignment`.
 
     Returns
     -------
@@ -5141,11 +5645,14 @@ def unfold_part_alignment(part, alignment):
 
     unfolded_parts = []
 
-    alignment_ids = []
-
-    for n in alignment:
-        if n["label"] == "match" or n["label"] == "deletion":
-            alignment_ids.append(n["score_id"])
+    if isinstance(alignment, Alignment):
+        alignment_ids = alignment.array["score_id"][alignment.mask("match", "deletion")]
+    else:
+        alignment_ids = [
+            n["score_id"]
+            for n in alignment
+            if n["label"] == "match" or n["label"] == "deletion"
+        ]
 
     score_variants = make_score_variants(part)
 
@@ -5155,8 +5662,9 @@ def unfold_part_alignment(part, alignment):
         u_part = sv.create_variant_part()
         update_note_ids_after_unfolding(u_part)
         unfolded_parts.append(u_part)
-        u_part_ids = [n.id for n in u_part.notes_tied]
-        unfolded_part_length[j] = len(u_part_ids)
+        u_part_notes = u_part.notes_tied
+        u_part_ids = set(n.id for n in u_part_notes)
+        unfolded_part_length[j] = len(u_part_notes)
         for i, aid in enumerate(alignment_ids):
             alignment_score_ids[i, j] = aid in u_part_ids
 
@@ -5168,7 +5676,13 @@ def unfold_part_alignment(part, alignment):
         best_idx = best_idx[unfolded_part_length[best_idx].argmin()]
 
     # append "-1" to alignment if the score_id's in alignment
-    if not any(["-1" in al.get("score_id", "") for al in alignment]):
+    if isinstance(alignment, Alignment):
+        score_ids = alignment.array["score_id"]
+        if not np.any(np.char.find(score_ids, "-1") >= 0):
+            alignment.set_ids(
+                score_ids=np.where(score_ids != "", np.char.add(score_ids, "-1"), "")
+            )
+    elif not any(["-1" in al.get("score_id", "") for al in alignment]):
         for n in alignment:
             if "score_id" in n:
                 n["score_id"] = f"{n['score_id']}-1"
@@ -5487,6 +6001,8 @@ def merge_parts(parts, reassign="voice"):
                 new_part.add(e, start=new_start, end=new_end)
 
                 # new_part.add(copy.deepcopy(e), start=new_start, end=new_end)
+        # voices/staves of the objects in the original part may have changed
+        p.touch()
     return new_part
 
 
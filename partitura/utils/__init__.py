@@ -14,6 +14,7 @@ from partitura.utils.generic import (
     PrettyPrintTree,
     find_nearest,
     add_field,
+    set_string_field,
     show_diff,
     search,
     _OrderedSet,
@@ -34,6 +35,7 @@ from partitura.utils.music import (
     ensure_notearray,
     compute_pianoroll,
     compute_pitch_class_pianoroll,
+    iter_pianoroll_windows,
     pianoroll_to_notearray,
     match_note_arrays,
     key_mode_to_int,
@@ -42,6 +44,7 @@ from partitura.utils.music import (
     slice_notearray_by_time,
     note_array_from_part,
     note_array_from_note_list,
+    project_note_array,
     get_time_units_from_note_array,
     update_note_ids_after_unfolding,
     note_name_to_pitch_spelling,
@@ -52,6 +55,7 @@ from partitura.utils.music import (
     ensure_rest_array,
     rest_array_from_part_list,
 )
+from partitura.utils.alignment import Alignment, ensure_alignment
 from partitura.utils.synth import synthesize
 
 from partitura.utils.misc import (
@@ -69,6 +73,7 @@ __all__ = [
     "ensure_rest_array",
     "compute_pianoroll",
     "compute_pitch_class_pianoroll",
+    "iter_pianoroll_windows",
     "pianoroll_to_notearray",
     "slice_notearray_by_time",
     "key_name_to_fifths_mode",
@@ -80,4 +85,6 @@ __all__ = [
     "PrettyPrintTree",
     "synthesize",
     "normalize",
+    "Alignment",
+    "ensure_alignment",
 ]
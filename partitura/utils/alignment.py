@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains a columnar representation of score-to-performance
+note alignments.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from partitura.utils.music import _string_column
+
+__all__ = ["Alignment", "ensure_alignment", "lookup_note_ids"]
+
+#: Labels of the alignment entries. The position of a label is its code
+#: (match = 0, deletion = 1, insertion = 2, as in Parangonada files).
+#: Entries with other labels get the code -1.
+ALIGNMENT_LABELS = ("match", "deletion", "insertion", "ornament")
+
+LABEL_CODES = dict((label, code) for code, label in enumerate(ALIGNMENT_LABELS))
+
+# keys of the alignment dictionaries stored in the columns
+COLUMN_KEYS = ("label", "score_id", "performance_id")
+
+
+def lookup_note_ids(note_ids: np.ndarray, query_ids: Iterable) -> np.ndarray:
+    """
+    Get the indices of note ids in an array of note ids.
+
+    The ids are sorted once and looked up with a binary search, so that
+    aligning large note arrays takes O(n log n) time instead of
+    comparing every id of the alignment with every id of the note array.
+
+    Parameters
+    ----------
+    note_ids : np.ndarray
+        The ids of the notes (e.g., the `id` field of a note array).
+    query_ids : array_like
+        The ids to look up.
+
+    Returns
+    -------
+    idxs : np.ndarray
+        An integer array with the index in `note_ids` of each id in
+        `query_ids` (the first one, if an id appears several times), or
+        -1 for ids that are not in `note_ids`.
+    """
+    note_ids = np.asarray(note_ids)
+    query_ids = np.asarray(query_ids)
+    idxs = np.full(len(query_ids), -1, dtype=int)
+    if len(note_ids) == 0 or len(query_ids) == 0:
+        return idxs
+
+    sort_idx = np.argsort(note_ids, kind="stable")
+    sorted_ids = note_ids[sort_idx]
+    pos = np.searchsorted(sorted_ids, query_ids, side="left")
+    pos = np.minimum(pos, len(sorted_ids) - 1)
+    found = sorted_ids[pos] == query_ids
+    idxs[found] = sort_idx[pos[found]]
+    return idxs
+
+
+class Alignment(object):
+    """
+    A score-to-performance note alignment stored as a structured array.
+
+    Each entry of the alignment is a row with the fields
+
+    * `label`: code of the label of the entry (see `ALIGNMENT_LABELS`)
+    * `score_id`: id of the score note ("" for insertions)
+    * `performance_id`: id of the performed note ("" for deletions)
+    * `score_idx`: index of the score note in a note array, or -1
+    * `performance_idx`: index of the performed note in a note array,
+      or -1
+
+    The index columns are only filled by `Alignment.index`. Iterating
+    over an alignment yields the entries as dictionaries, so that an
+    `Alignment` can be used wherever a list of note alignment
+    dictionaries is expected (see `note_alignment_from_matchfile`).
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Structured array with the fields above.
+    extra : dict or None, optional
+        Additional keys of the entries (e.g., the `type` of ornaments),
+        as a dictionary mapping row indices to dictionaries.
+
+    Examples
+    --------
+    >>> alignment = Alignment.from_dicts(
+    ...     [
+    ...         dict(label="match", score_id="n1", performance_id="0"),
+    ...         dict(label="insertion", performance_id="1"),
+    ...     ]
+    ... )
+    >>> alignment.labels
+    array(['match', 'insertion'], dtype='<U9')
+    >>> alignment.to_dicts()[1]
+    {'label': 'insertion', 'performance_id': '1'}
+    """
+
+    def __init__(
+        self, array: np.ndarray, extra: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> None:
+        self.array = array
+        self.extra = dict() if extra is None else extra
+
+    @classmethod
+    def from_arrays(
+        cls,
+        labels: Iterable,
+        score_ids: Optional[Iterable] = None,
+        performance_ids: Optional[Iterable] = None,
+    ) -> "Alignment":
+        """
+        Create an alignment from arrays of labels and note ids.
+
+        Parameters
+        ----------
+        labels : array_like
+            The labels of the entries, either as strings or as codes.
+        score_ids : array_like or None, optional
+            The ids of the score notes ("" for entries without a score
+            note). If None, no entry has a score note.
+        performance_ids : array_like or None, optional
+            The ids of the performed notes ("" for entries without a
+            performed note). If None, no entry has a performed note.
+
+        Returns
+        -------
+        alignment : Alignment
+            The alignment.
+        """
+        labels = np.asarray(labels)
+        if labels.dtype.kind in "US":
+            labels = labels.tolist()
+            codes = np.array(
+                [LABEL_CODES.get(label, -1) for label in labels], dtype="i1"
+            )
+            extra = dict(
+                (i, dict(label=labels[i])) for i in np.flatnonzero(codes < 0).tolist()
+            )
+        else:
+            codes = labels.astype("i1")
+            extra = None
+
+        if score_ids is None:
+            score_ids = [""] * len(codes)
+        if performance_ids is None:
+            performance_ids = [""] * len(codes)
+
+        score_ids = _string_column(score_ids)
+        performance_ids = _string_column(performance_ids)
+
+        array = np.empty(
+            len(codes),
+            dtype=[
+                ("label", "i1"),
+                ("score_id", score_ids.dtype),
+                ("performance_id", performance_ids.dtype),
+                ("score_idx", "i8"),
+                ("performance_idx", "i8"),
+            ],
+        )
+        array["label"] = codes
+        array["score_id"] = score_ids
+        array["performance_id"] = performance_ids
+        array["score_idx"] = -1
+        array["performance_idx"] = -1
+        return cls(array, extra)
+
+    @classmethod
+    def from_dicts(cls, alignment: Iterable[dict]) -> "Alignment":
+        """
+        Create an alignment from a list of note alignment dictionaries.
+
+        Note ids are stored as strings.
+
+        Parameters
+        ----------
+        alignment : list of dict
+            The note alignment dictionaries (see
+            `partitura.io.importmatch.note_alignment_from_matchfile`).
+
+        Returns
+        -------
+        alignment : Alignment
+            The alignment.
+        """
+        labels = []
+        score_ids = []
+        performance_ids = []
+        extra = dict()
+        for i, al in enumerate(alignment):
+            labels.append(al["label"])
+            score_ids.append(al.get("score_id", ""))
+            performance_ids.append(al.get("performance_id", ""))
+            n_columns = 1 + ("score_id" in al) + ("performance_id" in al)
+            if len(al) > n_columns:
+                extra[i] = dict(
+                    (key, value) for key, value in al.items() if key not in COLUMN_KEYS
+                )
+
+        alignment = cls.from_arrays(
+            np.array(labels, dtype=str), score_ids, performance_ids
+        )
+        for i, other in extra.items():
+            alignment.extra.setdefault(i, dict()).update(other)
+        return alignment
+
+    def to_dicts(self) -> List[dict]:
+        """
+        Convert the alignment to a list of note alignment dictionaries.
+
+        Returns
+        -------
+        alignment : list of dict
+            The note alignment dictionaries. Entries without a score
+            (performed) note have no `score_id` (`performance_id`) key.
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self) -> Iterator[dict]:
+        rows = zip(
+            self.array["label"].tolist(),
+            self.array["score_id"].tolist(),
+            self.array["performance_id"].tolist(),
+        )
+        for i, (code, score_id, performance_id) in enumerate(rows):
+            al = dict(label=ALIGNMENT_LABELS[code] if code >= 0 else None)
+            if score_id != "":
+                al["score_id"] = score_id
+            if performance_id != "":
+                al["performance_id"] = performance_id
+            if i in self.extra:
+                al.update(self.extra[i])
+            yield al
+
+    def __getitem__(
+        self, key: Union[int, slice, np.ndarray]
+    ) -> Union[dict, "Alignment"]:
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("alignment index out of range")
+            return next(iter(self[key : key + 1]))
+
+        rows = np.arange(len(self))[key]
+        extra = dict(
+            (new, self.extra[old])
+            for new, old in enumerate(rows.tolist())
+            if old in self.extra
+        )
+        return Alignment(self.array[key], extra)
+
+    def __repr__(self) -> str:
+        return "<Alignment: {0} entries>".format(len(self))
+
+    @property
+    def labels(self) -> np.ndarray:
+        """
+        The labels of the entries as strings.
+        """
+        labels = np.array(ALIGNMENT_LABELS + ("",), dtype=object)
+        labels = labels[self.array["label"]]
+        for i, other in self.extra.items():
+            if "label" in other:
+                labels[i] = other["label"]
+        return labels.astype(str)
+
+    def mask(self, *labels: str) -> np.ndarray:
+        """
+        Boolean mask of the entries with the given labels.
+
+        Parameters
+        ----------
+        *labels : str
+            The labels (e.g., "match" or "deletion").
+
+        Returns
+        -------
+        mask : np.ndarray
+            Boolean array that is True for the entries with one of the
+            labels.
+        """
+        return np.isin(self.array["label"], [LABEL_CODES[label] for label in labels])
+
+    def set_ids(
+        self,
+        score_ids: Optional[Iterable] = None,
+        performance_ids: Optional[Iterable] = None,
+    ) -> None:
+        """
+        Replace the note ids of the entries in place.
+
+        Parameters
+        ----------
+        score_ids : array_like or None, optional
+            The new ids of the score notes. If None, they are not
+            changed.
+        performance_ids : array_like or None, optional
+            The new ids of the performed notes. If None, they are not
+            changed.
+        """
+        score_ids = self.array["score_id"] if score_ids is None else score_ids
+        performance_ids = (
+            self.array["performance_id"] if performance_ids is None else performance_ids
+        )
+        new = Alignment.from_arrays(self.array["label"], score_ids, performance_ids)
+        new.array["score_idx"] = self.array["score_idx"]
+        new.array["performance_idx"] = self.array["performance_idx"]
+        self.array = new.array
+
+    def index(
+        self,
+        score_note_array: Optional[np.ndarray] = None,
+        performance_note_array: Optional[np.ndarray] = None,
+    ) -> "Alignment":
+        """
+        Fill the index columns of the alignment with the positions of
+        the notes in note arrays.
+
+        Parameters
+        ----------
+        score_note_array : np.ndarray or None, optional
+            The note array of the score. If None, the `score_idx`
+            column is not changed.
+        performance_note_array : np.ndarray or None, optional
+            The note array of the performance. If None, the
+            `performance_idx` column is not changed.
+
+        Returns
+        -------
+        alignment : Alignment
+            A copy of the alignment with the index columns filled. Ids
+            that are not in the note arrays get the index -1.
+        """
+        array = self.array.copy()
+        if score_note_array is not None:
+            array["score_idx"] = lookup_note_ids(
+                score_note_array["id"], array["score_id"]
+            )
+        if performance_note_array is not None:
+            array["performance_idx"] = lookup_note_ids(
+                performance_note_array["id"], array["performance_id"]
+            )
+        return Alignment(array, dict(self.extra))
+
+
+def ensure_alignment(alignment: Union[Alignment, Iterable[dict]]) -> Alignment:
+    """
+    Ensures to get an `Alignment` from a list of note alignment
+    dictionaries or an `Alignment`.
+
+    Parameters
+    ----------
+    alignment : Alignment or list of dict
+        The score-to-performance note alignment.
+
+    Returns
+    -------
+    alignment : Alignment
+        The alignment (the same object if it is already an `Alignment`).
+    """
+    if isinstance(alignment, Alignment):
+        return alignment
+    return Alignment.from_dicts(alignment)
@@ -397,6 +397,45 @@ adding-a-field-to-a-structured-numpy-array
     return b
 
 
+def set_string_field(a, name, values):
+    """
+    Set the values of a string field of a structured array, widening
+    the field if the new values do not fit in its current dtype.
+
+    Parameters
+    ----------
+    a: np.ndarray
+        A structured numpy array
+    name: str
+        The name of a string field of `a`
+    values: array_like
+        The new values of the field
+
+    Returns
+    -------
+    np.ndarray
+        `a` with the new values if they fit in the field, otherwise a
+        copy of `a` in which the field has been widened.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> sa = np.array([(1, 'n1'), (2, 'n2')], dtype=[('pitch', int), ('id', 'U2')])
+    >>> sb = set_string_field(sa, 'id', ['P00_n1', 'P00_n2'])
+    >>> sb.dtype['id']
+    dtype('<U6')
+    >>> list(sb['id'])
+    ['P00_n1', 'P00_n2']
+    """
+    values = np.asarray(values, dtype=str)
+    if values.dtype.itemsize > a.dtype[name].itemsize:
+        a = a.astype(
+            [(n, values.dtype if n == name else a.dtype[n]) for n in a.dtype.names]
+        )
+    a[name] = values
+    return a
+
+
 def sorted_dict_items(items, key=None):
     for item in sorted(items, key=key):
         yield item
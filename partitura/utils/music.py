@@ -9,14 +9,30 @@ from collections import defaultdict
 import re
 import warnings
 import numpy as np
+from numpy.lib.recfunctions import repack_fields
 from scipy.interpolate import interp1d
-from scipy.sparse import csc_matrix
-from typing import Union, Callable, Optional, TYPE_CHECKING, Tuple, Dict, Any, List
-from partitura.utils.generic import find_nearest, search, iter_current_next
+from scipy.sparse import csc_matrix, issparse
+from typing import (
+    Union,
+    Callable,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Dict,
+    Any,
+    List,
+    Iterable,
+)
+from partitura.utils.generic import (
+    find_nearest,
+    search,
+    iter_current_next,
+    set_string_field,
+)
 from partitura.utils.globals import *
 import partitura
-from tempfile import TemporaryDirectory
-import os, math
+from io import BytesIO
+import math
 
 
 try:
@@ -68,7 +84,7 @@ def ensure_notearray(notearray_or_part, *args, **kwargs):
             raise ValueError("Input array is not a structured array!")
 
     elif isinstance(notearray_or_part, Part):
-        return note_array_from_part(notearray_or_part, *args, **kwargs)
+        return notearray_or_part.note_array(*args, **kwargs)
 
     elif isinstance(notearray_or_part, PartGroup):
         return note_array_from_part_list(notearray_or_part.children, *args, **kwargs)
@@ -309,6 +325,7 @@ def transpose(score: ScoreLike, interval: Interval) -> ScoreLike:
     elif isinstance(score, s.Part):
         for note in score.notes_tied:
             _transpose_note_inplace(note, interval)
+        score.touch()
     return new_score
 
 
@@ -1103,7 +1120,38 @@ def compute_pianoroll(
 
     """
     note_array = ensure_notearray(note_info)
+    pr_input, time_div = _pianoroll_input(
+        note_array, time_unit=time_unit, time_div=time_div, remove_drums=remove_drums
+    )
+
+    return _make_pianoroll(
+        note_info=pr_input,
+        time_div=time_div,
+        onset_only=onset_only,
+        note_separation=note_separation,
+        pitch_margin=pitch_margin,
+        time_margin=time_margin,
+        return_idxs=return_idxs,
+        piano_range=piano_range,
+        remove_silence=remove_silence,
+        end_time=end_time,
+        binary=binary,
+    )
 
+
+def _pianoroll_input(
+    note_array: np.ndarray,
+    time_unit: str = "auto",
+    time_div: Union[str, int] = "auto",
+    remove_drums: bool = True,
+) -> Tuple[np.ndarray, int]:
+    # non-public
+    """
+    Get the (pitch, onset, duration[, velocity]) array used by
+    `_make_pianoroll` from a note array, together with the resolved
+    `time_div`. See `compute_pianoroll` for a description of the
+    arguments of this function.
+    """
     if time_unit not in TIME_UNITS + ["auto"]:
         raise ValueError(
             "`time_unit` must be one of "
@@ -1139,19 +1187,7 @@ def compute_pianoroll(
         [note_array[field].astype(float) for field in piano_roll_fields]
     )
 
-    return _make_pianoroll(
-        note_info=pr_input,
-        time_div=time_div,
-        onset_only=onset_only,
-        note_separation=note_separation,
-        pitch_margin=pitch_margin,
-        time_margin=time_margin,
-        return_idxs=return_idxs,
-        piano_range=piano_range,
-        remove_silence=remove_silence,
-        end_time=end_time,
-        binary=binary,
-    )
+    return pr_input, time_div
 
 
 def _make_pianoroll(
@@ -1176,6 +1212,65 @@ def _make_pianoroll(
     arguments of this function.
 
     """
+    idx_fill, (M, N), pr_idx = _pianoroll_cells(
+        note_info=note_info,
+        onset_only=onset_only,
+        pitch_margin=pitch_margin,
+        time_margin=time_margin,
+        time_div=time_div,
+        note_separation=note_separation,
+        remove_silence=remove_silence,
+        min_time=min_time,
+        end_time=end_time,
+    )
+
+    if binary:
+        # binarize piano roll
+        idx_fill[idx_fill[:, 2] != 0, 2] = 1
+
+    # Fill piano roll
+    pianoroll = csc_matrix(
+        (idx_fill[:, 2], (idx_fill[:, 0], idx_fill[:, 1])), shape=(M, N), dtype=int
+    )
+
+    if piano_range:
+        pianoroll = pianoroll[21:109, :]
+        pr_idx[:, 0] -= 21
+
+    if return_idxs:
+        return pianoroll, pr_idx
+    else:
+        return pianoroll
+
+
+def _pianoroll_cells(
+    note_info: np.ndarray,
+    onset_only: bool = False,
+    pitch_margin: int = -1,
+    time_margin: int = 0,
+    time_div: int = 8,
+    note_separation: bool = True,
+    remove_silence: bool = True,
+    min_time: Optional[float] = None,
+    end_time: Optional[int] = None,
+) -> Tuple[np.ndarray, Tuple[int, int], np.ndarray]:
+    # non-public
+    """
+    Compute the non-zero cells of a piano roll without building the
+    piano roll itself. See `compute_pianoroll` for a description of the
+    arguments of this function.
+
+    Returns
+    -------
+    idx_fill : np.ndarray
+        Float array with one (row, column, velocity) triplet per
+        non-zero cell, sorted by row and then by column.
+    shape : (int, int)
+        Shape of the (full) piano roll.
+    pr_idx : np.ndarray
+        Indices of the notes in the piano roll (see the `pr_idx`
+        output of `compute_pianoroll`).
+    """
 
     # Get pitch, onset, offset from the note_info array
     pr_pitch = note_info[:, 0]
@@ -1207,6 +1302,7 @@ def _make_pianoroll(
     pr_pitch = pr_pitch[idx]
     onset = onset[idx]
     duration = duration[idx]
+    pr_velocity = pr_velocity[idx]
 
     if min_time is None:
         min_time = 0 if min(onset) >= 0 else min(onset)
@@ -1254,56 +1350,42 @@ def _make_pianoroll(
 
     # Determine the non-zero indices of the piano roll
     if onset_only:
-        _idx_fill = np.column_stack([pr_pitch, pr_onset, pr_velocity])
+        fill_rows = pr_pitch.astype(int)
+        fill_cols = pr_onset
+        fill_vels = pr_velocity
     else:
         pr_offset = np.maximum(pr_onset + 1, pr_offset - (1 if note_separation else 0))
-        _idx_fill = np.vstack(
-            [
-                np.column_stack(
-                    (
-                        np.zeros(off - on) + pitch,
-                        np.arange(on, off),
-                        np.zeros(off - on) + vel,
-                    )
-                )
-                for on, off, pitch, vel in zip(
-                    pr_onset, pr_offset, pr_pitch, pr_velocity
-                )
-            ]
+        # one cell per frame in which each note is active
+        n_frames = pr_offset - pr_onset
+        first_cell = np.cumsum(n_frames) - n_frames
+        fill_rows = np.repeat(pr_pitch, n_frames).astype(int)
+        fill_cols = np.arange(n_frames.sum()) + np.repeat(
+            pr_onset - first_cell, n_frames
         )
+        fill_vels = np.repeat(pr_velocity, n_frames)
+
+    # Fix multiple notes with the same pitch and onset (keep the
+    # maximal velocity in each cell)
+    cell_order = np.lexsort((fill_cols, fill_rows))
+    fill_rows = fill_rows[cell_order]
+    fill_cols = fill_cols[cell_order]
+    cell_starts = np.flatnonzero(
+        np.r_[True, (np.diff(fill_rows) != 0) | (np.diff(fill_cols) != 0)]
+    )
+    idx_fill = np.column_stack(
+        (
+            fill_rows[cell_starts],
+            fill_cols[cell_starts],
+            np.maximum.reduceat(fill_vels[cell_order], cell_starts),
+        )
+    ).astype(float)
 
-    # Fix multiple notes with the same pitch and onset
-    fill_dict = defaultdict(list)
-    for row, col, vel in _idx_fill:
-        key = (int(row), int(col))
-        fill_dict[key].append(vel)
-
-    idx_fill = np.zeros((len(fill_dict), 3))
-    for i, ((row, column), vel) in enumerate(fill_dict.items()):
-        idx_fill[i] = np.array([row, column, max(vel)])
-
-    if binary:
-        # binarize piano roll
-        idx_fill[idx_fill[:, 2] != 0, 2] = 1
-
-    # Fill piano roll
-    pianoroll = csc_matrix(
-        (idx_fill[:, 2], (idx_fill[:, 0], idx_fill[:, 1])), shape=(M, N), dtype=int
+    # indices of each note in the piano roll
+    pr_idx = np.column_stack([pr_pitch, pr_onset, pr_offset, note_info[idx, 0]]).astype(
+        int
     )
 
-    pr_idx_pitch_start = 0
-    if piano_range:
-        pianoroll = pianoroll[21:109, :]
-        pr_idx_pitch_start = 21
-
-    if return_idxs:
-        # indices of each note in the piano roll
-        pr_idx = np.column_stack(
-            [pr_pitch - pr_idx_pitch_start, pr_onset, pr_offset, note_info[idx, 0]]
-        ).astype(int)
-        return pianoroll, pr_idx[idx.argsort()]
-    else:
-        return pianoroll
+    return idx_fill, (M, N), pr_idx[idx.argsort()]
 
 
 def compute_pitch_class_pianoroll(
@@ -1429,6 +1511,267 @@ def compute_pitch_class_pianoroll(
     return pc_pianoroll
 
 
+def iter_pianoroll_windows(
+    note_infos: List[Union[np.ndarray, ScoreLike, PerformanceLike]],
+    window_size: int,
+    hop_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    time_unit: str = "auto",
+    time_div: Union[str, int] = "auto",
+    onset_only: bool = False,
+    note_separation: bool = False,
+    piano_range: bool = False,
+    pitch_class: bool = False,
+    normalize: bool = True,
+    remove_drums: bool = True,
+    remove_silence: bool = True,
+    binary: bool = False,
+    pad: bool = True,
+    return_positions: bool = False,
+):
+    """
+    Iterate over fixed-size piano roll windows of a collection of
+    pieces.
+
+    The windows are filled directly from the non-zero cells of the
+    piano roll of each piece, so that the full piano roll of a piece is
+    never built. Each window is identical to the corresponding slice
+    `compute_pianoroll(note_info, ...).toarray()[:, start:start + window_size]`
+    (or of `compute_pitch_class_pianoroll` if `pitch_class` is True).
+
+    Parameters
+    ----------
+    note_infos : list of np.ndarray, ScoreLike or PerformanceLike
+        The pieces (e.g., a list of note arrays, scores or performances).
+        Pieces without notes do not produce any window.
+    window_size : int
+        Number of time steps of each window.
+    hop_size : int, optional
+        Number of time steps between the starts of consecutive windows
+        of a piece. Defaults to `window_size` (i.e., non-overlapping
+        windows).
+    batch_size : int, optional
+        If given, the windows are yielded in batches, as 3D arrays of
+        size (`batch_size`, `pitch_range`, `window_size`). The last batch
+        may contain fewer windows. Batches can contain windows of
+        different pieces.
+    out : np.ndarray, optional
+        A preallocated 3D array of size (`batch_size`, `pitch_range`,
+        `window_size`) in which the batches are written. If
+        `batch_size` is None, it is set to the size of the first
+        dimension of `out`. The yielded batches are views of `out`, and
+        are overwritten by the next batch.
+    time_unit : ('auto', 'beat', 'quarter', 'div', 'sec')
+        The time unit to use for computing the piano roll (see
+        `compute_pianoroll`).
+    time_div : int, optional
+        How many sub-divisions for each time unit (see
+        `compute_pianoroll`).
+    onset_only : bool, optional
+        If True, code only the onsets of the notes, otherwise code
+        onset and duration.
+    note_separation : bool, optional
+        If True, the last frame of each note is left empty.
+    piano_range : bool, optional
+        If True, the pitch axis of the windows is in piano keys
+        instead of MIDI note numbers (and there are only 88 pitches).
+    pitch_class : bool, optional
+        If True, the windows are pitch class piano rolls with 12 rows
+        (see `compute_pitch_class_pianoroll`). `piano_range` is ignored.
+    normalize : bool, optional
+        If True (and `pitch_class` is True), each time step is
+        normalized to sum to one. Default is True.
+    remove_drums : bool, optional
+        If True, removes the drum track (i.e., channel 9) from the
+        notes to be considered in the piano roll.
+    remove_silence : bool, optional
+        If True, the first frame of each piece starts at the onset
+        of its first note, not at time 0 of the timeline.
+    binary: bool, optional
+        Ensure strictly binary windows.
+    pad : bool, optional
+        If True, the last window of each piece is padded with zeros
+        to cover the end of the piece. Otherwise, only windows that lie
+        completely within the piece are generated.
+    return_positions : bool, optional
+        If True, also yield the position of each window, as a tuple
+        (`piece_index`, `start_time_step`), or as an integer array
+        with one such row per window if `batch_size` or `out` are given.
+
+    Yields
+    ------
+    window : np.ndarray
+        A 2D array of size (`pitch_range`, `window_size`), or a 3D
+        array of size (`n_windows`, `pitch_range`, `window_size`) if
+        `batch_size` or `out` are given. The array is of type int, or
+        float if `pitch_class` is True (unless `out` is given).
+    positions : tuple or np.ndarray
+        Positions of the windows. Only yielded if `return_positions`
+        is True.
+
+    Examples
+    --------
+
+    >>> import numpy as np
+    >>> from partitura.utils import iter_pianoroll_windows
+    >>> note_array = np.array([(60, 0, 1), (62, 1, 2)],\
+                          dtype=[('pitch', 'i4'),\
+                                 ('onset_beat', 'f4'),\
+                                 ('duration_beat', 'f4')])
+    >>> windows = iter_pianoroll_windows([note_array], window_size=4, time_div=2)
+    >>> [w[[60, 62]] for w in windows]
+    [array([[1, 1, 0, 0],
+           [0, 0, 1, 1]]), array([[0, 0, 0, 0],
+           [1, 1, 0, 0]])]
+    """
+    window_size = int(window_size)
+    hop_size = window_size if hop_size is None else int(hop_size)
+    if window_size < 1 or hop_size < 1:
+        raise ValueError("`window_size` and `hop_size` must be positive")
+
+    if pitch_class:
+        n_pitches = 12
+    elif piano_range:
+        n_pitches = 88
+    else:
+        n_pitches = 128
+
+    dtype = float if pitch_class else int
+
+    if out is not None:
+        if batch_size is None:
+            batch_size = out.shape[0]
+        if out.shape != (batch_size, n_pitches, window_size):
+            raise ValueError(
+                "`out` must be of size {0}, but is of size {1}".format(
+                    (batch_size, n_pitches, window_size), out.shape
+                )
+            )
+    elif batch_size is not None:
+        out = np.zeros((batch_size, n_pitches, window_size), dtype=dtype)
+
+    n_batch = 0
+    positions = np.zeros((0 if out is None else len(out), 2), dtype=int)
+    for piece_idx, note_info in enumerate(note_infos):
+        pr_input, piece_time_div = _pianoroll_input(
+            ensure_notearray(note_info),
+            time_unit=time_unit,
+            time_div=time_div,
+            remove_drums=remove_drums,
+        )
+        if len(pr_input) == 0:
+            continue
+
+        idx_fill, (_, N), _ = _pianoroll_cells(
+            note_info=pr_input,
+            onset_only=onset_only,
+            time_div=piece_time_div,
+            note_separation=note_separation,
+            remove_silence=remove_silence,
+        )
+        rows, cols, vels = _window_cells(
+            idx_fill,
+            piano_range=piano_range,
+            pitch_class=pitch_class,
+            normalize=normalize,
+            binary=binary,
+        )
+
+        if pad:
+            n_windows = max(int(np.ceil((N - window_size) / hop_size)), 0) + 1
+        else:
+            n_windows = max((N - window_size) // hop_size + 1, 0)
+        starts = np.arange(n_windows) * hop_size
+        # cells are sorted by column, so that the cells of each window
+        # are a contiguous range
+        cell_starts = np.searchsorted(cols, starts)
+        cell_ends = np.searchsorted(cols, starts + window_size)
+
+        for start, i, j in zip(starts.tolist(), cell_starts, cell_ends):
+            if out is None:
+                window = np.zeros((n_pitches, window_size), dtype=dtype)
+                window[rows[i:j], cols[i:j] - start] = vels[i:j]
+                if return_positions:
+                    yield window, (piece_idx, start)
+                else:
+                    yield window
+                continue
+
+            window = out[n_batch]
+            window.fill(0)
+            window[rows[i:j], cols[i:j] - start] = vels[i:j]
+            positions[n_batch] = piece_idx, start
+            n_batch += 1
+            if n_batch == batch_size:
+                if return_positions:
+                    yield out, positions.copy()
+                else:
+                    yield out
+                n_batch = 0
+
+    if n_batch > 0:
+        if return_positions:
+            yield out[:n_batch], positions[:n_batch].copy()
+        else:
+            yield out[:n_batch]
+
+
+def _window_cells(
+    idx_fill: np.ndarray,
+    piano_range: bool = False,
+    pitch_class: bool = False,
+    normalize: bool = False,
+    binary: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # non-public
+    """
+    Get the rows, columns and values of the non-zero cells of a piano
+    roll (computed with `_pianoroll_cells`) sorted by column, following
+    the semantics of `compute_pianoroll` and
+    `compute_pitch_class_pianoroll`. See `iter_pianoroll_windows` for
+    a description of the arguments of this function.
+    """
+    rows = idx_fill[:, 0].astype(int)
+    cols = idx_fill[:, 1].astype(int)
+    # the values of the piano roll are integers
+    vels = idx_fill[:, 2].astype(int)
+
+    if pitch_class:
+        rows = np.mod(rows, 12)
+    elif piano_range:
+        in_range = (rows >= 21) & (rows < 109)
+        rows = rows[in_range] - 21
+        cols = cols[in_range]
+        vels = vels[in_range]
+
+    cell_order = np.lexsort((rows, cols))
+    rows = rows[cell_order]
+    cols = cols[cell_order]
+    vels = vels[cell_order]
+
+    if pitch_class and len(cols) > 0:
+        # add up the pitches of the same pitch class
+        cell_starts = np.flatnonzero(
+            np.r_[True, (np.diff(rows) != 0) | (np.diff(cols) != 0)]
+        )
+        rows = rows[cell_starts]
+        cols = cols[cell_starts]
+        vels = np.add.reduceat(vels, cell_starts).astype(float)
+
+    if binary:
+        vels[vels != 0] = 1
+
+    if pitch_class and normalize and len(cols) > 0:
+        col_starts = np.flatnonzero(np.r_[True, np.diff(cols) != 0])
+        norm_term = np.add.reduceat(vels, col_starts)
+        # avoid dividing by 0 if a slice is empty
+        norm_term[np.isclose(norm_term, 0)] = 1
+        vels = vels / np.repeat(norm_term, np.diff(np.r_[col_starts, len(cols)]))
+
+    return rows, cols, vels
+
+
 def pianoroll_to_notearray(pianoroll, time_div=8, time_unit="sec"):
     """Extract a structured note array from a piano roll.
 
@@ -1437,11 +1780,12 @@ def pianoroll_to_notearray(pianoroll, time_div=8, time_unit="sec"):
 
     Parameters
     ----------
-    pianoroll : array-like
+    pianoroll : array-like or sparse matrix
         2D array containing a piano roll. The first dimension is
         pitch, and the second is time. The value of each "pixel" in
         the piano roll is considered to be the MIDI velocity, and it
-        is supposed to be between 0 and 127.
+        is supposed to be between 0 and 127. Dense arrays and scipy
+        sparse matrices (e.g., CSR or CSC) are accepted.
     time_div : int
         How many sub-divisions for each time unit (see
         `notearray_to_pianoroll`).
@@ -1476,58 +1820,59 @@ def pianoroll_to_notearray(pianoroll, time_div=8, time_unit="sec"):
                 "The shape of the piano roll must be (128, n_time_steps) or"
                 f"(88, n_timesteps) but is {pianoroll.shape}"
             )
-    active_notes = {}
-    note_list = []
-    for ts in range(pianoroll.shape[1]):
-        active = pianoroll[:, ts].nonzero()[0]
-
-        del_notes = []
-        for note in active_notes:
-            if note not in active:
-                del_notes.append(note)
-
-        for note in del_notes:
-            note_list.append(active_notes.pop(note))
-
-        for note in active:
-            vel = int(pianoroll[note, ts])
-            if note not in active_notes:
-                active_notes[note] = [note, vel, ts, ts + 1]
-            else:
-                if vel != active_notes[note][1]:
-                    note_list.append(active_notes.pop(note))
-                    active_notes[note] = [note, vel, ts, ts + 1]
-                else:
-                    active_notes[note][-1] += 1
+    # active pixels, sorted by pitch and time
+    if issparse(pianoroll):
+        pianoroll = pianoroll.tocoo()
+        pianoroll.sum_duplicates()
+        nonzero = pianoroll.data != 0
+        pitch = pianoroll.row[nonzero]
+        frame = pianoroll.col[nonzero]
+        velocity = pianoroll.data[nonzero]
+        order = np.lexsort((frame, pitch))
+        pitch, frame, velocity = pitch[order], frame[order], velocity[order]
+    else:
+        pianoroll = np.asarray(pianoroll)
+        pitch, frame = np.nonzero(pianoroll)
+        velocity = pianoroll[pitch, frame]
+    velocity = velocity.astype(int)
+
+    note_array_dtype = [
+        ("pitch", "i4"),
+        (f"onset_{time_unit}", "f4"),
+        (f"duration_{time_unit}", "f4"),
+        ("velocity", "i4"),
+        ("id", "U256"),
+    ]
+    if len(pitch) == 0:
+        # no active pixels
+        return np.empty(0, dtype=note_array_dtype)
+
+    # a note starts at every active pixel that does not continue the
+    # previous one (same pitch, contiguous in time and same velocity)
+    note_start = np.ones(len(pitch), dtype=bool)
+    note_start[1:] = (
+        (pitch[1:] != pitch[:-1])
+        | (frame[1:] != frame[:-1] + 1)
+        | (velocity[1:] != velocity[:-1])
+    )
+    note_start = np.flatnonzero(note_start)
+    note_end = np.r_[note_start[1:], len(pitch)] - 1
 
-    remaining_active_notes = list(active_notes.keys())
-    for note in remaining_active_notes:
-        # append any note left
-        note_list.append(active_notes.pop(note))
+    pitch = pitch[note_start]
+    velocity = velocity[note_start]
+    onset = frame[note_start]
+    offset = frame[note_end] + 1
 
-    # Sort array lexicographically by onset, pitch, offset and velocity
-    note_list.sort(key=lambda x: (x[2], x[0], x[3], x[1]))
+    # Sort notes lexicographically by onset, pitch, offset and velocity
+    note_order = np.lexsort((velocity, offset, pitch, onset))
 
     # Create note array
-    note_array = np.array(
-        [
-            (
-                p + init_pitch,
-                float(on) / time_div,
-                float(off - on) / time_div,
-                np.round(vel),
-                f"n{i}",
-            )
-            for i, (p, vel, on, off) in enumerate(note_list)
-        ],
-        dtype=[
-            ("pitch", "i4"),
-            (f"onset_{time_unit}", "f4"),
-            (f"duration_{time_unit}", "f4"),
-            ("velocity", "i4"),
-            ("id", "U256"),
-        ],
-    )
+    note_array = np.empty(len(note_order), dtype=note_array_dtype)
+    note_array["pitch"] = pitch[note_order] + init_pitch
+    note_array[f"onset_{time_unit}"] = onset[note_order] / time_div
+    note_array[f"duration_{time_unit}"] = (offset - onset)[note_order] / time_div
+    note_array["velocity"] = velocity[note_order]
+    note_array["id"] = [f"n{i}" for i in range(len(note_order))]
 
     return note_array
 
@@ -1624,33 +1969,44 @@ def match_note_arrays(
     matched_idxs = []
     matched_note_idxs = []
 
-    # dictionary of lists. For each index of the target, get a list of the
-    # corresponding indices in the input
-    matched_target = defaultdict(list)
+    # For each target note (in onset order), find the position (in the
+    # onset-sorted input) of the matching input note, or -1 if there is
+    # none. Candidates are searched per pitch, in windows of the sorted
+    # input onsets found with `searchsorted`.
+    i_onsets = np.asarray(i_onsets, dtype=float)
+    t_onsets = np.asarray(t_onsets, dtype=float)
+    t_matches = np.full(len(t_onsets), -1, dtype=int)
+    for p in np.intersect1d(i_pitch, t_pitch):
+        # positions of the notes with pitch p (sorted by onset)
+        i_pos = np.flatnonzero(i_pitch == p)
+        t_pos = np.flatnonzero(t_pitch == p)
+        # candidate onset windows (between o - epsilon and o + epsilon)
+        i_pitch_onsets = i_onsets[i_pos]
+        window_start = np.searchsorted(
+            i_pitch_onsets, t_onsets[t_pos] - epsilon, side="left"
+        )
+        window_end = np.searchsorted(
+            i_pitch_onsets, t_onsets[t_pos] + epsilon, side="right"
+        )
+        has_candidates = window_end > window_start
+        t_matches[t_pos[has_candidates]] = i_pos[window_start[has_candidates]]
+
+        if check_duration:
+            # index of the note with the closest duration
+            for k in np.flatnonzero(window_end - window_start > 1):
+                candidates = i_pos[window_start[k] : window_end[k]]
+                m_idx = abs(i_duration[candidates] - t_duration[t_pos[k]]).argmin()
+                t_matches[t_pos[k]] = candidates[m_idx]
+
     # dictionary of lists. For each index of the input, get a list of the
     # corresponding indices in the target
     matched_input = defaultdict(list)
-    for t, (i, o, p) in enumerate(zip(t_sort_idx, t_onsets, t_pitch)):
-        # candidate onset idxs (between o - epsilon and o + epsilon)
-        coix = np.where(
-            np.logical_and(i_onsets >= o - epsilon, i_onsets <= o + epsilon)
-        )[0]
-        if len(coix) > 0:
-            # index of the note with the same pitch
-            cpix = np.where(i_pitch[coix] == p)[0]
-            if len(cpix) > 0:
-                m_idx = 0
-                # index of the note with the closest duration
-                if len(cpix) > 1 and check_duration:
-                    m_idx = abs(i_duration[coix[cpix]] - t_duration[t]).argmin()
-                # match notes
-                input_idx = int(i_sort_idx[coix[cpix[m_idx]]])
-                target_idx = i
-                # matched_idxs.append((input_idx, target_idx))
-                matched_input[input_idx].append(target_idx)
-                matched_target[target_idx].append(input_idx)
-
-    matched_target_idxs = []
+    for t in np.flatnonzero(t_matches >= 0):
+        input_idx = int(i_sort_idx[t_matches[t]])
+        target_idx = t_sort_idx[t]
+        matched_input[input_idx].append(target_idx)
+
+    matched_target_idxs = set()
     for inix, taix in matched_input.items():
         if len(taix) > 1:
             # For the case that there are multiple notes aligned to the input note
@@ -1673,10 +2029,10 @@ def match_note_arrays(
                     best_candidate_idx = 0
 
                 matched_idxs.append((inix, taix_to_consider[best_candidate_idx]))
-                matched_target_idxs.append(taix_to_consider[best_candidate_idx])
+                matched_target_idxs.add(taix_to_consider[best_candidate_idx])
         else:
             matched_idxs.append((inix, taix[0]))
-            matched_target_idxs.append(taix[0])
+            matched_target_idxs.add(taix[0])
     matched_idxs = np.array(matched_idxs)
 
     warnings.warn(
@@ -1774,6 +2130,57 @@ def remove_silence_from_performed_part(ppart):
         program["time"] = max(program["time"] - start_time, 0)
 
 
+# Fields that are added to note arrays by each of the optional
+# `include_*` arguments of `note_array_from_part`
+NOTE_ARRAY_OPTIONAL_FIELDS = {
+    "include_pitch_spelling": ("step", "alter", "octave"),
+    "include_key_signature": ("ks_fifths", "ks_mode"),
+    "include_time_signature": ("ts_beats", "ts_beat_type", "ts_mus_beats"),
+    "include_metrical_position": ("is_downbeat", "rel_onset_div", "tot_measure_div"),
+    "include_grace_notes": ("is_grace", "grace_type"),
+    "include_staff": ("staff",),
+    "include_divs_per_quarter": ("divs_pq",),
+}
+
+
+def project_note_array(note_array, **kwargs):
+    """
+    Select the fields of a note array computed with a set of
+    `include_*` options that correspond to a subset of those options.
+
+    Parameters
+    ----------
+    note_array : structured array
+        A note array as computed by `note_array_from_part`.
+    **kwargs : dict
+        The `include_*` options of `note_array_from_part` (see
+        `NOTE_ARRAY_OPTIONAL_FIELDS`). Fields belonging to options that
+        are not set to True are removed. If `compact_strings` is False,
+        the string fields are widened to `U256`.
+
+    Returns
+    -------
+    structured array
+        A copy of `note_array` with only the selected fields. The fields
+        are packed, so that the array is identical to a note array
+        computed with the given options.
+    """
+    excluded = set(
+        field
+        for option, fields in NOTE_ARRAY_OPTIONAL_FIELDS.items()
+        if not kwargs.get(option, False)
+        for field in fields
+    )
+    names = [name for name in note_array.dtype.names if name not in excluded]
+    if not kwargs.get("compact_strings", True):
+        dtype = [(name, note_array.dtype[name]) for name in names]
+        dtype = [(name, "U256" if dt.kind == "U" else dt) for name, dt in dtype]
+        return np.array(note_array[names], dtype=dtype)
+    if len(names) == len(note_array.dtype.names):
+        return note_array.copy()
+    return repack_fields(note_array[names])
+
+
 def note_array_from_part_list(
     part_list,
     unique_id_per_part=True,
@@ -1812,17 +2219,17 @@ def note_array_from_part_list(
             kwargs["include_divs_per_quarter"] = True
             is_score = True
             if isinstance(part, Part):
-                na = note_array_from_part(part, **kwargs)
+                na = part.note_array(**kwargs)
             elif isinstance(part, PartGroup):
                 na = note_array_from_part_list(
                     part.children, unique_id_per_part=unique_id_per_part, **kwargs
                 )
         elif isinstance(part, PerformedPart):
-            na = part.note_array()
+            na = part.note_array(compact_strings=kwargs.get("compact_strings", True))
         if unique_id_per_part and len(part_list) > 1:
             # Update id with part number
-            na["id"] = np.array(
-                ["P{0:02d}_".format(i) + nid for nid in na["id"]], dtype=na["id"].dtype
+            na = set_string_field(
+                na, "id", ["P{0:02d}_".format(i) + nid for nid in na["id"]]
             )
         note_array.append(na)
 
@@ -1930,8 +2337,8 @@ def rest_array_from_part_list(
                 )
         if unique_id_per_part:
             # Update id with part number
-            na["id"] = np.array(
-                ["P{0:02d}_".format(i) + nid for nid in na["id"]], dtype=na["id"].dtype
+            na = set_string_field(
+                na, "id", ["P{0:02d}_".format(i) + nid for nid in na["id"]]
             )
         rest_array.append(na)
 
@@ -2040,6 +2447,7 @@ def note_array_from_part(
     include_grace_notes=False,
     include_staff=False,
     include_divs_per_quarter=False,
+    compact_strings=True,
 ):
     """
     Create a structured array with note information
@@ -2082,6 +2490,10 @@ def note_array_from_part(
         If `True`,  include the number of divs (e.g. MIDI ticks,
         MusicXML ppq) per quarter note of the current part.
         Default is False
+    compact_strings : bool (optional)
+        If `True`, the string fields ('id', 'step' and 'grace_type')
+        are only as wide as their longest value. Otherwise they are
+        stored as `U256`. Default is True
 
     Returns
     -------
@@ -2144,8 +2556,8 @@ def note_array_from_part(
                  ('duration_div', '<i4'),
                  ('pitch', '<i4'),
                  ('voice', '<i4'),
-                 ('id', '<U256'),
-                 ('step', '<U256'),
+                 ('id', '<U3'),
+                 ('step', '<U1'),
                  ('alter', '<i4'),
                  ('octave', '<i4'),
                  ('ks_fifths', '<i4'),
@@ -2193,6 +2605,7 @@ def note_array_from_part(
         include_grace_notes=include_grace_notes,
         include_staff=include_staff,
         divs_per_quarter=divs_per_quarter,
+        compact_strings=compact_strings,
     )
 
     return note_array
@@ -2207,6 +2620,7 @@ def rest_array_from_part(
     include_grace_notes=False,
     include_staff=False,
     collapse=False,
+    compact_strings=True,
 ):
     """
     Create a structured array with rest information
@@ -2245,6 +2659,9 @@ def rest_array_from_part(
     collapse : bool (optional)
         If 'True', collapses consecutive rest onsets on the same voice, to a single rest of their combined duration.
         Default is False
+    compact_strings : bool (optional)
+        If `True`, the string fields are only as wide as their longest
+        value. Otherwise they are stored as `U256`. Default is True
 
     Returns
     -------
@@ -2277,11 +2694,26 @@ def rest_array_from_part(
         include_grace_notes=include_grace_notes,
         include_staff=include_staff,
         collapse=collapse,
+        compact_strings=compact_strings,
     )
 
     return rest_array
 
 
+def _string_column(values, compact_strings=True):
+    """
+    Array of strings for a string field of a note or rest array.
+    If `compact_strings` is True, the dtype is only as wide as the
+    longest string, otherwise it is `U256`.
+    """
+    values = [str(value) for value in values]
+    if compact_strings:
+        width = max([1] + [len(value) for value in values])
+    else:
+        width = 256
+    return np.array(values, dtype="U{0}".format(width))
+
+
 def note_array_from_note_list(
     note_list,
     beat_map=None,
@@ -2293,6 +2725,7 @@ def note_array_from_note_list(
     include_grace_notes=False,
     include_staff=False,
     divs_per_quarter=None,
+    compact_strings=True,
 ):
     """
     Create a structured array with note information
@@ -2340,7 +2773,10 @@ def note_array_from_note_list(
         The number of divs (e.g. MIDI ticks, MusicXML ppq) per quarter
         note of the current part.
         Default is None
-
+    compact_strings : bool (optional)
+        If `True`, the string fields ('id', 'step' and 'grace_type')
+        are only as wide as their longest value. Otherwise they are
+        stored as `U256`. Default is True
 
     Returns
     -------
@@ -2386,6 +2822,16 @@ def note_array_from_note_list(
             * 'staff' : number of note staff.
             * 'divs_pq' : number of parts per quarter note.
     """
+    note_list = list(note_list)
+
+    # string fields are built first, to know how wide they need to be
+    note_ids = _string_column([note.id for note in note_list], compact_strings)
+    if include_pitch_spelling:
+        steps = _string_column([note.step for note in note_list], compact_strings)
+    if include_grace_notes:
+        grace_types = _string_column(
+            [getattr(note, "grace_type", "") for note in note_list], compact_strings
+        )
 
     fields = []
     if beat_map is not None:
@@ -2399,16 +2845,16 @@ def note_array_from_note_list(
         ("duration_div", "i4"),
         ("pitch", "i4"),
         ("voice", "i4"),
-        ("id", "U256"),
+        ("id", note_ids.dtype),
     ]
 
     # fields for pitch spelling
     if include_pitch_spelling:
-        fields += [("step", "U256"), ("alter", "i4"), ("octave", "i4")]
+        fields += [("step", steps.dtype), ("alter", "i4"), ("octave", "i4")]
 
     # fields for pitch spelling
     if include_grace_notes:
-        fields += [("is_grace", "b"), ("grace_type", "U256")]
+        fields += [("is_grace", "b"), ("grace_type", grace_types.dtype)]
 
     # fields for key signature
     if key_signature_map is not None:
@@ -2433,74 +2879,67 @@ def note_array_from_note_list(
     if divs_per_quarter:
         fields += [("divs_pq", "i4")]
 
-    note_array = []
-    for note in note_list:
-        note_info = tuple()
-        note_on_div = note.start.t
-        note_off_div = note.start.t + note.duration_tied
-        note_dur_div = note_off_div - note_on_div
+    note_array = np.empty(len(note_list), dtype=fields)
 
-        if beat_map is not None:
-            note_on_beat, note_off_beat = beat_map([note_on_div, note_off_div])
-            note_dur_beat = note_off_beat - note_on_beat
+    # gather the raw onsets and offsets first, so that each map is
+    # evaluated only once on the full vector of times. The times are not
+    # cast to int before evaluating the maps, since timepoints can have
+    # non-integer times (e.g. in scores created from match files)
+    note_on_div = np.array([note.start.t for note in note_list])
+    note_off_div = note_on_div + np.array([note.duration_tied for note in note_list])
 
-            note_info += (note_on_beat, note_dur_beat)
+    note_array["onset_div"] = note_on_div
+    note_array["duration_div"] = note_off_div - note_on_div
+    note_array["pitch"] = [note.midi_pitch for note in note_list]
+    note_array["voice"] = [
+        note.voice if note.voice is not None else -1 for note in note_list
+    ]
+    note_array["id"] = note_ids
 
-        if quarter_map is not None:
-            note_on_quarter, note_off_quarter = quarter_map([note_on_div, note_off_div])
-            note_dur_quarter = note_off_quarter - note_on_quarter
+    if include_pitch_spelling:
+        note_array["step"] = steps
+        note_array["alter"] = [
+            note.alter if note.alter is not None else 0 for note in note_list
+        ]
+        note_array["octave"] = [note.octave for note in note_list]
 
-            note_info += (note_on_quarter, note_dur_quarter)
+    if include_grace_notes:
+        note_array["is_grace"] = [hasattr(note, "grace_type") for note in note_list]
+        note_array["grace_type"] = grace_types
 
-        note_info += (
-            note_on_div,
-            note_dur_div,
-            note.midi_pitch,
-            note.voice if note.voice is not None else -1,
-            note.id,
-        )
+    if include_staff:
+        note_array["staff"] = [note.staff if note.staff else 0 for note in note_list]
 
-        if include_pitch_spelling:
-            step = note.step
-            alter = note.alter if note.alter is not None else 0
-            octave = note.octave
+    if divs_per_quarter:
+        note_array["divs_pq"] = divs_per_quarter
 
-            note_info += (step, alter, octave)
+    if len(note_list) > 0:
+        if beat_map is not None:
+            note_on_beat = beat_map(note_on_div)
+            note_array["onset_beat"] = note_on_beat
+            note_array["duration_beat"] = beat_map(note_off_div) - note_on_beat
 
-        if include_grace_notes:
-            is_grace = hasattr(note, "grace_type")
-            if is_grace:
-                grace_type = note.grace_type
-            else:
-                grace_type = ""
-            note_info += (is_grace, grace_type)
+        if quarter_map is not None:
+            note_on_quarter = quarter_map(note_on_div)
+            note_array["onset_quarter"] = note_on_quarter
+            note_array["duration_quarter"] = quarter_map(note_off_div) - note_on_quarter
 
         if key_signature_map is not None:
-            fifths, mode = key_signature_map(note.start.t)
-
-            note_info += (fifths, mode)
+            key_signatures = np.asarray(key_signature_map(note_on_div))
+            note_array["ks_fifths"] = key_signatures[:, 0]
+            note_array["ks_mode"] = key_signatures[:, 1]
 
         if time_signature_map is not None:
-            beats, beat_type, mus_beats = time_signature_map(note.start.t)
-
-            note_info += (beats, beat_type, mus_beats)
+            time_signatures = np.asarray(time_signature_map(note_on_div))
+            note_array["ts_beats"] = time_signatures[:, 0]
+            note_array["ts_beat_type"] = time_signatures[:, 1]
+            note_array["ts_mus_beats"] = time_signatures[:, 2]
 
         if metrical_position_map is not None:
-            rel_onset_div, tot_measure_div = metrical_position_map(note.start.t)
-
-            is_downbeat = 1 if rel_onset_div == 0 else 0
-
-            note_info += (is_downbeat, rel_onset_div, tot_measure_div)
-
-        if include_staff:
-            note_info += ((note.staff if note.staff else 0),)
-
-        if divs_per_quarter:
-            note_info += (divs_per_quarter,)
-
-        note_array.append(note_info)
-
-    note_array = np.array(note_array, dtype=fields)
+            metrical_positions = np.asarray(metrical_position_map(note_on_div))
+            note_array["is_downbeat"] = metrical_positions[:, 0] == 0
+            note_array["rel_onset_div"] = metrical_positions[:, 0]
+            note_array["tot_measure_div"] = metrical_positions[:, 1]
 
     # Sanitize voice information
     no_voice_idx = np.where(note_array["voice"] == -1)[0]
@@ -2532,6 +2971,7 @@ def rest_array_from_rest_list(
     include_grace_notes=False,
     include_staff=False,
     collapse=False,
+    compact_strings=True,
 ):
     """
     Create a structured array with rest information
@@ -2578,6 +3018,9 @@ def rest_array_from_rest_list(
         If `True`, joins rests on consecutive onsets on the same voice and combines their durations.
         Keeps the id of the first one.
         Default is False
+    compact_strings : bool (optional)
+        If `True`, the string fields are only as wide as their longest
+        value. Otherwise they are stored as `U256`. Default is True
 
     Returns
     -------
@@ -2597,16 +3040,21 @@ def rest_array_from_rest_list(
         ("duration_div", "i4"),
         ("pitch", "i4"),
         ("voice", "i4"),
-        ("id", "U256"),
+        ("id", _string_column([rest.id for rest in rest_list], compact_strings).dtype),
     ]
 
     # fields for pitch spelling
     if include_pitch_spelling:
-        fields += [("step", "U256"), ("alter", "i4"), ("octave", "i4")]
+        step_dtype = _string_column([0] * len(rest_list), compact_strings).dtype
+        fields += [("step", step_dtype), ("alter", "i4"), ("octave", "i4")]
 
     # fields for pitch spelling
     if include_grace_notes:
-        fields += [("is_grace", "b"), ("grace_type", "U256")]
+        grace_types = [getattr(rest, "grace_type", "") for rest in rest_list]
+        fields += [
+            ("is_grace", "b"),
+            ("grace_type", _string_column(grace_types, compact_strings).dtype),
+        ]
 
     # fields for key signature
     if key_signature_map is not None:
@@ -2755,6 +3203,8 @@ def update_note_ids_after_unfolding(part):
         for i, note in enumerate(notes):
             note.id = f"{note.id}-{i+1}"
 
+    part.touch()
+
 
 def performance_from_part(part, bpm=100, velocity=64):
     """
@@ -2846,7 +3296,7 @@ def performance_notearray_from_score_notearray(
         ("velocity", "i4"),
         ("track", "i4"),
         ("channel", "i4"),
-        ("id", "U256"),
+        ("id", snote_array["id"].dtype),
     ]
 
     pnote_array = np.zeros(len(snote_array), dtype=ppart_fields)
@@ -3237,6 +3687,34 @@ def slice_ppart_by_time(
     return ppart_slice
 
 
+def _to_miditoolkit(
+    score_data: ScoreLike,
+    incomplete_bar_behaviour: str = "pad_bar",
+    buffer: Optional[BytesIO] = None,
+):
+    """
+    Convert a score to a `miditoolkit.MidiFile` in memory.
+
+    The MIDI file is written to (and read from) `buffer`, which can be
+    reused across calls, instead of a temporary file.
+    """
+    if buffer is None:
+        buffer = BytesIO()
+    else:
+        buffer.seek(0)
+        buffer.truncate()
+
+    partitura.io.exportmidi.save_score_midi(
+        score_data,
+        out=buffer,
+        anacrusis_behavior=incomplete_bar_behaviour,
+        part_voice_assign_mode=4,
+        minimum_ppq=480,
+    )
+    buffer.seek(0)
+    return miditoolkit.MidiFile(file=buffer)
+
+
 def tokenize(
     score_data: ScoreLike,
     tokenizer: MIDITokenizer,
@@ -3267,18 +3745,48 @@ def tokenize(
         raise ImportError(
             "Miditok and miditoolkit must be installed for this function to work"
         )
-    with TemporaryDirectory() as tmpdir:
-        temp_midi_path = os.path.join(tmpdir, "temp_midi.mid")
-        partitura.io.exportmidi.save_score_midi(
-            score_data,
-            out=temp_midi_path,
-            anacrusis_behavior=incomplete_bar_behaviour,
-            part_voice_assign_mode=4,
-            minimum_ppq=480,
+    midi = _to_miditoolkit(score_data, incomplete_bar_behaviour)
+    return tokenizer(midi)
+
+
+def tokenize_many(
+    scores: Iterable[ScoreLike],
+    tokenizer: MIDITokenizer,
+    incomplete_bar_behaviour: str = "pad_bar",
+) -> List[Any]:
+    """
+    Tokenize a collection of scores using a tokenizer from miditok.
+
+    This is equivalent to calling :func:`tokenize` for each score, but
+    a single in-memory buffer is reused for the MIDI conversion of all
+    scores.
+
+    Parameters
+    ----------
+    scores : iterable of ScoreLike
+        The scores to tokenize (see :func:`tokenize`). To load the
+        scores of a corpus in parallel, see
+        :func:`partitura.io.corpus.iter_corpus`.
+    tokenizer : MIDITokenizer
+        A tokenizer from miditok.
+    incomplete_bar_behaviour : str
+        How to handle incomplete bars (see :func:`tokenize`). Defaults
+        to 'pad_bar'.
+
+    Returns
+    -------
+    tokens : list
+        The tokens of each score, as produced by the miditok library.
+    """
+    if miditok is None or miditoolkit is None:
+        raise ImportError(
+            "Miditok and miditoolkit must be installed for this function to work"
         )
-        midi = miditoolkit.MidiFile(temp_midi_path)
-        tokens = tokenizer(midi)
-    return tokens
+    buffer = BytesIO()
+    return [
+        tokenizer(_to_miditoolkit(score_data, incomplete_bar_behaviour, buffer))
+        for score_data in scores
+    ]
 
 
 def step2pc(step, alter):
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains tests for the columnar representation of alignments.
+"""
+import unittest
+
+import numpy as np
+
+from tests import MATCH_IMPORT_EXPORT_TESTFILES
+
+from partitura import load_match
+from partitura.utils.alignment import Alignment, ensure_alignment
+from partitura.io.exportparangonada import alignment_dicts_to_array
+from partitura.musicanalysis import performance_codec
+
+
+class TestAlignment(unittest.TestCase):
+    def test_dicts_round_trip(self):
+        alignment = [
+            dict(label="match", score_id="n1", performance_id="0"),
+            dict(label="insertion", performance_id="1"),
+            dict(label="deletion", score_id="n2"),
+            dict(label="ornament", score_id="n3", performance_id="2", type="trill"),
+            dict(label="unknown", score_id="n4"),
+        ]
+        al = Alignment.from_dicts(alignment)
+
+        self.assertEqual(len(al), len(alignment))
+        self.assertEqual(al.to_dicts(), alignment)
+        self.assertEqual(list(al.labels), [a["label"] for a in alignment])
+        self.assertEqual(al[3], alignment[3])
+        self.assertEqual(al[-1], alignment[-1])
+        self.assertEqual(al[al.mask("match", "ornament")].to_dicts(), alignment[::3])
+        self.assertIs(ensure_alignment(al), al)
+
+    def test_index(self):
+        note_array = np.array([("n2",), ("n1",)], dtype=[("id", "U2")])
+        al = Alignment.from_dicts(
+            [
+                dict(label="match", score_id="n1", performance_id="n2"),
+                dict(label="deletion", score_id="n3"),
+            ]
+        ).index(note_array, note_array)
+        self.assertTrue(np.all(al.array["score_idx"] == [1, -1]))
+        self.assertTrue(np.all(al.array["performance_idx"] == [0, -1]))
+
+    def test_consumers(self):
+        for fn in MATCH_IMPORT_EXPORT_TESTFILES:
+            performance, alignment, score = load_match(fn, create_score=True)
+            al = Alignment.from_dicts(alignment)
+
+            for expected, result in zip(
+                performance_codec.to_matched_score(score, performance, alignment),
+                performance_codec.to_matched_score(score, performance, al),
+            ):
+                self.assertTrue(np.all(expected == result))
+
+            self.assertTrue(
+                np.all(
+                    alignment_dicts_to_array(alignment) == alignment_dicts_to_array(al)
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains tests for the on-disk cache of loaded files.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from tests import MATCH_IMPORT_EXPORT_TESTFILES
+
+from partitura import EXAMPLE_MUSICXML, load_cached, load_corpus
+from partitura.io.cache import LoadCache
+
+CALLS = []
+
+
+def read_text(filename):
+    CALLS.append(filename)
+    with open(filename) as f:
+        return f.read()
+
+
+class TestLoadCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_load_cached(self):
+        score = load_cached(EXAMPLE_MUSICXML, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        cached_score = load_cached(EXAMPLE_MUSICXML, cache_dir=self.cache_dir)
+        self.assertTrue(np.all(score.note_array() == cached_score.note_array()))
+
+        # different arguments are different entries
+        load_cached(EXAMPLE_MUSICXML, cache_dir=self.cache_dir, force_note_ids=True)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+        fn = MATCH_IMPORT_EXPORT_TESTFILES[0]
+        performance = load_cached(fn, loader="performance", cache_dir=self.cache_dir)
+        cached = load_corpus([fn], loader="performance", cache_dir=self.cache_dir)
+        self.assertTrue(
+            np.all(performance.note_array() == cached[0].result.note_array())
+        )
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_file_changes(self):
+        fn = os.path.join(self.cache_dir, "file.txt")
+        cache = LoadCache(os.path.join(self.cache_dir, "cache"))
+        del CALLS[:]
+        for text in ["a", "a", "b", "a"]:
+            with open(fn, "w") as f:
+                f.write(text)
+            self.assertEqual(cache.load(fn, read_text), text)
+        # the file is only read when its contents are not cached
+        self.assertEqual(len(CALLS), 2)
+
+    def test_eviction(self):
+        cache = LoadCache(self.cache_dir, max_size=None)
+        for i in range(4):
+            cache.set(str(i), np.zeros(1000))
+            # make sure that the access times are different
+            os.utime(cache._path(str(i)), (i, i))
+        entry_size = cache.size() // 4
+
+        # access the oldest entry
+        self.assertEqual(len(cache.get("0")), 1000)
+        cache.max_size = 3 * entry_size
+        cache.evict()
+        self.assertIsNone(cache.get("1"))
+        for key in ["0", "2", "3"]:
+            self.assertIsNotNone(cache.get(key))
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains tests for loading corpora in parallel.
+"""
+import copy
+import os
+import pickle
+import unittest
+
+import numpy as np
+
+from tests import (
+    MATCH_IMPORT_EXPORT_TESTFILES,
+    MUSICXML_IMPORT_EXPORT_TESTFILES,
+    MUSICXML_PATH,
+)
+
+from partitura import load_corpus, iter_corpus, load_score
+from partitura.io.corpus import expand_filenames
+
+
+class TestCorpus(unittest.TestCase):
+    def test_load_corpus(self):
+        filenames = MUSICXML_IMPORT_EXPORT_TESTFILES + [
+            os.path.join(MUSICXML_PATH, "does_not_exist.musicxml")
+        ]
+        serial = load_corpus(filenames, n_jobs=1)
+        parallel = load_corpus(filenames, n_jobs=2, max_pending=2)
+
+        self.assertEqual([item.filename for item in parallel], filenames)
+        for item_s, item_p in zip(serial[:-1], parallel[:-1]):
+            self.assertIsNone(item_p.error)
+            for part_s, part_p in zip(item_s.result.parts, item_p.result.parts):
+                self.assertEqual(
+                    [str(obj) for obj in part_s.iter_all()],
+                    [str(obj) for obj in part_p.iter_all()],
+                )
+
+        # errors are captured per file
+        for item in (serial[-1], parallel[-1]):
+            self.assertIsNone(item.result)
+            self.assertIsInstance(item.error, Exception)
+
+        unordered = list(iter_corpus(filenames, n_jobs=2, ordered=False))
+        self.assertEqual(sorted(item.filename for item in unordered), sorted(filenames))
+
+    def test_load_corpus_performance(self):
+        items = load_corpus(
+            MATCH_IMPORT_EXPORT_TESTFILES, loader="performance", n_jobs=2
+        )
+        for item in items:
+            self.assertIsNone(item.error)
+            self.assertTrue(len(item.result.note_array()) > 0)
+
+    def test_expand_filenames(self):
+        pattern = os.path.join(MUSICXML_PATH, "test_note_ties*.xml")
+        filenames = expand_filenames([pattern, "missing.xml"])
+        self.assertTrue(len(filenames) > 1)
+        self.assertEqual(filenames[-1], "missing.xml")
+        self.assertEqual(filenames[:-1], sorted(filenames[:-1]))
+
+    def test_pickle_score(self):
+        # scores are sent between processes by pickling them
+        for fn in MUSICXML_IMPORT_EXPORT_TESTFILES:
+            score = load_score(fn)
+            unpickled = pickle.loads(pickle.dumps(score))
+            for part, upart in zip(score.parts, unpickled.parts):
+                self.assertEqual(
+                    [str(obj) for obj in part.iter_all()],
+                    [str(obj) for obj in upart.iter_all()],
+                )
+                self.assertTrue(np.all(part.note_array() == upart.note_array()))
+
+    def test_copy_timeline_objects(self):
+        # copying an object of a part also copies its part
+        part = load_score(MUSICXML_IMPORT_EXPORT_TESTFILES[0]).parts[0]
+        note = part.notes[0]
+        copies = [copy.deepcopy(note), pickle.loads(pickle.dumps(note))]
+        for timepoint in (
+            copy.deepcopy(note.start),
+            pickle.loads(pickle.dumps(note.start)),
+        ):
+            self.assertEqual(timepoint.t, note.start.t)
+            copies.extend(
+                n for n in timepoint.starting_objects[type(note)] if n.id == note.id
+            )
+
+        self.assertEqual(len(copies), 4)
+        for cnote in copies:
+            self.assertEqual(str(cnote), str(note))
+            self.assertEqual(str(cnote.start.next), str(note.start.next))
+            cpart = cnote.start._part
+            self.assertEqual(
+                [str(obj) for obj in part.iter_all()],
+                [str(obj) for obj in cpart.iter_all()],
+            )
+            self.assertTrue(np.all(part.note_array() == cpart.note_array()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,7 +42,7 @@ from partitura.io.matchlines_v0 import (
     MatchTrillNote as MatchTrillNoteV0,
 )
 
-from partitura.io.matchfile_base import MatchError, MatchLine
+from partitura.io.matchfile_base import MatchError, MatchLine, get_matchline_functors
 
 from partitura.io.matchfile_utils import (
     FractionalSymbolicDuration,
@@ -60,7 +60,16 @@ from partitura.utils.music import (
 )
 
 from partitura import load_score, load_performance
-from partitura.io.importmatch import load_match, get_version, load_matchfile
+from partitura.io.importmatch import (
+    load_match,
+    get_version,
+    load_matchfile,
+    parse_matchline,
+    FROM_MATCHLINE_METHODSV0,
+    FROM_MATCHLINE_METHODSV1,
+    FROM_MATCHLINE_FUNCTORSV0,
+    FROM_MATCHLINE_FUNCTORSV1,
+)
 
 RNG = np.random.RandomState(1984)
 
@@ -176,6 +185,78 @@ class TestLoadMatch(unittest.TestCase):
 
         self.assertTrue(version == Version(0, 1, 0))
 
+    def test_matchfile_columns(self):
+        """
+        Test that the structured arrays of a MatchFile correspond to its
+        match lines
+        """
+        for fn in MATCH_IMPORT_EXPORT_TESTFILES + [MOZART_VARIATION_FILES["match"]]:
+            mf = load_matchfile(fn)
+
+            snote_array = mf.snote_array
+            self.assertEqual(len(snote_array), len(mf.snotes))
+            for snote, sn in zip(mf.snotes, snote_array):
+                self.assertEqual(sn["id"], snote.Anchor)
+                self.assertEqual(sn["onset_beat"], snote.OnsetInBeats)
+
+            pnote_array = mf.pnote_array
+            self.assertEqual(len(pnote_array), len(mf.notes))
+            for note, pn in zip(mf.notes, pnote_array):
+                self.assertEqual(pn["pitch"], note.MidiPitch)
+                self.assertEqual(pn["onset_tick"], note.Onset)
+
+            note_pairs = mf.note_pair_array
+            for (snote, note), snote_idx, pnote_idx in zip(
+                mf.note_pairs, note_pairs["snote_idx"], note_pairs["pnote_idx"]
+            ):
+                self.assertEqual(snote_array["id"][snote_idx], snote.Anchor)
+                self.assertEqual(pnote_array["pitch"][pnote_idx], note.MidiPitch)
+
+            pedal_array = mf.pedal_array
+            self.assertEqual(
+                len(pedal_array), len(mf.sustain_pedal) + len(mf.soft_pedal)
+            )
+            self.assertEqual(
+                [ped.Time for ped in mf.sustain_pedal],
+                pedal_array["time"][pedal_array["number"] == 64].tolist(),
+            )
+
+            # the columns are computed again if the lines change
+            n_lines = len(mf.lines)
+            mf.lines = np.delete(mf.lines, pnote_array["line"][0])
+            self.assertEqual(len(mf.lines), n_lines - 1)
+            self.assertEqual(len(mf.pnote_array), len(pnote_array) - 1)
+
+    def test_parse_matchline_functors(self):
+        """
+        Test that dispatching on the functors of the lines gives the
+        same results as trying all match line classes
+        """
+        self.assertEqual(
+            get_matchline_functors("insertion-note(1,[E,n],4,42,46,46,59)."),
+            ("insertion", None),
+        )
+        self.assertEqual(get_matchline_functors("other line"), ("other", None))
+        self.assertEqual(get_matchline_functors("% comment"), (None, None))
+
+        for fn in MATCH_IMPORT_EXPORT_TESTFILES + [MOZART_VARIATION_FILES["match"]]:
+            with open(fn) as f:
+                lines = f.read().splitlines()
+
+            version = get_version(lines[0])
+            methods, functors = FROM_MATCHLINE_METHODSV1, FROM_MATCHLINE_FUNCTORSV1
+            if version < Version(1, 0, 0):
+                methods, functors = FROM_MATCHLINE_METHODSV0, FROM_MATCHLINE_FUNCTORSV0
+
+            for line in lines:
+                ml = parse_matchline(line, methods, version)
+                ml_functors = parse_matchline(
+                    line, methods, version, from_matchline_functors=functors
+                )
+                self.assertEqual(type(ml), type(ml_functors))
+                if ml is not None:
+                    self.assertEqual(ml.matchline, ml_functors.matchline)
+
 
 def basic_line_test(ml: MatchLine, verbose: bool = False) -> None:
     """
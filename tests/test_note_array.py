@@ -8,12 +8,21 @@ the Part class.
 import unittest
 
 import partitura.score as score
-from partitura import load_musicxml, load_kern, load_score
-from partitura.utils.music import note_array_from_part, ensure_notearray
+from partitura import load_musicxml, load_kern, load_score, load_match
+from partitura.utils.music import (
+    note_array_from_part,
+    note_array_from_part_list,
+    ensure_notearray,
+)
 from partitura.musicanalysis import note_array_to_score
 import numpy as np
 
-from tests import NOTE_ARRAY_TESTFILES, KERN_TESTFILES, METRICAL_POSITION_TESTFILES
+from tests import (
+    NOTE_ARRAY_TESTFILES,
+    KERN_TESTFILES,
+    METRICAL_POSITION_TESTFILES,
+    MATCH_IMPORT_EXPORT_TESTFILES,
+)
 
 
 class TestNoteArray(unittest.TestCase):
@@ -167,6 +176,20 @@ class TestNoteArray(unittest.TestCase):
             np.array_equal(note_array["ts_mus_beats"], expected_musical_beats)
         )
 
+    def test_notearray_non_integer_onsets(self):
+        # scores created from match files can have non-integer times; the
+        # maps must be evaluated on the original times, not truncated ones
+        _, _, scr = load_match(MATCH_IMPORT_EXPORT_TESTFILES[0], create_score=True)
+        part = scr[0]
+        notes = part.notes_tied
+        onsets = np.array([note.start.t for note in notes])
+        self.assertTrue(np.any(onsets != np.floor(onsets)))
+        note_array = note_array_from_part(part)
+        self.assertTrue(np.allclose(note_array["onset_beat"], part.beat_map(onsets)))
+        self.assertTrue(
+            np.allclose(note_array["onset_quarter"], part.quarter_map(onsets))
+        )
+
     def test_ensure_na_different_divs(self):
         # check if divs are correctly rescaled when producing a note array from
         # parts with different divs values
@@ -229,6 +252,80 @@ class TestNoteArray(unittest.TestCase):
                 # field.
                 self.assertTrue(field_name in na.dtype.names)
 
+    def test_cached_note_array(self):
+        scr = load_musicxml(NOTE_ARRAY_TESTFILES[0])
+        part = scr[0]
+        options = [
+            dict(),
+            dict(include_pitch_spelling=True, include_staff=True),
+            dict(include_time_signature=True),
+            dict(include_pitch_spelling=True),
+            dict(include_grace_notes=True, include_metrical_position=True),
+        ]
+        for kwargs in options:
+            na = part.note_array(**kwargs)
+            expected = note_array_from_part(part, **kwargs)
+            self.assertEqual(na.dtype, expected.dtype)
+            self.assertTrue(np.array_equal(na, expected))
+
+        # returned arrays are copies
+        na = part.note_array()
+        na["pitch"] = 0
+        self.assertTrue(np.all(part.note_array()["pitch"] > 0))
+
+        # changes to the part update the note array
+        score_na = scr.note_array(include_pitch_spelling=True)
+        n_notes = len(part.note_array())
+        part.add(score.Note(id="n_new", step="C", octave=4), start=0, end=1)
+        self.assertEqual(len(part.note_array()), n_notes + 1)
+        self.assertEqual(
+            len(scr.note_array(include_pitch_spelling=True)), len(score_na) + 1
+        )
+
+    def test_cached_note_array_note_edits(self):
+        scr = load_musicxml(NOTE_ARRAY_TESTFILES[0])
+        part = scr[0]
+        kwargs = dict(include_pitch_spelling=True, include_staff=True)
+        part.note_array(**kwargs)
+        scr.note_array(**kwargs)
+
+        # editing notes in place updates the cached note arrays
+        note = part.notes_tied[0]
+        note.voice = 7
+        note.id = "zzz"
+        note.alter = 1 if note.alter is None else note.alter + 1
+        note.staff = 2
+        self.assertTrue(
+            np.array_equal(
+                part.note_array(**kwargs), note_array_from_part(part, **kwargs)
+            )
+        )
+        for na in (part.note_array(**kwargs), scr.note_array(**kwargs)):
+            row = na[na["id"] == "zzz"]
+            self.assertEqual(len(row), 1)
+            self.assertEqual(row["voice"][0], 7)
+            self.assertEqual(row["staff"][0], 2)
+            self.assertEqual(row["pitch"][0], note.midi_pitch)
+
+    def test_compact_strings(self):
+        scr = load_musicxml(NOTE_ARRAY_TESTFILES[0])
+        part = scr[0]
+        kwargs = dict(include_pitch_spelling=True, include_grace_notes=True)
+        na = part.note_array(**kwargs)
+        na_wide = part.note_array(compact_strings=False, **kwargs)
+
+        max_id_len = max(len(str(note.id)) for note in part.notes_tied)
+        self.assertEqual(na.dtype["id"], np.dtype("U{}".format(max_id_len)))
+        self.assertEqual(na.dtype["step"], np.dtype("U1"))
+        for field in ("id", "step", "grace_type"):
+            self.assertEqual(na_wide.dtype[field], np.dtype("U256"))
+            self.assertTrue(np.all(na[field] == na_wide[field]))
+
+        # part ids prefixed to the note ids must not be truncated
+        scr_na = note_array_from_part_list([part, part])
+        self.assertTrue(all(nid.startswith(("P00_", "P01_")) for nid in scr_na["id"]))
+        self.assertEqual(set(nid[4:] for nid in scr_na["id"]), set(na["id"]))
+
 
 if __name__ == "__main__":
     unittest.main()
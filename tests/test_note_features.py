@@ -12,6 +12,7 @@ from tests import (
 )
 from partitura import load_musicxml, load_mei
 from partitura.musicanalysis import make_note_feats, compute_note_array
+from partitura.musicanalysis.note_features import FeatureInputs, requires
 import numpy as np
 
 
@@ -31,6 +32,32 @@ class TestingNoteFeatureExtraction(unittest.TestCase):
             score = load_musicxml(fn)
             make_note_feats(score[0], "all")
 
+    def test_shared_inputs(self):
+        received = []
+
+        @requires("notes", "onset_groups")
+        def n_onset_feature(na, part, inputs=None, **kwargs):
+            received.append(inputs)
+            return np.ones((len(inputs.notes), 1)), ["n_onset"]
+
+        def plain_feature(na, part, include_empty_features=True):
+            return np.zeros((len(na), 1)), ["plain"]
+
+        for fn in MUSICXML_IMPORT_EXPORT_TESTFILES:
+            score = load_musicxml(fn)
+            feats, names = make_note_feats(score[0], "all")
+            threaded_feats, threaded_names = make_note_feats(score[0], "all", n_jobs=4)
+            self.assertEqual(names, threaded_names)
+            self.assertTrue(np.all(feats == threaded_feats))
+
+            feats, names = make_note_feats(
+                score[0], [n_onset_feature, plain_feature, "staff_feature"]
+            )
+            self.assertEqual(
+                names[:2], ["n_onset_feature.n_onset", "plain_feature.plain"]
+            )
+            self.assertIsInstance(received[-1], FeatureInputs)
+
     def test_slur_grace_art_dyn_orn(self):
         for fn in MUSICXML_NOTE_FEATURES:
             score = load_musicxml(fn, force_note_ids=True)
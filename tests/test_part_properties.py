@@ -33,6 +33,158 @@ class TestingPartProperties(unittest.TestCase):
         self.assertTrue(len(part.dynamics) == 1)
         self.assertTrue(len(part.repeats) == 0)
 
+    def test_timeline_links(self):
+        part = score.Part("P0")
+        starts = [30, 0, 20, 10, 50, 40, 10]
+        notes = []
+        for i, start in enumerate(starts):
+            note = score.Note(id="n{}".format(i), step="C", octave=4)
+            part.add(note, start=start, end=start + 10)
+            notes.append(note)
+
+        def check_links():
+            points = part._points
+            times = [tp.t for tp in points]
+            self.assertEqual(times, sorted(set(times)))
+            for tp_prev, tp_next in zip(points[:-1], points[1:]):
+                self.assertIs(tp_prev.next, tp_next)
+                self.assertIs(tp_next.prev, tp_prev)
+            self.assertIsNone(points[0].prev)
+            self.assertIsNone(points[-1].next)
+
+        check_links()
+        self.assertEqual([tp.t for tp in part._points], [0, 10, 20, 30, 40, 50, 60])
+
+        # removing objects removes timepoints that become empty
+        part.remove(notes[4])
+        check_links()
+        self.assertEqual([tp.t for tp in part._points], [0, 10, 20, 30, 40, 50])
+        part.remove(notes[1])
+        check_links()
+        self.assertEqual(part.first_point.t, 10)
+
+    def test_add_many(self):
+        starts = [30, 0, 20, 10, 50, 40, 10]
+        part_1 = score.Part("P0")
+        part_2 = score.Part("P1")
+        part_1.set_quarter_duration(0, 10)
+        part_2.set_quarter_duration(0, 10)
+        part_1.set_quarter_duration(40, 20)
+        part_2.set_quarter_duration(40, 20)
+
+        notes = []
+        for i, start in enumerate(starts):
+            note = score.Note(id="n{}".format(i), step="C", octave=4)
+            part_1.add(note, start=start, end=start + 10)
+            notes.append(score.Note(id="n{}".format(i), step="C", octave=4))
+
+        part_2.add(score.Note(id="n_first", step="C", octave=4), start=5, end=15)
+        part_2.add_many(notes, starts, [start + 10 for start in starts])
+
+        self.assertEqual(
+            [(tp.t, tp.quarter) for tp in part_1._points],
+            [(tp.t, tp.quarter) for tp in part_2._points if tp.t not in (5, 15)],
+        )
+        for tp_prev, tp_next in zip(part_2._points[:-1], part_2._points[1:]):
+            self.assertIs(tp_prev.next, tp_next)
+            self.assertIs(tp_next.prev, tp_prev)
+        self.assertEqual(
+            [n.id for n in part_1.notes],
+            [n.id for n in part_2.notes if n.id != "n_first"],
+        )
+
+        with self.assertRaises(ValueError):
+            part_2.add_many(notes, starts[:-1])
+
+    def test_bulk_add(self):
+        part = score.Part("P0")
+        with part.bulk_add():
+            for i in range(5, 0, -1):
+                part.add(score.Note(id="n{}".format(i), step="C", octave=4), i, i + 1)
+            # objects are registered right away
+            self.assertEqual(part.get_point(3).t, 3)
+            self.assertEqual(len(part.notes), 5)
+            part.add(score.Note(id="n0", step="C", octave=4), 0, 1)
+            self.assertIsNone(part.get_point(0).next)
+
+        self.assertEqual([tp.t for tp in part._points], [0, 1, 2, 3, 4, 5, 6])
+        self.assertIs(part.get_point(0).next, part.get_point(1))
+        self.assertEqual(part.get_point(0).quarter, 1)
+
+    def test_iter_all_index(self):
+        part = score.Part("P0")
+        note_1 = score.Note(id="n1", step="C", octave=4)
+        note_2 = score.Note(id="n2", step="D", octave=4)
+        grace = score.GraceNote(grace_type="acciaccatura", id="g1", step="E", octave=4)
+        rest = score.Rest(id="r1")
+        part.add(note_2, start=10, end=20)
+        part.add(rest, start=20, end=30)
+        part.add(grace, start=10, end=10)
+        part.add(note_1, start=0, end=10)
+
+        self.assertEqual([n.id for n in part.iter_all(score.Note)], ["n1", "n2"])
+        self.assertEqual(
+            [n.id for n in part.iter_all(score.Note, include_subclasses=True)],
+            ["n1", "n2", "g1"],
+        )
+        self.assertEqual(
+            [n.id for n in part.iter_all(score.GenericNote, include_subclasses=True)],
+            ["n1", "n2", "g1", "r1"],
+        )
+        self.assertEqual(
+            [n.id for n in part.iter_all(score.Note, start=5, end=30)], ["n2"]
+        )
+        self.assertEqual(
+            [n.id for n in part.iter_all(score.Note, start=20, mode="ending")],
+            ["n2"],
+        )
+        self.assertEqual(len(list(part.iter_all())), 4)
+
+        part.remove(note_2)
+        self.assertEqual([n.id for n in part.iter_all(score.Note)], ["n1"])
+        # objects added/removed through the timepoints are also indexed
+        slur = score.Slur(start_note=note_1, end_note=grace)
+        part.add(slur, start=0, end=10)
+        slur.end_note = rest
+        self.assertEqual(list(part.iter_all(score.Slur, mode="ending")), [slur])
+        self.assertIs(slur.end, rest.end)
+        slur.start_note = grace
+        self.assertEqual(list(part.iter_all(score.Slur)), [])
+
+    def test_cached_maps(self):
+        part = score.Part("P0")
+        part.set_quarter_duration(0, 10)
+        part.add(score.TimeSignature(3, 4), start=0)
+        part.add(score.Note(id="n0", step="A", octave=4), start=0, end=60)
+        score.add_measures(part)
+
+        beat_map = part.beat_map
+        measure_map = part.measure_map
+        self.assertIs(part.beat_map, beat_map)
+        self.assertIs(part.measure_map, measure_map)
+        self.assertEqual(part.time_signature_map(0)[0], 3)
+
+        version = part.version
+        part.add(score.TimeSignature(2, 4), start=30)
+        self.assertGreater(part.version, version)
+        self.assertIsNot(part.beat_map, beat_map)
+        self.assertEqual(part.time_signature_map(30)[0], 2)
+
+        # changes in the quarter duration invalidate the maps
+        quarter_map = part.quarter_map
+        self.assertIs(part.quarter_map, quarter_map)
+        part.set_quarter_duration(30, 20)
+        self.assertIsNot(part.quarter_map, quarter_map)
+        self.assertEqual(part.quarter_map(50) - part.quarter_map(30), 1)
+
+        # changes to objects in the part require an explicit touch
+        ts = next(part.iter_all(score.TimeSignature))
+        self.assertEqual(part.time_signature_map(0)[0], 3)
+        ts.beats = 6
+        self.assertEqual(part.time_signature_map(0)[0], 3)
+        part.touch()
+        self.assertEqual(part.time_signature_map(0)[0], 6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This module contains tests for saving and loading partitura's binary format.
+"""
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from tests import (
+    MUSICXML_IMPORT_EXPORT_TESTFILES,
+    MEI_TESTFILES,
+    MATCH_IMPORT_EXPORT_TESTFILES,
+)
+
+from partitura import load_score, save_partitura, load_partitura
+from partitura.io.partiturafile import (
+    PartituraFileError,
+    FORMAT_VERSION,
+    PREAMBLE,
+    ALIGNMENT,
+)
+from partitura.score import Score, Part
+
+
+class TestPartituraFile(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(tempfile.mkdtemp(), "score.partitura")
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def check_part(self, part, loaded_part):
+        self.assertEqual(
+            [str(obj) for obj in part.iter_all()],
+            [str(obj) for obj in loaded_part.iter_all()],
+        )
+        self.assertEqual(
+            [str(obj) for obj in part.iter_all(mode="ending")],
+            [str(obj) for obj in loaded_part.iter_all(mode="ending")],
+        )
+        self.assertEqual(
+            part.note_array().tobytes(), loaded_part.note_array().tobytes()
+        )
+
+        # references between objects are restored
+        notes = part.notes
+        loaded_notes = loaded_part.notes
+        note_index = dict((n, i) for i, n in enumerate(notes))
+        for note, loaded_note in zip(notes, loaded_notes):
+            self.assertEqual(note.id, loaded_note.id)
+            if note.tie_next is not None:
+                self.assertIs(
+                    loaded_note.tie_next, loaded_notes[note_index[note.tie_next]]
+                )
+            self.assertEqual(
+                [str(slur) for slur in note.slur_starts],
+                [str(slur) for slur in loaded_note.slur_starts],
+            )
+            for slur in loaded_note.slur_starts:
+                self.assertIs(slur.start_note, loaded_note)
+
+    def test_save_load_score(self):
+        for fn in (
+            MUSICXML_IMPORT_EXPORT_TESTFILES
+            + MEI_TESTFILES[:3]
+            + MATCH_IMPORT_EXPORT_TESTFILES[:1]
+        ):
+            score = load_score(fn)
+            save_partitura(score, self.filename)
+            loaded_score = load_partitura(self.filename)
+            self.assertIsInstance(loaded_score, Score)
+            self.assertEqual(len(score.parts), len(loaded_score.parts))
+            for part, loaded_part in zip(score.parts, loaded_score.parts):
+                self.check_part(part, loaded_part)
+
+            # the loaded timeline can be modified
+            loaded_part = loaded_score.parts[0]
+            n_notes = len(loaded_part.notes)
+            loaded_part.add(loaded_part.notes[0].__class__("C", 4), 1, 2)
+            self.assertEqual(len(loaded_part.notes), n_notes + 1)
+
+    def test_save_load_part(self):
+        part = load_score(MUSICXML_IMPORT_EXPORT_TESTFILES[0]).parts[0]
+        save_partitura(part, self.filename)
+        loaded_part = load_partitura(self.filename)
+        self.assertIsInstance(loaded_part, Part)
+        self.assertIsNone(loaded_part.parent)
+        self.check_part(part, loaded_part)
+
+    def test_invalid_files(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not a partitura file")
+        self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+        part = load_score(MUSICXML_IMPORT_EXPORT_TESTFILES[0]).parts[0]
+        save_partitura(part, self.filename)
+        with open(self.filename, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", FORMAT_VERSION + 1))
+        self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+    def rewrite_header(self, func):
+        # replace the header of the file by func(header)
+        with open(self.filename, "rb") as f:
+            magic, version, header_len = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            header = json.loads(f.read(header_len).decode("utf8"))
+            f.seek(-(-(PREAMBLE.size + header_len) // ALIGNMENT) * ALIGNMENT)
+            data = f.read()
+        header_bytes = json.dumps(func(header)).encode("utf8")
+        padding = -(PREAMBLE.size + len(header_bytes)) % ALIGNMENT
+        with open(self.filename, "wb") as f:
+            f.write(PREAMBLE.pack(magic, version, len(header_bytes)))
+            f.write(header_bytes + b"\0" * padding + data)
+
+    def test_corrupted_header(self):
+        part = load_score(MUSICXML_IMPORT_EXPORT_TESTFILES[0]).parts[0]
+
+        def set_key(key, value):
+            def func(header):
+                header[key] = value
+                return header
+
+            return func
+
+        def move_arrays(header):
+            for array in header["arrays"].values():
+                array[2] += 2**20
+            return header
+
+        for func in (
+            set_key("arrays", None),
+            move_arrays,
+            lambda header: dict(arrays=header["arrays"]),
+        ):
+            save_partitura(part, self.filename)
+            self.rewrite_header(func)
+            self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+        # invalid json and wrong magic bytes
+        save_partitura(part, self.filename)
+        with open(self.filename, "r+b") as f:
+            f.seek(PREAMBLE.size)
+            f.write(b"}{")
+        self.assertRaises(PartituraFileError, load_partitura, self.filename)
+        with open(self.filename, "r+b") as f:
+            f.write(b"PARTITUX")
+        self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+    def test_disallowed_classes(self):
+        part = load_score(MUSICXML_IMPORT_EXPORT_TESTFILES[0]).parts[0]
+
+        def set_class(header):
+            header["classes"][0] = "os:system"
+            return header
+
+        def set_part_class(header):
+            header["part_classes"][0] = "partitura.score:Note"
+            return header
+
+        for func in (set_class, set_part_class):
+            save_partitura(part, self.filename)
+            self.rewrite_header(func)
+            self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+        # pickled values cannot refer to other globals
+        part.notes[0].callback = os.getcwd
+        save_partitura(part, self.filename)
+        self.assertRaises(PartituraFileError, load_partitura, self.filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
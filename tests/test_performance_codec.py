@@ -8,7 +8,19 @@ import numpy as np
 import numpy.lib.recfunctions as rfn
 from tests import MATCH_IMPORT_EXPORT_TESTFILES
 from partitura import load_match
-from partitura.musicanalysis import encode_performance, decode_performance
+from partitura.musicanalysis import (
+    encode_performance,
+    decode_performance,
+    encode_performances,
+    decode_performances,
+)
+from partitura.musicanalysis.performance_codec import (
+    get_onset_groups,
+    get_unique_onset_idxs,
+    group_mean,
+    notewise_to_onsetwise,
+    onsetwise_to_notewise,
+)
 
 
 class TestPerformanceCoded(unittest.TestCase):
@@ -90,3 +102,50 @@ class TestPerformanceCoded(unittest.TestCase):
                 target, f"The decoded Performed Part doesn't match the original."
             )
     
+
+    def test_encode_decode_performances(self):
+        items = []
+        for fn in MATCH_IMPORT_EXPORT_TESTFILES:
+            ppart, alignment, spart = load_match(filename=fn, create_score=True)
+            items += [(spart[0], ppart[0], alignment)] * 2
+
+        parameters, snote_ids, offsets = encode_performances(items)
+        self.assertEqual(len(offsets), len(items) + 1)
+        self.assertEqual(offsets[-1], len(parameters))
+        for i, (spart, ppart, alignment) in enumerate(items):
+            expected, expected_ids = encode_performance(spart, ppart, alignment)
+            piece = slice(offsets[i], offsets[i + 1])
+            self.assertTrue(np.all(parameters[piece] == expected))
+            self.assertEqual(list(snote_ids[piece]), list(expected_ids))
+
+        decoded = decode_performances(
+            [spart for spart, _, _ in items], parameters, offsets, snote_ids
+        )
+        for i, (spart, _, _) in enumerate(items):
+            piece = slice(offsets[i], offsets[i + 1])
+            expected = decode_performance(
+                spart, parameters[piece], snote_ids=snote_ids[piece]
+            )
+            self.assertTrue(np.all(decoded[i].note_array() == expected.note_array()))
+
+
+class TestOnsetGroups(unittest.TestCase):
+    def test_notewise_onsetwise(self):
+        onsets = np.array([2.0, 0.0, 1.0, 0.0, 2.0, 2.0])
+        unique_onset_idxs = get_unique_onset_idxs(onsets)
+        notewise = np.zeros(len(onsets), dtype=[("a", "f4"), ("b", "i4")])
+        notewise["a"] = np.arange(len(onsets))
+        notewise["b"] = 2
+
+        onsetwise = notewise_to_onsetwise(notewise, unique_onset_idxs)
+        self.assertTrue(np.allclose(onsetwise["a"], [2, 2, 3]))
+        self.assertTrue(np.all(onsetwise["b"] == 2))
+
+        expanded = onsetwise_to_notewise(onsetwise["a"], unique_onset_idxs)
+        self.assertTrue(np.allclose(expanded, [3, 2, 2, 2, 3, 3]))
+
+    def test_group_mean_empty_groups(self):
+        onset_groups = get_onset_groups([np.array([1, 0]), np.array([], dtype=int)])
+        means = group_mean(np.array([[1.0, 2.0], [3.0, 4.0]]), onset_groups)
+        self.assertTrue(np.allclose(means[0], [2, 3]))
+        self.assertTrue(np.all(np.isnan(means[1])))
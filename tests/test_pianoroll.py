@@ -7,11 +7,13 @@ import numpy as np
 import logging
 import unittest
 from functools import partial
+from scipy.sparse import csc_matrix, csr_matrix
 
 from partitura.utils.music import (
     compute_pianoroll,
     pianoroll_to_notearray,
     compute_pitch_class_pianoroll,
+    iter_pianoroll_windows,
 )
 from partitura import load_musicxml, load_score, load_performance
 import partitura
@@ -84,6 +86,25 @@ class TestPianorollFromNotes(unittest.TestCase):
 
         self.assertTrue(equal)
 
+    def test_performance_pianoroll_velocity(self):
+        # unsorted notes, overlapping notes with the same pitch
+        note_array = np.array(
+            [(62, 1, 1, 50), (60, 0, 2, 72), (60, 1, 2, 90)],
+            dtype=[
+                ("pitch", "i4"),
+                ("onset_sec", "f4"),
+                ("duration_sec", "f4"),
+                ("velocity", "i4"),
+            ],
+        )
+
+        pr = compute_pianoroll(
+            note_array, pitch_margin=0, time_div=1, note_separation=False
+        )
+        expected_pr = np.array([[72, 90, 90], [0, 0, 0], [0, 50, 0]])
+
+        self.assertTrue(np.all(pr.toarray() == expected_pr))
+
     def test_noteduration_pianoroll(self):
         note_array = np.array(
             [(60, 0, 2), (60, 2, 2), (60, 5, 0.3)],
@@ -213,6 +234,42 @@ class TestNotesFromPianoroll(unittest.TestCase):
         test = np.all(note_array == rec_note_array)
         self.assertTrue(test)
 
+    def test_pianoroll_to_notearray_input_formats(self):
+        pr = np.zeros((88, 6))
+        pr[39, 0:4] = 64
+        # velocity change starts a new note
+        pr[39, 4:6] = 70
+        pr[43, 1:3] = 1
+        pr[43, 4] = 1
+
+        expected = np.array(
+            [(60, 0, 4, 64), (64, 1, 2, 1), (60, 4, 2, 70), (64, 4, 1, 1)],
+            dtype=[
+                ("pitch", "i4"),
+                ("onset_sec", "f4"),
+                ("duration_sec", "f4"),
+                ("velocity", "i4"),
+            ],
+        )
+        for pianoroll in (pr, csc_matrix(pr), csr_matrix(pr)):
+            note_array = pianoroll_to_notearray(pianoroll, time_div=1)
+            for field in expected.dtype.names:
+                self.assertTrue(np.all(note_array[field] == expected[field]))
+
+    def test_pianoroll_to_notearray_empty(self):
+        for pianoroll in (
+            np.zeros((128, 10)),
+            np.zeros((128, 0)),
+            np.zeros((88, 10)),
+            csr_matrix((128, 10)),
+        ):
+            note_array = pianoroll_to_notearray(pianoroll, time_unit="div")
+            self.assertEqual(len(note_array), 0)
+            self.assertEqual(
+                note_array.dtype.names,
+                ("pitch", "onset_div", "duration_div", "velocity", "id"),
+            )
+
     def test_reconstruction_score(self):
         for fn in MUSICXML_IMPORT_EXPORT_TESTFILES:
             score = load_musicxml(fn)
@@ -441,5 +498,108 @@ class TestPitchClassPianoroll(unittest.TestCase):
         # Onsets and offsets should be identical
         self.assertTrue(np.all(pr_idxs[:, 2:4] == pcr_idxs[:, 2:4]))
 
+
+class TestPianorollWindows(unittest.TestCase):
+    """
+    Test fixed-size piano roll windows
+    """
+
+    def setUp(self):
+        self.note_arrays = [
+            partitura.utils.music.generate_random_performance_note_array(n)
+            for n in (1, 20, 100)
+        ]
+
+    def padded_windows(self, pianoroll, window_size, hop_size):
+        n_frames = pianoroll.shape[1]
+        n_windows = max(int(np.ceil((n_frames - window_size) / hop_size)), 0) + 1
+        padded = np.zeros((pianoroll.shape[0], n_frames + window_size + hop_size))
+        padded[:, :n_frames] = pianoroll
+        return [
+            padded[:, i * hop_size : i * hop_size + window_size]
+            for i in range(n_windows)
+        ]
+
+    def test_windows(self):
+        for window_size, hop_size in [(16, None), (16, 5), (7, 20)]:
+            expected = []
+            for note_array in self.note_arrays:
+                pr = compute_pianoroll(
+                    note_array, time_unit="sec", time_div=10, piano_range=True
+                )
+                expected += self.padded_windows(
+                    pr.toarray(), window_size, hop_size or window_size
+                )
+
+            windows = list(
+                iter_pianoroll_windows(
+                    self.note_arrays,
+                    window_size=window_size,
+                    hop_size=hop_size,
+                    time_unit="sec",
+                    time_div=10,
+                    piano_range=True,
+                )
+            )
+            self.assertEqual(len(windows), len(expected))
+            for window, exp_window in zip(windows, expected):
+                self.assertEqual(window.shape, (88, window_size))
+                self.assertTrue(np.all(window == exp_window))
+
+    def test_pitch_class_windows(self):
+        expected = []
+        for note_array in self.note_arrays:
+            pc_pr = compute_pitch_class_pianoroll(
+                note_array, time_unit="sec", time_div=10, binary=True
+            )
+            expected += self.padded_windows(pc_pr, 8, 8)
+
+        windows = list(
+            iter_pianoroll_windows(
+                self.note_arrays,
+                window_size=8,
+                time_unit="sec",
+                time_div=10,
+                pitch_class=True,
+                binary=True,
+            )
+        )
+        self.assertEqual(len(windows), len(expected))
+        for window, exp_window in zip(windows, expected):
+            self.assertTrue(np.allclose(window, exp_window))
+
+    def test_batches(self):
+        windows = list(
+            iter_pianoroll_windows(
+                self.note_arrays, window_size=12, time_unit="sec", pad=False
+            )
+        )
+        out = np.empty((4, 128, 12), dtype=int)
+        batches = []
+        positions = []
+        for batch, batch_positions in iter_pianoroll_windows(
+            self.note_arrays,
+            window_size=12,
+            out=out,
+            time_unit="sec",
+            pad=False,
+            return_positions=True,
+        ):
+            self.assertTrue(batch.base is out or batch is out)
+            batches.append(batch.copy())
+            positions.append(batch_positions)
+
+        batches = np.concatenate(batches)
+        positions = np.concatenate(positions)
+        self.assertTrue(np.all(batches == np.array(windows)))
+        self.assertEqual(len(positions), len(windows))
+        # windows without padding lie within the piece
+        self.assertTrue(np.all(positions[:, 1] % 12 == 0))
+        self.assertTrue(np.all(np.diff(positions[:, 0]) >= 0))
+
+        with self.assertRaises(ValueError):
+            list(iter_pianoroll_windows(self.note_arrays, 12, out=out, batch_size=3))
+
+
 if __name__ == "__main__":
     unittest.main()
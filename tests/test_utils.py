@@ -9,6 +9,7 @@ import numpy as np
 
 from partitura.utils import music
 from partitura.musicanalysis import performance_codec
+from partitura.utils.alignment import lookup_note_ids
 from tests import (
     MATCH_IMPORT_EXPORT_TESTFILES,
     VOSA_TESTFILES,
@@ -18,7 +19,7 @@ from tests import (
 
 from scipy.interpolate import interp1d as scinterp1d
 from partitura.utils.generic import interp1d as pinterp1d
-from partitura.utils.music import tokenize
+from partitura.utils.music import tokenize, tokenize_many
 
 try:
     import miditok
@@ -50,6 +51,14 @@ class TestGetMatchedNotes(unittest.TestCase):
 
             self.assertTrue(np.all(scr_pitch == perf_pitch))
 
+    def test_lookup_note_ids(self):
+        note_ids = np.array(["n3", "n1", "n2", "n1"])
+        idxs = lookup_note_ids(note_ids, ["n1", "n2", "n4", "n3", "n10"])
+        self.assertTrue(np.all(idxs == [1, 2, -1, 0, -1]))
+
+        idxs = lookup_note_ids(np.array([], dtype="U5"), ["n1"])
+        self.assertTrue(np.all(idxs == [-1]))
+
 
 class TestGetTimeMapsFromAlignment(unittest.TestCase):
     def test_get_time_maps_from_alignment(self):
@@ -511,6 +520,62 @@ class TestPerformanceFromPart(unittest.TestCase):
                 test_arrays(cno, rin)
 
 
+class TestMatchNoteArrays(unittest.TestCase):
+    def test_match_note_arrays(self):
+        """
+        Test `match_note_arrays`
+        """
+        note_array = music.generate_random_performance_note_array(
+            num_notes=200, rng=RNG
+        )
+        # shuffled copy of the note array with jittered onsets
+        perm = RNG.permutation(len(note_array))
+        target = note_array[perm].copy()
+        target["onset_sec"] += RNG.uniform(-0.005, 0.005, len(target))
+
+        matched_idxs, matched_ids = music.match_note_arrays(
+            note_array,
+            target,
+            fields=("onset_sec", "duration_sec"),
+            epsilon=0.01,
+            return_note_idxs=True,
+        )
+        self.assertTrue(len(matched_idxs) > 0)
+        # matched notes have the same pitch
+        self.assertTrue(
+            np.all(
+                note_array["pitch"][matched_idxs[:, 0]]
+                == target["pitch"][matched_idxs[:, 1]]
+            )
+        )
+        # each target note is matched at most once
+        self.assertEqual(len(set(matched_idxs[:, 1])), len(matched_idxs))
+        # notes without competing candidates are matched to themselves
+        self.assertTrue(np.mean(matched_ids[:, 0] == matched_ids[:, 1]) > 0.9)
+
+    def test_match_note_arrays_duration(self):
+        """
+        Test that `match_note_arrays` picks the candidate with the
+        closest duration
+        """
+        fields = [
+            ("onset_sec", "f4"),
+            ("duration_sec", "f4"),
+            ("pitch", "i4"),
+            ("id", "U2"),
+        ]
+        input_na = np.array(
+            [(0.0, 1.0, 60, "a"), (0.0, 2.0, 60, "b"), (1.0, 1.0, 62, "c")],
+            dtype=fields,
+        )
+        target_na = np.array(
+            [(1.0, 1.0, 62, "x"), (0.0, 2.1, 60, "y"), (0.5, 1.0, 60, "z")],
+            dtype=fields,
+        )
+        matched_idxs = music.match_note_arrays(input_na, target_na)
+        self.assertEqual(sorted(map(tuple, matched_idxs.tolist())), [(1, 1), (2, 0)])
+
+
 class TestGenericUtils(unittest.TestCase):
     def test_interp1d(self):
         """
@@ -630,6 +695,16 @@ if HAS_MIDITOK:
             mtok_tokens = [tok for tok in mtok_tokens if not tok.startswith("Velocity")]
             self.assertTrue(pt_tokens == mtok_tokens)
 
+        def test_tokenize_many(self):
+            """Test tokenizing several scores at once"""
+            tokenizer = miditok.REMI()
+            pt_score = partitura.load_score(TOKENIZER_TESTFILES[0]["score"])
+            pt_tokens = tokenize(pt_score, tokenizer)[0].tokens
+            batch_tokens = tokenize_many([pt_score, pt_score], tokenizer)
+            self.assertEqual(len(batch_tokens), 2)
+            for tokens in batch_tokens:
+                self.assertTrue(tokens[0].tokens == pt_tokens)
+
         def test_tokenize2(self):
             """Test the partitura tokenizer"""
             tokenizer = miditok.REMI()
@@ -251,6 +251,18 @@ class TestMusicXML(unittest.TestCase):
         self.assertTrue(score.work_title == test_work_title)
         self.assertTrue(score.work_number == test_work_number)
 
+    def test_import_stream(self):
+        # parsing the MusicXML incrementally yields the same score
+        for fn in MUSICXML_IMPORT_EXPORT_TESTFILES + MUSICXML_SCORE_OBJECT_TESTFILES:
+            with open(fn) as f:
+                target = save_musicxml(load_musicxml(f)).decode("UTF-8")
+                f.seek(0)
+                result = save_musicxml(load_musicxml(f, stream=True)).decode("UTF-8")
+            self.assertEqual(target, result)
+
+        scr = load_musicxml(MUSICXML_SCORE_OBJECT_TESTFILES[0], stream=True)
+        self.assertEqual(scr.work_title, "Test Title")
+
 
 def make_part_slur():
     # create a part